@@ -0,0 +1,11 @@
+#!/bin/bash -e
+#
+# the panels of run.sh in one window, process and participant
+
+DOMAIN=27
+
+TOP_DIR=`readlink -f ../..`
+EXE=${TOP_DIR}/src/shapes_demo.py
+COMMON="--domain_id ${DOMAIN} --ShapeTypeExtended --log_level 50 -f 2.13 2.44"
+
+${EXE} ${COMMON} --title "Busy Domain:${DOMAIN}" --panels busy.panels
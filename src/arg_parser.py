@@ -118,6 +118,77 @@ class ArgParser:
             help="Specify position of arbitrary text as x, y, text, [color] [size]")
         parser.add_argument('--publish_rate', '-pr', default=20, type=int,
             help='Specify the delay between screen updates in milliseconds [20]')
+        parser.add_argument('--vectorized', '-vec', action='store_true',
+            help='Compute all published shapes as NumPy array operations [False]')
+        parser.add_argument('--collections', '-col', action='store_true',
+            help=('Draw each kind of shape as one matplotlib collection, not a patch\n' +
+                  'per shape [False]'))
+        parser.add_argument('--lod', type=int, default=None, metavar='SHAPES',
+            help=('Draw a kind of shape as one scatter of points, with no hatching or\n' +
+                  'history, once more than SHAPES of it are shown; the threshold then\n' +
+                  'follows the measured frame time; implies --collections [None]'))
+        parser.add_argument('--writer_rate', '-wr', type=float, default=None,
+            help=('Publish from a background thread at this many updates per second,\n' +
+                  'independent of --publish_rate screen updates [publish on screen updates]'))
+        parser.add_argument('--instances', '-n', type=int, default=1,
+            help=('Publish this many instances of each configured shape, keyed BLUE-000123\n' +
+                  'and so on, drawn in the palette; implies --vectorized [1]'))
+        parser.add_argument('--register_instances', nargs='?', const='unregister', default=None,
+            choices=['unregister', 'dispose'],
+            help=('Register each published instance up front and write by its handle;\n' +
+                  'on exit unregister [the default] or dispose them [write by key]'))
+        parser.add_argument('--dirty_blit', action='store_true',
+            help=('Redraw only the regions of the shapes that changed since the last\n' +
+                  'screen update, not every shape [False]'))
+        parser.add_argument('--artist_pool', type=int, default=8,
+            help=('Subscribed instances of each shape to preallocate history artists for;\n' +
+                  'past that, the oldest gone instance is retired to reuse its artists [8]'))
+        parser.add_argument('--shape_store', action='store_true',
+            help=('Keep the changing attributes of the drawn shapes in NumPy columns,\n' +
+                  'reusing retired rows; slower per update than the default [False]'))
+        parser.add_argument('--take_thread', action='store_true',
+            help=('Take samples on a background thread, screen updates only draw\n' +
+                  'the latest state of each instance [False]'))
+        parser.add_argument('--event_redraw', action='store_true',
+            help=('Subscriber: update the screen only when data or a status arrives,\n' +
+                  'at most every --publish_rate milliseconds; not with --take_thread\n' +
+                  'or --replay [False]'))
+        parser.add_argument('--offscreen', type=int, default=None, metavar='FRAMES',
+            help=('Render this many frames with Agg, every --publish_rate milliseconds,\n' +
+                  'with no window, then print the DDS and render time of each [None]'))
+        parser.add_argument('--frame_dump', type=str, default=None, metavar='PATH',
+            help=('With --offscreen, write the frames from a thread: frames/%%05d.png\n' +
+                  'for a PNG sequence, or shapes.gif for an animated GIF of at most\n' +
+                  '300 frames [None]'))
+        parser.add_argument('--latency', action='store_true',
+            help=('Track write-to-receive and receive-to-render latency per topic\n' +
+                  'and instance, reported on exit [False]'))
+        parser.add_argument('--headless', action='store_true',
+            help=('Publish with no figure and no matplotlib, as a load generator [False]\n' +
+                  'Paced by --target_rate, reports the achieved rate on exit'))
+        parser.add_argument('--target_rate', '-tr', default=1000.0, type=float,
+            help='Specify the --headless samples per second across all instances [1000]')
+        parser.add_argument('--duration', type=float, default=None,
+            help='Stop --headless publishing after this many seconds [until interrupted]')
+        parser.add_argument('--capture', type=str, default=None,
+            help='Append every sample the subscriber receives to this sample log file')
+        parser.add_argument('--replay', type=str, default=None,
+            help=('Write the samples of this --capture file: a subscriber renders them\n' +
+                  '(on --transport loopback unless set), a publisher only writes them'))
+        parser.add_argument('--replay_speed', type=float, default=1.0,
+            help='Replay at this multiple of the captured rate, 0 for as fast as possible [1]')
+        parser.add_argument('--transport', choices=['connext', 'loopback'], default=None,
+            help=('DDS implementation; loopback delivers in-process only, to benchmark\n' +
+                  'without a Connext install [connext if installed]'))
+        parser.add_argument('--startup_profile', '--startup-profile', action='store_true',
+            help=('Print the wall time of each startup phase: imports, figure, participant,\n' +
+                  'discovery and first frame'))
+        parser.add_argument('--panels', type=str, default=None,
+            help=('Show a panel per line of this file, each line the arguments of one\n' +
+                  'publisher or subscriber, in one figure and process'))
+        parser.add_argument('--metrics_interval', type=float, default=None,
+            help=('Print the sample counts as a METRICS JSON line on stdout at this interval\n' +
+                  'in seconds, for orchestrator.py'))
         parser.add_argument('--qos_file', '-qf', type=str, default=self.default_dic['QOS_FILE'],
             help=f"Specify the full path of a QoS file [{self.default_dic['QOS_FILE']}]")
         parser.add_argument('--qos_lib', '-ql', type=str, default=self.default_dic['QOS_LIB'],
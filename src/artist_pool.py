@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Pools the subscriber's shape artists, so history slots reuse them"""
+
+# python imports
+import logging
+
+## An ArtistPool holds hidden artists for each kind of shape, added to the axes once
+#   the subscriber acquires one for each history slot it draws, restyled for the shape
+#   and releases the slots' artists when it retires an instance, hiding them for reuse
+#  each kind starts with instances x history depth artists; when none is free the
+#   subscriber first retires its oldest gone instance, and only then does the pool grow
+#  released artists are forgotten by the ZorderManager, so it only renumbers drawn ones
+
+LOG = logging.getLogger(__name__)
+
+# a placeholder until the first set_poly_center, one per kind of shape
+PLACEHOLDER_POINTS = {'S': [(0, 0), (0, 1), (1, 1), (1, 0)], 'T': [(0, 1), (1, 0), (0, 0)]}
+
+
+class ArtistPool:
+    """hidden artists per kind of shape, ready to draw a history slot"""
+
+    def __init__(self, matplotlib, zorder_manager, depth_dic, instances):
+        """preallocate instances x depth artists for each kind of shape in depth_dic"""
+        self.matplotlib, self.zorder_manager = matplotlib, zorder_manager
+        self.free_dic = {which: [] for which in depth_dic}  # which: [artist]
+        self.created_count = 0
+        for which, depth in depth_dic.items():
+            for _ in range(instances * depth):
+                self.free_dic[which].append(self._create(which))
+        LOG.info('preallocated %d artists', self.created_count)
+
+    def _create(self, which):
+        """@return a new hidden artist on the axes"""
+        if which == 'C':
+            artist = self.matplotlib.create_circle((0, 0), 1)
+        elif which == 'S':
+            artist = self.matplotlib.create_square(PLACEHOLDER_POINTS[which])
+        else:
+            artist = self.matplotlib.create_triangle(PLACEHOLDER_POINTS[which])
+        artist.set(visible=False)
+        self.matplotlib.add_patch(artist)
+        self.created_count += 1
+        return artist
+
+    def available(self, which):
+        """@return how many artists of a kind are free"""
+        return len(self.free_dic[which])
+
+    def acquire(self, shape):
+        """@return a visible artist styled for the shape, free or else new"""
+        free_list = self.free_dic.setdefault(shape.which, [])
+        if free_list:
+            artist = free_list.pop()
+        else:
+            artist = self._create(shape.which)
+            LOG.debug('grew %s to %d artists', shape.which, self.created_count)
+        if shape.which == 'C':
+            artist.set(radius=shape.size)
+        artist.set(visible=True)
+        shape.style_poly(artist)
+        return artist
+
+    def release(self, which, artist):
+        """hide an artist and keep it for the next acquire"""
+        artist.set(visible=False)
+        self.zorder_manager.forget(artist)
+        self.free_dic.setdefault(which, []).append(artist)
+
+    def __repr__(self):
+        free = {which: len(free_list) for which, free_list in self.free_dic.items()}
+        return f'<ArtistPool: {self.created_count} created, free:{free}> '
@@ -0,0 +1,418 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Micro-benchmarks of the Shape, subscriber and publisher hot paths"""
+
+# python imports
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from unittest.mock import MagicMock, patch
+
+# application imports
+from arg_parser import ArgParser
+from config_parser import ConfigParser
+from shape import PALETTE, Shape, instance_color
+from shape_store import ShapeStore
+from shapes_demo import DEFAULT_DIC
+from shape_types import ShapeTypeExtended
+import transport
+
+## Each benchmark times one frame: the hot path called once for every instance
+#   DDS is mocked out, so only the application and matplotlib cost is measured
+#   except pipeline.loopback: publisher to subscriber over the loopback transport, then render
+#   and write.<transport>: DataWriter.write of a sample per instance, by key then by the
+#    handle from register_instance; run with -T connext to time Connext's key lookup
+#   matplotlib draws on an offscreen Agg canvas, so no display is needed
+#  usage: python benchmark.py -o base.json; ...change...; python benchmark.py -c base.json
+#   -c exits 1 if any frame got slower than --tolerance
+
+LOG = logging.getLogger(__name__)
+
+INSTANCE_COUNTS = (1, 8, 24, 1000)  # 24 is every palette color of every shape
+WRITE_INSTANCE_COUNTS = (24, 1000)  # many instances of one topic
+BENCH_DOMAIN_ID = 99  # away from the demos
+DEPTHS = (1, 6)
+REPEAT = 5
+TOLERANCE = 0.25
+
+
+def instance_keys(count):
+    """@return count distinct (which, color) instances: each palette color of each shape,
+    then synthetic keys such as BLUE-000123"""
+    keys = [(which, color) for color in PALETTE for which in 'STC']
+    ix = 0
+    while len(keys) < count:
+        keys.append(('STC'[ix % 3], instance_color('PURPLE', ix // 3)))
+        ix += 1
+    return keys[:count]
+
+
+def parse_app_args(argv):
+    """@return the shapes_demo args and config for argv"""
+    args = ArgParser(DEFAULT_DIC).parse_args(argv)
+    args.box_title = 'benchmark'
+    return ConfigParser(DEFAULT_DIC).get_config(args)
+
+
+def make_matplotlib(args):
+    """@return a Matplotlib drawing offscreen on an Agg canvas"""
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    # pylint: disable=import-outside-toplevel
+    from matplotlib_ import Matplotlib  # only once the backend is chosen
+    return Matplotlib(args)
+
+
+def time_frame(frame, repeat=REPEAT):
+    """@return (loops, best, median) seconds per call of frame"""
+    timer = timeit.Timer(frame)
+    loops, _ = timer.autorange()
+    times = [total / loops for total in timer.repeat(repeat, loops)]
+    return loops, min(times), statistics.median(times)
+
+
+def result(name, instances, depth, timing):
+    """@return one machine-readable result"""
+    loops, best, median = timing
+    return {
+        'name': name, 'instances': instances, 'depth': depth, 'loops': loops,
+        'best_sec': best, 'median_sec': median, 'per_instance_sec': best / instances
+    }
+
+
+def make_data(color, x=120, y=135):
+    """@return a sample as read from DDS"""
+    data = ShapeTypeExtended()
+    data.color, data.x, data.y, data.shapesize, data.angle = color, x, y, 30, 0
+    return data
+
+
+def bench_shape(matplotlib, counts, repeat=REPEAT):
+    """time the Shape methods, which need the matplotlib axes only for their limits"""
+    results = []
+    for count in counts:
+        shapes = [Shape(matplotlib=matplotlib, seq=1, which=which, color=color,
+                        xy=(120, 135), size=30, angle=15.0)
+                  for which, color in instance_keys(count)]
+        store = ShapeStore()
+        views = [store.from_sub_sample(matplotlib=matplotlib, seq=1, which=which,
+                                       data=make_data(color), extended=True)
+                 for which, color in instance_keys(count)]
+        deltas = [[5, 3] for _ in shapes]
+        points = [shape.get_points() for shape in shapes if shape.which != 'C']
+
+        def get_points():
+            for shape in shapes:
+                shape.get_points()
+
+        def view_get_points():
+            for view in views:
+                view.get_points()
+
+        def update():
+            for shape in shapes:
+                shape.update(120, 135, 15.0)
+
+        def view_update():
+            for view in views:
+                view.update(120, 135, 15.0)
+
+        def rotate():
+            for shape, shape_points in zip(shapes, points):
+                shape._rotate(shape_points, 0.26)  # pylint: disable=protected-access
+
+        def reverse_if_wall():
+            for shape, delta in zip(shapes, deltas):
+                shape.reverse_if_wall(delta)
+
+        def create_poly():
+            for shape in shapes:
+                shape.create_poly()
+
+        for name, frame in (('Shape.get_points', get_points), ('Shape._rotate', rotate),
+                            ('Shape.reverse_if_wall', reverse_if_wall),
+                            ('Shape.create_poly', create_poly),
+                            ('Shape.update', update),
+                            ('ShapeView.get_points', view_get_points),
+                            ('ShapeView.update', view_update)):
+            results.append(result(name, count, None, time_frame(frame, repeat)))
+    return results
+
+
+def make_subscriber(matplotlib, argv, depth):
+    """@return a ConnextSubscriber on mocked DDS with the given history depth"""
+    # pylint: disable=import-outside-toplevel
+    import connext_subscriber
+    import participant_factory
+    args, _, config = parse_app_args(argv)
+    with patch.object(participant_factory, 'dds'), patch.object(connext_subscriber, 'dds') as dds:
+        dds.DataReader.side_effect = lambda *_args: MagicMock()
+        sub = connext_subscriber.ConnextSubscriber(matplotlib, args, config)
+    for which in sub.depth_dic:
+        sub.depth_dic[which] = depth
+    return sub
+
+
+def make_publisher(matplotlib, argv, config_list):
+    """@return a ConnextPublisher on mocked DDS for the given pub_dic list"""
+    # pylint: disable=import-outside-toplevel
+    import connext_publisher
+    import participant_factory
+    args, _, _ = parse_app_args(argv)
+    with patch.object(participant_factory, 'dds'), patch.object(connext_publisher, 'dds'):
+        return connext_publisher.ConnextPublisher(matplotlib, args, config_list)
+
+
+def bench_subscriber(matplotlib, counts, depths, repeat=REPEAT):
+    """time handle_one_sample for a frame with one new sample per instance"""
+    results = []
+    for depth in depths:
+        for count in counts:
+            sub = make_subscriber(matplotlib, ['-sub', 'CST'], depth)
+            samples = [(which, make_data(color)) for which, color in instance_keys(count)]
+            seq = [0]
+
+            def handle_frame(sub=sub, samples=samples, seq=seq):
+                seq[0] += 1
+                for which, data in samples:
+                    data.x = 120 + seq[0] % 2  # move, so the polygon is really updated
+                    sub.handle_one_sample(which, seq[0], data, 'pub1')
+
+            for _ in range(depth):  # fill the history so every frame reuses the polygons
+                handle_frame()
+            results.append(result('ConnextSubscriber.handle_one_sample', count, depth,
+                                  time_frame(handle_frame, repeat)))
+    return results
+
+
+def bench_publisher(matplotlib, counts, repeat=REPEAT):
+    """time publish_sample for a frame with one sample per instance"""
+    results = []
+    for count in counts:
+        config_list = pub_config_list(count)
+        pub = make_publisher(matplotlib, ['-pub', 'CST'], config_list)
+
+        def publish_frame(pub=pub, config_list=config_list):
+            for pub_dic in config_list:
+                pub.publish_sample(pub_dic)
+
+        publish_frame()  # create the samples and polygons
+        results.append(result('ConnextPublisher.publish_sample', count, None,
+                              time_frame(publish_frame, repeat)))
+    return results
+
+
+def pub_config_list(count):
+    """@return a pub_dic per instance"""
+    return [{
+        'which': which, 'color': color, 'xy': [120, 135], 'delta_xy': [5, 3],
+        'shapesize': 30, 'fillKind': 0, 'angle': 0, 'delta_angle': 5
+    } for which, color in instance_keys(count)]
+
+
+def bench_pipeline(matplotlib, counts, repeat=REPEAT):
+    """time publish, loopback delivery, take, update and an Agg render of the whole figure"""
+    # pylint: disable=import-outside-toplevel
+    import connext_publisher
+    import connext_subscriber
+    import loopback_dds
+    results = []
+    previous = transport.select('loopback')
+    try:
+        for count in counts:
+            loopback_dds.reset()
+            args, _, config = parse_app_args(['-sub', 'CST'])
+            sub = connext_subscriber.ConnextSubscriber(matplotlib, args, config)
+            args, _, _ = parse_app_args(['-pub', 'CST'])
+            pub = connext_publisher.ConnextPublisher(matplotlib, args, pub_config_list(count))
+
+            def pipeline_frame(pub=pub, sub=sub):
+                pub.draw(0)
+                sub.draw(0)
+                matplotlib.fig.canvas.draw()
+
+            pipeline_frame()
+            results.append(result('pipeline.loopback', count, sub.depth_dic['S'],
+                                  time_frame(pipeline_frame, repeat)))
+    finally:
+        if previous:
+            transport.select(previous)
+    return results
+
+
+def bench_blit(counts, repeat=REPEAT):
+    """time a frame that moves one of count shapes a few pixels: redrawing every shape over
+    the whole background, as FuncAnimation(blit=True) does, against BlitManager's dirty
+    regions"""
+    # pylint: disable=import-outside-toplevel
+    from blit_manager import BlitManager
+    from matplotlib.patches import Circle
+    results = []
+    for count in counts:
+        args, _, _ = parse_app_args(['-sub', 'S'])
+        args.box_title = f'benchmark blit {count}'  # a figure of its own
+        matplotlib = make_matplotlib(args)
+        fig, canvas = matplotlib.fig, matplotlib.fig.canvas
+        homes = [(ix * 37 % 240, ix * 53 % 270) for ix in range(count)]
+        circles = [Circle(home, 15, animated=True, zorder=10 + ix)
+                   for ix, home in enumerate(homes)]
+        for circle in circles:
+            matplotlib.axes.add_patch(circle)
+        manager = BlitManager(fig)
+        canvas.draw()
+        manager.update(circles)
+        steps = itertools.count()
+
+        def full_frame():
+            step = next(steps)
+            home_x, home_y = homes[step % count]
+            circles[step % count].set(center=(home_x + step % 5, home_y))
+            canvas.restore_region(manager.background)
+            for circle in circles:
+                fig.draw_artist(circle)
+            canvas.blit(fig.bbox)
+
+        def dirty_frame():
+            step = next(steps)
+            home_x, home_y = homes[step % count]
+            circles[step % count].set(center=(home_x + step % 5, home_y))
+            manager.update([circles[step % count]])
+
+        for how, frame in (('full', full_frame), ('dirty', dirty_frame)):
+            results.append(result(f'blit.{how}', count, None, time_frame(frame, repeat)))
+        matplotlib.plt.close(fig)
+    return results
+
+
+def bench_write(counts=WRITE_INSTANCE_COUNTS, repeat=REPEAT, transport_name='loopback'):
+    """time writing a sample of each instance of one topic, by key and by registered handle"""
+    previous = transport.select(transport_name)
+    dds = transport.dds
+    results = []
+    try:
+        participant = dds.DomainParticipant(BENCH_DOMAIN_ID)
+        topic = dds.Topic(participant, 'Square', ShapeTypeExtended)
+        for count in counts:
+            writer = dds.DataWriter(dds.Publisher(participant), topic)
+            samples = []
+            for ix in range(count):
+                sample = ShapeTypeExtended()
+                sample.color, sample.x, sample.y, sample.shapesize = f'C{ix:06d}', 50, 50, 30
+                samples.append(sample)
+            handles = [writer.register_instance(sample) for sample in samples]
+
+            def write_by_key(writer=writer, samples=samples):
+                for sample in samples:
+                    writer.write(sample)
+
+            def write_by_handle(writer=writer, samples=samples, handles=handles):
+                for sample, handle in zip(samples, handles):
+                    writer.write(sample, handle)
+
+            for how, frame in (('key', write_by_key), ('handle', write_by_handle)):
+                results.append(result(f'write.{transport_name}.{how}', count, None,
+                                      time_frame(frame, repeat)))
+            writer.close()
+    finally:
+        if previous:
+            transport.select(previous)
+    return results
+
+
+def run(counts=INSTANCE_COUNTS, depths=DEPTHS, repeat=REPEAT,
+        write_counts=WRITE_INSTANCE_COUNTS, transport_name='loopback'):
+    """@return the metadata and results of every benchmark"""
+    args, _, _ = parse_app_args(['-sub', 'S'])
+    matplotlib = make_matplotlib(args)
+    import matplotlib as mpl  # pylint: disable=import-outside-toplevel
+    results = bench_shape(matplotlib, counts, repeat)
+    results += bench_subscriber(matplotlib, counts, depths, repeat)
+    results += bench_publisher(matplotlib, counts, repeat)
+    results += bench_pipeline(matplotlib, counts, repeat)
+    results += bench_blit(counts, repeat)
+    results += bench_write(write_counts, repeat, transport_name)
+    return {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+            'platform': platform.platform(), 'matplotlib': mpl.__version__,
+            'backend': mpl.get_backend(), 'repeat': repeat
+        },
+        'results': results
+    }
+
+
+def compare(baseline, current, tolerance=TOLERANCE):
+    """@return a line per result whose best time is over tolerance slower than the baseline"""
+    def _key(res):
+        return res['name'], res['instances'], res['depth']
+    base_dic = {_key(res): res for res in baseline['results']}
+    regressions = []
+    for res in current['results']:
+        base = base_dic.get(_key(res))
+        if base and res['best_sec'] > base['best_sec'] * (1 + tolerance):
+            ratio = res['best_sec'] / base['best_sec']
+            regressions.append(f"{res['name']} instances:{res['instances']} "
+                               f"depth:{res['depth']} {ratio:.2f}x slower")
+    return regressions
+
+
+def parse_args(vargs):
+    """@return the benchmark's own arguments"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--instances', '-n', type=int, nargs='+', default=INSTANCE_COUNTS,
+        help=f'Instance counts to time each frame at {list(INSTANCE_COUNTS)}')
+    parser.add_argument('--depths', '-d', type=int, nargs='+', default=DEPTHS,
+        help=f'Subscriber history depths {list(DEPTHS)}')
+    parser.add_argument('--write_instances', '-w', type=int, nargs='+',
+        default=WRITE_INSTANCE_COUNTS,
+        help=f'Instance counts of the write benchmark {list(WRITE_INSTANCE_COUNTS)}')
+    parser.add_argument('--transport', '-T', choices=['connext', 'loopback'], default='loopback',
+        help='Transport of the write benchmark [loopback]')
+    parser.add_argument('--repeat', '-r', type=int, default=REPEAT,
+        help=f'Timing runs of each frame; best and median are reported [{REPEAT}]')
+    parser.add_argument('--output', '-o', type=str, default=None,
+        help='Write the JSON results to this file [stdout]')
+    parser.add_argument('--compare', '-c', type=str, default=None,
+        help='Baseline JSON results; exit 1 if any frame is slower by over --tolerance')
+    parser.add_argument('--tolerance', '-t', type=float, default=TOLERANCE,
+        help=f'Allowed slowdown vs --compare as a fraction [{TOLERANCE}]')
+    return parser.parse_args(vargs)
+
+
+def main(vargs):
+    """MAIN ENTRY POINT"""
+    args = parse_args(vargs)
+    results = run(args.instances, args.depths, args.repeat, args.write_instances, args.transport)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            regressions = compare(json.load(file), results, args.tolerance)
+        for line in regressions:
+            LOG.error(line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format='%(levelname)s %(filename)s:%(lineno)d %(message)s',
+                        level=logging.WARNING)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Redraws only the regions of the artists that changed, for --dirty_blit"""
+
+# python imports
+import logging
+from math import ceil, floor
+
+import numpy as np
+from matplotlib.transforms import Bbox
+
+## FuncAnimation(blit=True) restores the whole background and draws every returned artist,
+#   and an artist it is not given is not drawn at all, so draw must return every shape
+#  with --dirty_blit, draw returns only the artists changed since the last frame, and
+#   BlitManager repaints the region each covered before and covers now:
+#     restore the background there, redraw every known artist overlapping it, clipped
+#     to the region, in zorder, then blit the region
+#   a removed or hidden artist is repainted away the same way
+#  a full draw (the first, a resize) skips the animated artists, so on each draw_event
+#   the background is saved and all of them are drawn on top
+#  up to MAX_REGIONS separate regions are repainted; past that, their union is repainted
+#   as one region
+
+LOG = logging.getLogger(__name__)
+
+PAD_PIXELS = 3  # edges and antialiasing reach past the window extent
+MAX_REGIONS = 16
+
+
+def padded_extent(artist, renderer, pad=PAD_PIXELS):
+    """@return the display Bbox an artist covers, None if it is not drawn"""
+    if artist.axes is None or not artist.get_visible():
+        return None
+    extent = artist.get_window_extent(renderer)
+    if not np.isfinite(extent.get_points()).all() or extent.width < 0 or extent.height < 0:
+        return None  # e.g. an empty collection
+    return extent.expanded(1, 1).padded(pad)
+
+
+def merge_regions(extents, max_regions=MAX_REGIONS):
+    """@return regions covering the extents, overlapping ones merged, at most max_regions"""
+    regions = []
+    for extent in extents:
+        merged = True
+        while merged:
+            merged = False
+            for ix, region in enumerate(regions):
+                if region.overlaps(extent):
+                    extent = Bbox.union([extent, regions.pop(ix)])
+                    merged = True
+                    break
+        regions.append(extent)
+        if len(regions) > max_regions:
+            return [Bbox.union(extents)]
+    return regions
+
+
+class BlitManager:
+    """keeps the background and the extent each animated artist was last drawn at"""
+
+    def __init__(self, fig, max_regions=MAX_REGIONS):
+        self.fig, self.canvas = fig, fig.canvas
+        self.max_regions = max_regions
+        self.background = None
+        self.extent_dic = {}  # artist: its padded extent when last drawn, or None
+        self.static_ids = set()  # id of every artist drawn into the background
+        self.full_draw_count = self.region_count = 0
+        self.timer, self.draw, self.frame = None, None, 0
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def start(self, draw, interval=None):
+        """call draw every interval milliseconds and repaint what it returns, or with no
+        interval, on each on_timer call; @return self"""
+        self.draw = draw
+        if interval is not None:
+            self.timer = self.canvas.new_timer(interval=interval)
+            self.timer.add_callback(self.on_timer)
+            self.timer.start()
+        return self
+
+    def on_timer(self):
+        """one animation frame"""
+        self.update(self.draw(self.frame))
+        self.frame += 1
+
+    def on_draw(self, _=None):
+        """after a full draw: save the background, then draw every animated artist on it"""
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.static_ids = {
+            id(artist) for axes in self.fig.axes for artist in axes.get_children()
+            if artist.get_visible() and not artist.get_animated()}
+        renderer = self.canvas.get_renderer()
+        for artist in sorted(self.extent_dic, key=lambda artist: artist.zorder):
+            if artist.axes is not None and artist.get_visible():
+                self.fig.draw_artist(artist)
+            self.extent_dic[artist] = padded_extent(artist, renderer)
+        self.full_draw_count += 1
+
+    def update(self, artists):
+        """repaint the regions these artists covered and now cover"""
+        renderer = self.canvas.get_renderer()
+        extents, full_draw = [], False
+        for artist in artists:
+            if artist not in self.extent_dic:
+                artist.set_animated(True)  # leave it out of the background from now on
+                full_draw |= id(artist) in self.static_ids  # already in the background
+                self.extent_dic[artist] = None
+            old_extent = self.extent_dic[artist]
+            self.extent_dic[artist] = new_extent = padded_extent(artist, renderer)
+            extents.extend(extent for extent in (old_extent, new_extent) if extent is not None)
+        if full_draw or self.background is None:
+            self.canvas.draw_idle()  # on_draw will draw everything
+            return
+        for region in merge_regions(extents, self.max_regions):
+            self.repaint(region)
+        self.forget_removed()
+
+    def repaint(self, region):
+        """restore the background in the region, redraw what overlaps it and blit it"""
+        region = Bbox.intersection(region, self.fig.bbox)
+        if region is None:
+            return
+        # whole pixels, so the clip and the restored part match with no seam
+        region = Bbox([[floor(region.x0), floor(region.y0)], [ceil(region.x1), ceil(region.y1)]])
+        height = round(self.fig.bbox.height)
+        # the bbox is in buffer pixels, rows from the top, and includes its last row and
+        #  column; xy is where the saved whole-figure background's corner goes, so (0, 0)
+        #  restores the part in place
+        self.canvas.restore_region(
+            self.background,
+            bbox=(region.x0, height - region.y1, region.x1 - 1, height - region.y0 - 1),
+            xy=(0, 0))
+        overlapping = [artist for artist, extent in self.extent_dic.items()
+                       if extent is not None and extent.overlaps(region)]
+        for artist in sorted(overlapping, key=lambda artist: artist.zorder):
+            if artist.axes is None or not artist.get_visible():
+                continue
+            clipbox = artist.get_clip_box()
+            clip = Bbox.intersection(region, clipbox) if clipbox else region
+            if clip is None:
+                continue  # clipped away here
+            artist.set_clip_box(clip)
+            self.fig.draw_artist(artist)
+            artist.set_clip_box(clipbox)
+        self.canvas.blit(region)
+        self.region_count += 1
+
+    def forget_removed(self):
+        """stop tracking artists taken off the axes, once their region was repainted"""
+        for artist in [artist for artist in self.extent_dic if artist.axes is None]:
+            del self.extent_dic[artist]
+
+    def __repr__(self):
+        return (f'<BlitManager: {len(self.extent_dic)} artists '
+                f'full draws:{self.full_draw_count} regions:{self.region_count}> ')
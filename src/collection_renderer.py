@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Batched rendering: one PolyCollection per kind of shape instead of one patch each"""
+
+# python imports
+import logging
+import time
+
+import numpy as np
+from matplotlib.collections import PathCollection, PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.markers import MarkerStyle
+from matplotlib.transforms import IdentityTransform
+
+from zorder_manager import ZORDER_BASE
+
+## A CollectionItem stands in for the Polygon or Circle that Matplotlib.create_* used to return
+#   it supports the subset of the patch API used by Shape and Connext: set, set_xy, get_xy,
+#   center, radius, visible and zorder, writing into rows of NumPy arrays owned by a
+#   CollectionLayer; a hidden item keeps its row, with transparent colors
+#   each layer is a single PolyCollection, so a frame draws a few artists however many shapes
+#   a flush sorts the rows by their zorder, so within a kind of shape the latest sample is on
+#   top as with patches; the kinds' collections share one zorder, so across kinds they
+#   stack in the order their layers were created
+#  with --lod, a LevelOfDetail switches a kind of shape whose shown count passes its threshold
+#   to a PointLayer: one scatter of the latest sample of each instance, so no hatching, edges
+#   or history; its polygon layers are hidden and not flushed until it switches back
+#   the threshold starts at --lod, falls when the collections' draw time per frame is over
+#   budget and rises when well under, so the measured frame time decides, and a kind only
+#   switches back once its count is HYSTERESIS below the threshold
+
+LOG = logging.getLogger(__name__)
+
+INITIAL_CAPACITY = 16
+LOD_MARKER_SIZE = 9  # points squared
+LOD_BUDGET_FRACTION = 0.5  # of the frame interval, for drawing the collections
+LOD_MIN_THRESHOLD = 16
+EWMA_WEIGHT = 0.2
+HYSTERESIS = 0.8
+RELAX_FRACTION = 0.5  # of the budget, under which the threshold rises
+RAISE_FACTOR = 1.25
+COOLDOWN_FRAMES = 30  # for the frame time to show a switch before the next
+CIRCLE_VERTEX_COUNT = 36
+UNIT_CIRCLE = np.column_stack((
+    np.cos(np.linspace(0, 2 * np.pi, CIRCLE_VERTEX_COUNT, endpoint=False)),
+    np.sin(np.linspace(0, 2 * np.pi, CIRCLE_VERTEX_COUNT, endpoint=False))))
+
+
+class TimedDraw:
+    """adds the seconds each draw takes to its owner's draw_sec"""
+    owner = None
+
+    def draw(self, renderer):
+        start = time.perf_counter()
+        super().draw(renderer)
+        if self.owner is not None:
+            self.owner.draw_sec += time.perf_counter() - start
+
+
+class TimedPolyCollection(TimedDraw, PolyCollection):
+    """a PolyCollection that times its draw"""
+
+
+class TimedPathCollection(TimedDraw, PathCollection):
+    """a PathCollection that times its draw"""
+
+
+class CollectionLayer:
+    """the arrays and PolyCollection for all items with the same vertex count and hatch"""
+    ROW_ARRAYS = ('verts', 'facecolors', 'edgecolors', 'linewidths', 'zorders',
+                  'visible', 'history')
+
+    def __init__(self, axes, vertex_count, hatch, zorder, owner=None):
+        self.vertex_count, self.hatch = vertex_count, hatch
+        self.items = []  # row: CollectionItem
+        self.verts = np.zeros((INITIAL_CAPACITY, vertex_count, 2))
+        self.facecolors = np.zeros((INITIAL_CAPACITY, 4))
+        self.edgecolors = np.zeros((INITIAL_CAPACITY, 4))
+        self.linewidths = np.ones(INITIAL_CAPACITY)
+        self.zorders = np.zeros(INITIAL_CAPACITY)
+        self.visible = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self.history = np.zeros(INITIAL_CAPACITY, dtype=bool)  # an older sample's slot
+        self.collection = TimedPolyCollection([], closed=True, hatch=hatch, zorder=zorder)
+        self.collection.owner = owner
+        axes.add_collection(self.collection)
+        self.dirty = True
+
+    def __len__(self):
+        return len(self.items)
+
+    def _grow(self):
+        """double the capacity of every array"""
+        for name in self.ROW_ARRAYS:
+            array = getattr(self, name)
+            grown = np.zeros((len(array) * 2,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def add(self, item):
+        """@return the row given to the item"""
+        if len(self.items) == len(self.linewidths):
+            self._grow()
+        self.items.append(item)
+        row = len(self.items) - 1
+        self.visible[row], self.history[row] = True, False
+        self.zorders[row] = item.zorder
+        self.dirty = True
+        return row
+
+    def remove(self, row):
+        """drop a row, moving the last row into its place"""
+        last = len(self.items) - 1
+        if row != last:
+            moved = self.items[last]
+            self.items[row] = moved
+            moved.row = row
+            for name in self.ROW_ARRAYS:
+                array = getattr(self, name)
+                array[row] = array[last]
+        self.items.pop()
+        self.dirty = True
+
+    def flush(self):
+        """push the arrays into the collection, rows in zorder, if anything changed;
+        @return if it did"""
+        changed = self.dirty
+        if self.dirty:
+            count = len(self.items)
+            order = np.argsort(self.zorders[:count], kind='stable')
+            self.collection.set_verts(self.verts[order])
+            self.collection.set_facecolor(self.facecolors[order])
+            self.collection.set_edgecolor(self.edgecolors[order])
+            self.collection.set_linewidth(self.linewidths[order])
+            self.dirty = False
+        return changed
+
+    def shown_count(self):
+        """@return how many rows are visible"""
+        return int(self.visible[:len(self.items)].sum())
+
+
+class PointLayer:
+    """one scatter of the latest visible rows of a kind of shape's layers"""
+
+    def __init__(self, axes, vertex_count, zorder, owner=None):
+        marker = MarkerStyle({3: '^', 4: 's'}.get(vertex_count, 'o'))
+        self.collection = TimedPathCollection(
+            (marker.get_path().transformed(marker.get_transform()),),
+            sizes=(LOD_MARKER_SIZE,), offsets=np.zeros((0, 2)),
+            offset_transform=axes.transData, zorder=zorder, edgecolors='none')
+        self.collection.set_transform(IdentityTransform())  # sizes are in points, as scatter
+        self.collection.owner = owner
+        self.collection.set_visible(False)
+        axes.add_collection(self.collection, autolim=False)
+
+    def flush(self, layers):
+        """push the centers and colors of the layers' latest samples into the scatter,
+        if any layer changed; @return if it did"""
+        if not any(layer.dirty for layer in layers):
+            return False
+        offsets, colors, zorders = [], [], []
+        for layer in layers:
+            count = len(layer)
+            shown = layer.visible[:count] & ~layer.history[:count]
+            offsets.append(layer.verts[:count][shown].mean(axis=1))
+            face, edge = layer.facecolors[:count][shown], layer.edgecolors[:count][shown]
+            colors.append(np.where(face[:, 3:] > 0, face, edge))  # unfilled: the edge color
+            zorders.append(layer.zorders[:count][shown])
+            layer.dirty = False  # flushed again when the kind switches back
+        order = np.argsort(np.concatenate(zorders), kind='stable')
+        self.collection.set_offsets(np.concatenate(offsets)[order])
+        self.collection.set_facecolor(np.concatenate(colors)[order])
+        return True
+
+
+class LevelOfDetail:
+    """chooses the kinds of shape to draw as points, from their counts and the frame time"""
+
+    def __init__(self, threshold, budget_sec):
+        self.threshold = threshold  # shown shapes of a kind past which it draws as points
+        self.budget_sec = budget_sec
+        self.frame_sec = 0.0  # moving average of the collections' draw time per frame
+        self.slow_count = None  # the fewest shapes of a kind found over budget
+        self.cooldown = 0
+        self.switch_count = 0
+
+    def observe(self, draw_sec, count_dic, point_kinds):
+        """one frame's draw time; count_dic is kind: shown shapes, point_kinds the kinds
+        drawn as points; @return the kinds to draw as points from now on"""
+        self.frame_sec += EWMA_WEIGHT * (draw_sec - self.frame_sec)
+        detailed = [count for kind, count in count_dic.items()
+                    if kind not in point_kinds and count > LOD_MIN_THRESHOLD]
+        if self.cooldown:
+            self.cooldown -= 1
+        elif self.frame_sec > self.budget_sec and detailed:
+            # the largest kind still drawn in detail switches
+            self.slow_count = min(max(detailed), self.slow_count or max(detailed))
+            self.threshold = max(LOD_MIN_THRESHOLD, max(detailed) - 1)
+            self.cooldown = COOLDOWN_FRAMES
+            LOG.info('%.1f ms frames: threshold %d', self.frame_sec * 1e3, self.threshold)
+        elif self.frame_sec < self.budget_sec * RELAX_FRACTION and point_kinds:
+            raised = int(self.threshold * RAISE_FACTOR) + 1
+            self.threshold = min(raised, self.slow_count - 1) if self.slow_count else raised
+            self.cooldown = COOLDOWN_FRAMES
+            LOG.info('%.1f ms frames: threshold %d', self.frame_sec * 1e3, self.threshold)
+        kinds = {kind for kind, count in count_dic.items()
+                 if count > (self.threshold * HYSTERESIS if kind in point_kinds
+                             else self.threshold)}
+        self.switch_count += len(kinds ^ point_kinds)
+        return kinds
+
+    def __repr__(self):
+        return (f'<LevelOfDetail: threshold:{self.threshold} '
+                f'frame:{self.frame_sec * 1e3:.2f} ms switches:{self.switch_count}> ')
+
+
+class CollectionItem:
+    """one shape drawn as a row of a CollectionLayer, with a Polygon/Circle-like API"""
+    is_collection_item = True
+
+    def __init__(self, renderer, vertex_count, points=None, center=None, radius=None):
+        self.renderer, self.vertex_count = renderer, vertex_count
+        self.center, self.radius = center, radius
+        self.zorder = ZORDER_BASE
+        self.hidden_colors = None  # (face, edge) while hidden
+        self.layer = renderer.get_layer(vertex_count, None)
+        self.row = self.layer.add(self)
+        if points is not None:
+            self.set_xy(points)
+        else:
+            self._set_center(center)
+
+    def set_xy(self, points):
+        """move the vertices; a closing vertex, as from get_xy, is dropped"""
+        self.layer.verts[self.row] = np.asarray(points)[:self.vertex_count]
+        self.layer.dirty = True
+
+    def get_xy(self):
+        """@return the closed vertices, as Polygon.get_xy does"""
+        verts = self.layer.verts[self.row]
+        return np.vstack((verts, verts[:1]))
+
+    def _set_center(self, center):
+        self.center = center
+        self.layer.verts[self.row] = UNIT_CIRCLE * self.radius + center
+        self.layer.dirty = True
+
+    def _set_color(self, index, value):
+        """set the face (0) or edge (1) color, kept aside while hidden"""
+        if self.hidden_colors is None:
+            (self.layer.facecolors, self.layer.edgecolors)[index][self.row] = to_rgba(value)
+        else:
+            self.hidden_colors[index][:] = to_rgba(value)
+
+    def _set_visible(self, visible):
+        """show or hide the row by swapping its colors with transparent ones"""
+        if visible == (self.hidden_colors is None):
+            return
+        layer, row = self.layer, self.row
+        layer.visible[row] = visible
+        if visible:
+            layer.facecolors[row], layer.edgecolors[row] = self.hidden_colors
+            self.hidden_colors = None
+        else:
+            self.hidden_colors = layer.facecolors[row].copy(), layer.edgecolors[row].copy()
+            layer.facecolors[row] = layer.edgecolors[row] = 0
+
+    def _set_hatch(self, hatch):
+        """hatch is per collection, so move to the layer with this hatch"""
+        if hatch == self.layer.hatch:
+            return
+        old_layer, old_row = self.layer, self.row
+        self.layer = self.renderer.get_layer(self.vertex_count, hatch)
+        self.row = self.layer.add(self)
+        for name in CollectionLayer.ROW_ARRAYS:
+            getattr(self.layer, name)[self.row] = getattr(old_layer, name)[old_row]
+        old_layer.remove(old_row)
+
+    def set_history(self, history):
+        """mark the row as an older sample's slot, left out of level of detail points"""
+        self.layer.history[self.row] = history
+        self.layer.dirty = True
+
+    def set(self, **kwargs):
+        """the subset of Artist.set used for shapes"""
+        for key, value in kwargs.items():
+            if key == 'center':
+                self._set_center(value)
+            elif key == 'radius':
+                self.radius = value
+                self._set_center(self.center)
+            elif key in ('ec', 'edgecolor'):
+                self._set_color(1, value)
+            elif key in ('fc', 'facecolor'):
+                self._set_color(0, value)
+            elif key == 'visible':
+                self._set_visible(value)
+            elif key in ('lw', 'linewidth'):
+                self.layer.linewidths[self.row] = value
+            elif key == 'hatch':
+                self._set_hatch(value)
+            elif key == 'zorder':
+                self.zorder = self.layer.zorders[self.row] = value
+            else:
+                raise AttributeError(f'CollectionItem.set got an unexpected property {key}')
+        self.layer.dirty = True
+
+    def remove(self):
+        """take this item out of its layer"""
+        self.layer.remove(self.row)
+        self.layer = self.row = None
+
+    def __repr__(self):
+        return f'<CollectionItem: {self.vertex_count} vertices row:{self.row}> '
+
+
+class CollectionRenderer:
+    """owns a CollectionLayer per vertex count and hatch, i.e. per kind of shape"""
+
+    def __init__(self, axes, zorder=ZORDER_BASE + 1, lod=None):
+        """with lod, a LevelOfDetail, kinds of shape switch to points"""
+        self.axes, self.zorder, self.lod = axes, zorder, lod
+        self.layer_dic = {}  # (vertex_count, hatch): CollectionLayer
+        self.point_dic = {}  # vertex_count: PointLayer, once that kind was drawn as points
+        self.point_kinds = set()  # the vertex counts drawn as points now
+        self.draw_sec = 0.0  # the collections' draw time since the last frame
+
+    def get_layer(self, vertex_count, hatch):
+        """@return the layer for this kind of shape, creating it as needed"""
+        key = (vertex_count, hatch)
+        layer = self.layer_dic.get(key)
+        if layer is None:
+            layer = self.layer_dic[key] = CollectionLayer(
+                self.axes, vertex_count, hatch, self.zorder, owner=self)
+            if vertex_count in self.point_kinds:
+                layer.collection.set_visible(False)
+            LOG.info('added layer for %d vertices hatch:%s', vertex_count, hatch)
+        return layer
+
+    def create_polygon(self, points):
+        """@return an item standing in for a Polygon"""
+        return CollectionItem(self, len(points), points=points)
+
+    def create_circle(self, center_xy, radius):
+        """@return an item standing in for a Circle"""
+        return CollectionItem(self, CIRCLE_VERTEX_COUNT, center=center_xy, radius=radius)
+
+    def layers_of(self, vertex_count):
+        """@return the layers of a kind of shape, whatever their hatch"""
+        return [layer for (count, _), layer in self.layer_dic.items() if count == vertex_count]
+
+    def update_level_of_detail(self):
+        """give the last frame's draw time to the LevelOfDetail, switch the kinds it
+        chooses; @return the kinds switched"""
+        count_dic = {}
+        for (vertex_count, _), layer in self.layer_dic.items():
+            count_dic[vertex_count] = count_dic.get(vertex_count, 0) + layer.shown_count()
+        kinds = self.lod.observe(self.draw_sec, count_dic, self.point_kinds)
+        self.draw_sec = 0.0
+        switched = kinds ^ self.point_kinds
+        for vertex_count in switched:
+            points = vertex_count in kinds
+            if points and vertex_count not in self.point_dic:
+                self.point_dic[vertex_count] = PointLayer(
+                    self.axes, vertex_count, self.zorder, owner=self)
+            self.point_dic[vertex_count].collection.set_visible(points)
+            for layer in self.layers_of(vertex_count):
+                layer.collection.set_visible(not points)
+                layer.dirty = True  # for the points, or for the polygons switched back
+            LOG.info('%d vertices drawn as %s, %s', vertex_count,
+                     'points' if points else 'polygons', self.lod)
+        self.point_kinds = kinds
+        return switched
+
+    def artists(self, changed_only=False):
+        """flush every layer and @return its collections for the animation to draw,
+        with changed_only just those that changed since the last flush"""
+        switched = self.update_level_of_detail() if self.lod else set()
+        artists = []
+        for (vertex_count, _), layer in self.layer_dic.items():
+            changed = vertex_count in switched
+            if vertex_count not in self.point_kinds:  # hidden polygons are not flushed
+                changed = layer.flush() or changed
+            if changed or not changed_only:
+                artists.append(layer.collection)
+        for vertex_count, points in self.point_dic.items():
+            changed = vertex_count in switched
+            if vertex_count in self.point_kinds:
+                changed = points.flush(self.layers_of(vertex_count)) or changed
+            if changed or not changed_only:
+                artists.append(points.collection)
+        return artists
@@ -19,7 +19,7 @@ from io import StringIO
 import sys
 import textwrap
 
-from shape import COLOR_MAP
+from shape import COLOR_MAP, instance_color
 
 LOG = logging.getLogger(__name__)
 
@@ -293,6 +293,23 @@ class ConfigParser:
         LOG.info(pub_dic)
         return pub_dic
 
+    @staticmethod
+    def expand_instances(pub_list, count):
+        """@return count instances of each pub_dic, keyed by synthetic colors such as
+        BLUE-000123, their positions, directions and angles spread so they do not move in step"""
+        expanded = []
+        for pub_dic in pub_list:
+            x, y = pub_dic['xy']
+            delta_x, delta_y = pub_dic['delta_xy']
+            for ix in range(count):
+                instance = copy.copy(pub_dic)
+                instance['color'] = instance_color(pub_dic['color'], ix)
+                instance['xy'] = [x + (ix * 37) % 150, y + (ix * 53) % 170]
+                instance['delta_xy'] = [delta_x + ix % 3, delta_y + (ix // 3) % 3]
+                instance['angle'] = (pub_dic['angle'] + ix * 7) % 360
+                expanded.append(instance)
+        return expanded
+
     def get_config(self, parsed_args):
         """prepare config from config or command-line"""
         is_pub, config = False, {}
@@ -19,10 +19,16 @@ from math import sqrt
 import os
 
 # Connext imports
-import rti.connextdds as dds
-from ShapeTypeExtended import ShapeType, ShapeTypeExtended
+from transport import dds
+from shape_types import ShapeType, ShapeTypeExtended
+
+from instance_registry import InstanceRegistry, PolyKey
+from participant_factory import ParticipantFactory
+from shape import Shape
+from shape_store import ShapeStore
 
 LOG = logging.getLogger(__name__)
+TOPIC_NAME_DIC = {'C': 'Circle', 'S': 'Square', 'T': 'Triangle'}
 
 def get_cwd(file):
     """@return fullpath of local file"""
@@ -39,42 +45,65 @@ def possibly_log_qos(qos_log_level, entity):
 
 class Connext(ABC):
     """Parent class for ConnextPublisher an ConnextSubscriber"""
-    poly_dic = {}  # all polygon instances keyed by Topic+Color+InstanceNum and Gone
-    sample_counter = Counter()
-    participant_qos = dds.QosProvider.default.participant_qos_from_profile(
-        "ShapeTypeExtended_Library::ShapeTypeExtended_Profile")
+    factory = ParticipantFactory()  # one participant per domain, QoS parsed once per process
 
     def __init__(self, matplotlib, args):
         self.args = args
         self.matplotlib = matplotlib
-        self.participant = dds.DomainParticipant(args.domain_id)
-        possibly_log_qos(self.args.log_qos, self.participant)
-
-        self.qos_provider = self.get_qos_provider()
-        self.rw_qos_provider = dds.QosProvider(args.qos_file, f'{args.qos_lib}::{args.qos_profile}')
+        # per instance, so the panels of one process keep their own shapes and counts
+        # all polygons keyed by PolyKey(which, color, slot, gone)
+        self.poly_dic = InstanceRegistry()
+        self.sample_counter = Counter()
+        # with --shape_store, the drawn shapes are views of rows of NumPy columns; the
+        #  default, tuple-based Shapes are faster per update and per get_points
+        self.shape_store = ShapeStore() if args.shape_store else None
+        self.shape_factory = Shape if self.shape_store is None else self.shape_store
+        # with --dirty_blit, draw hands back only the artists changed since the last frame
+        self.dirty_set = set()
+        self.renumber_count = Shape.zorder_manager.renumber_count
+        self.latency = None  # a LatencyTracker, for subscribers with --latency
+        self.participant_qos = self.factory.participant_qos()
+        # the readers and writers use the same profile, so one provider serves both
+        self.qos_provider = self.rw_qos_provider = self.get_qos_provider()
         entity_name = dds.EntityName('EntityNameIsFred')
         entity_name.role_name = 'the role of Fred'
         self.participant_qos.participant_name = entity_name
         possibly_log_qos(self.args.log_qos, self.participant_qos)
 
-        self.participant_with_qos = dds.DomainParticipant(args.domain_id, self.participant_qos)
-        if args.extended:
-            self.topic_dic = {
-                'C': dds.Topic(self.participant_with_qos, "Circle", ShapeTypeExtended),
-                'S': dds.Topic(self.participant_with_qos, "Square", ShapeTypeExtended),
-                'T': dds.Topic(self.participant_with_qos, "Triangle", ShapeTypeExtended)
-            }
-        else:
-            self.topic_dic = {
-                'C': dds.Topic(self.participant_with_qos, "Circle", ShapeType),
-                'S': dds.Topic(self.participant_with_qos, "Square", ShapeType),
-                'T': dds.Topic(self.participant_with_qos, "Triangle", ShapeType)
-            }
+        # a single participant, which used to be created twice, with and without the QoS
+        #  a participant has one type per topic name, so ShapeType gets its own
+        shape_type = ShapeTypeExtended if args.extended else ShapeType
+        self.participant = self.participant_with_qos = self.factory.participant(
+            args.domain_id, self.participant_qos, shape_type.__name__)
+        possibly_log_qos(self.args.log_qos, self.participant)
+        self.topic_dic = {
+            which: self.factory.topic(self.participant_with_qos, name, shape_type)
+            for which, name in TOPIC_NAME_DIC.items()
+        }
+
+    def mark_dirty(self, artist):
+        """note an artist moved, restyled, was hidden or taken off the axes this frame"""
+        self.dirty_set.add(artist)
+
+    def take_dirty(self):
+        """@return the artists changed since the last call, and forget them"""
+        renumber_count = Shape.zorder_manager.renumber_count
+        if renumber_count != self.renumber_count:  # every tracked zorder changed
+            self.renumber_count = renumber_count
+            self.dirty_set.update(self.poly_dic.values())
+        dirty, self.dirty_set = self.dirty_set, set()
+        return dirty
+
+    def frame_artists(self, polys):
+        """@return what draw hands back: with --dirty_blit the changed artists, else polys"""
+        if self.args.dirty_blit:
+            return self.matplotlib.dirty_artists(self.take_dirty())
+        return self.matplotlib.animated_artists(polys)
 
     @staticmethod
     def form_poly_key(which, color, instance_num=None):
         """@return a key to a polygon; must have instance number to draw (subscriber) history"""
-        return f'{which}-{color}' + (f'-{instance_num}' if instance_num else "")
+        return PolyKey(which, color, instance_num)
 
     def get_qos_provider(self):
         """fetch the qos_profile from the lib in the file"""
@@ -82,7 +111,7 @@ class Connext(ABC):
         qos_file = self.args.qos_file
         #  prepend with cwd if starts with dot
         qos_file = cwd + qos_file[1:] if qos_file[0] == '.' else qos_file
-        return dds.QosProvider(qos_file, f'{self.args.qos_lib}::{self.args.qos_profile}')
+        return self.factory.qos_provider(qos_file, f'{self.args.qos_lib}::{self.args.qos_profile}')
 
     # marking methods are currently only used by Subscriber; could be relocated
     @staticmethod
@@ -146,7 +175,7 @@ class Connext(ABC):
 
         _, edge_color = shape.face_and_edge_color_code()
         endpoints = self._get_x_points(center, shape, poly_key)
-        key = f'{poly_key}-gone'
+        key = poly_key._replace(gone=True)
         line = self.matplotlib.create_line(endpoints, color=edge_color, zorder=zorder)
         LOG.debug(f'{key=} {endpoints=} {edge_color=} {zorder=} {line=}')
         self.matplotlib.axes.add_patch(line)
@@ -165,6 +194,20 @@ class Connext(ABC):
         LOG.info(fstr)
         return self._mark(shape, poly_key, "x")
 
+    def exit_summary(self):
+        """@return what to log on exit: the sample counts, and latencies if tracked"""
+        summary = str(self.sample_counter)
+        if self.latency:
+            summary += '\n' + self.latency.summary()
+        return summary
+
+    def is_matched(self):
+        """@return True once a reader or writer matched one elsewhere; children override this"""
+        return False
+
+    def stop_threads(self):
+        """stop any background threads; children that start them override this"""
+
     #  @abstractmethod
     def draw(self, _):
         """require any child implements this callback to matplotlib"""
@@ -14,14 +14,18 @@
 # python imports
 import logging
 from pprint import pformat
+import threading
 # Connext imports
-import rti.connextdds as dds
+from transport import dds
 # It is required that the rtiddsgen be alreay run to create the type class
 # The generated <datatype>.py class file should be included here
-from ShapeTypeExtended import ShapeType, ShapeTypeExtended
+from shape_types import ShapeType, ShapeTypeExtended
 
+from config_parser import ConfigParser
 from connext import Connext, possibly_log_qos
-from shape import Shape
+from publish_thread import PublishThread
+from shape import Shape, display_color
+from shape_engine import ShapeEngine
 
 LOG = logging.getLogger(__name__)
 
@@ -69,29 +73,79 @@ class ConnextPublisher(Connext):
         #writer_qos = self.qos_provider.datawriter_qos  ## TODO: use me
         self.publisher = dds.Publisher(self.participant_with_qos)
         possibly_log_qos(self.args.log_qos, self.publisher)
-        self.shape_dic = {}  # which: Shape
+        self.shape_dic = {}  # which-color: Shape
         self.sample_dic = {}  # which-color: latest-published-sample
         self.writer_dic = {}  # which: dataWriter
+        if args.instances > 1:  # after logging the configured shapes, not every instance
+            config_list = ConfigParser.expand_instances(config_list, args.instances)
         for config in config_list:
             #LOG.debug(f'{self.topic_dic=} \n{self.participant=}')
-            LOG.info('config:%s', config)
             key = config['which']
-            self.writer_dic[key] = dds.DataWriter(
-                self.publisher, self.topic_dic[key], self.rw_qos_provider.datawriter_qos)
+            if key in self.writer_dic:
+                continue  # one writer per topic, however many instances
+            LOG.info('config:%s', config)
+            with self.factory.timer.phase('writers'):
+                self.writer_dic[key] = dds.DataWriter(
+                    self.publisher, self.topic_dic[key], self.rw_qos_provider.datawriter_qos)
             possibly_log_qos(self.args.log_qos, self.writer_dic[key])
         self.pub_config_list = config_list
-        LOG.debug('Pub starting - pub_config_list: %s %s', pformat(config_list), self.writer_dic)
+        # with --register_instances, each pub key's instance is written by its handle
+        self.handle_dic = {}  # which-color: InstanceHandle
+        if args.register_instances:
+            self.register_instances()
+        # with --vectorized, all instances move as rows of one ShapeEngine
+        use_engine = args.vectorized or args.writer_rate or args.instances > 1
+        self.engine = ShapeEngine(config_list, args.graph_xy) if use_engine else None
+        self.engine_sample_list = []  # engine row: sample
+        self.engine_poly_list = []  # engine row: poly
+        self.engine_writer_list = [self.writer_dic[config['which']] for config in config_list]
+        self.engine_handle_list = [
+            self.handle_dic.get(self.form_pub_key(config['which'], config['color']))
+            for config in config_list]
+        self.engine_write_keys = [
+            f"{self.form_pub_key(config['which'], display_color(config['color']))}-write"
+            for config in config_list]
+        # with --writer_rate, a PublishThread owns the engine; draw only reads a snapshot
+        self.state_lock = threading.Lock()
+        self.publish_thread = None
+        if args.writer_rate:
+            self.publish_thread = PublishThread(self.publish_engine_samples, args.writer_rate)
+            self.publish_thread.start()
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug('Pub starting - pub_config_list: %s %s', pformat(config_list),
+                      self.writer_dic)
 
     @staticmethod
     def form_pub_key(normalized_shape, normalized_color):
         """format and return a publisher key"""
         return f'{normalized_shape}-{normalized_color}'
 
+    def register_instances(self):
+        """register the instance of each configured shape, so no write looks up its key"""
+        with self.factory.timer.phase('register'):
+            for config in self.pub_config_list:
+                key = self.form_pub_key(config['which'], config['color'])
+                if key not in self.handle_dic:
+                    self.handle_dic[key] = self.writer_dic[config['which']].register_instance(
+                        self.create_default_sample(config))
+        LOG.info('registered %d instances', len(self.handle_dic))
+
+    def end_instances(self):
+        """unregister, or with --register_instances dispose, the registered instances,
+        so subscribers release them without waiting for liveliness to lapse"""
+        for key, handle in self.handle_dic.items():
+            writer = self.writer_dic[key.split('-', 1)[0]]
+            if self.args.register_instances == 'dispose':
+                writer.dispose_instance(handle)
+            else:
+                writer.unregister_instance(handle)
+        LOG.info('%s %d instances', self.args.register_instances, len(self.handle_dic))
+        self.handle_dic = {}
+
     def create_default_sample(self, pub_dic):
         """use the defaults to create a sample"""
-        LOG.info('pub_dic=%s', pub_dic)
+        LOG.debug('pub_dic=%s', pub_dic)
         sample = ShapeTypeExtended() if self.args.extended else ShapeType()
-        LOG.info(pub_dic)
         sample.x, sample.y = pub_dic['xy']
         sample.color = pub_dic['color']
         sample.shapesize = pub_dic['shapesize']
@@ -108,22 +162,24 @@ class ConnextPublisher(Connext):
         """publish a single sample"""
         which = pub_dic['which']  # only 1 key for now
         key = self.form_pub_key(which, pub_dic.get('color'))  # TODO: refactor defaults?
-        self.sample_counter.update([f'{key}-write'])
+        # synthetic instances count under their palette color, not one key each
+        self.sample_counter.update(
+            [f"{self.form_pub_key(which, display_color(pub_dic['color']))}-write"])
         sample = self.sample_dic.get(key)
         is_new_sample = sample is None
         if is_new_sample:
             sample = self.create_default_sample(pub_dic)
             LOG.debug('NEW sample=%s', sample)
 
-            shape = Shape.from_pub_sample(
+            shape = self.shape_factory.from_pub_sample(
                 matplotlib=self.matplotlib,
                 which=which,
                 sample=sample,
                 extended=self.args.extended
             )
-            self.shape_dic[which] = shape
+            self.shape_dic[key] = shape
         else:
-            shape = self.shape_dic[which]
+            shape = self.shape_dic[key]
         poly_key = self.form_poly_key(which, shape.color)
         self.update_shape(shape, sample)
 
@@ -140,9 +196,12 @@ class ConnextPublisher(Connext):
             #LOG.debug(f'SET_XY {key=} {xy=} {shape.angle=}')
         poly = self.poly_dic.get(poly_key)
         points = shape.get_points()
-        self.adjust_zorder()
 
-        self.writer_dic[which].write(sample)  ## publish the sample
+        handle = self.handle_dic.get(key)
+        if handle is None:
+            self.writer_dic[which].write(sample)  ## publish the sample
+        else:
+            self.writer_dic[which].write(sample, handle)
         self.sample_dic[key] = sample       ##   and remember it
         LOG.debug('sample:%s', self.sample_dic[key])
         if not poly:
@@ -152,32 +211,91 @@ class ConnextPublisher(Connext):
             if self.args.justdds:
                 LOG.warning("justdds: early exit")
                 return
-            self.matplotlib.axes.add_patch(poly)
+            self.matplotlib.add_patch(poly)
         shape.set_poly_center(poly, which, points)
         # update the plot
         poly.set(lw=self.matplotlib.THIN_EDGE_LINE_WIDTH, zorder=shape.zorder)
+        Shape.zorder_manager.touch(poly)
+        self.mark_dirty(poly)
+
+    def publish_engine_samples(self):
+        """step the engine and publish every instance from its arrays"""
+        with self.state_lock:
+            if self.engine_sample_list:
+                self.engine.step()
+            else:  # first time, publish the configured starting positions
+                self.engine_sample_list = [
+                    self.create_default_sample(pub_dic) for pub_dic in self.pub_config_list]
+            self.engine.fill_samples(self.engine_sample_list, self.args.extended)
+            for writer, sample, handle in zip(self.engine_writer_list, self.engine_sample_list,
+                                              self.engine_handle_list):
+                if handle is None:
+                    writer.write(sample)
+                else:
+                    writer.write(sample, handle)
+            self.sample_counter.update(self.engine_write_keys)
+
+    def create_engine_polys(self):
+        """create one polygon per engine row from its first sample"""
+        for pub_dic, sample in zip(self.pub_config_list, self.engine_sample_list):
+            shape = Shape.from_pub_sample(
+                matplotlib=self.matplotlib,
+                which=pub_dic['which'],
+                sample=sample,
+                extended=self.args.extended
+            )
+            poly = shape.create_poly()
+            poly.set(lw=self.matplotlib.THIN_EDGE_LINE_WIDTH)
+            self.matplotlib.add_patch(poly)
+            self.engine_poly_list.append(poly)
+
+    def render_engine_samples(self):
+        """move each instance's polygon to the latest published points"""
+        with self.state_lock:  # hold only long enough to copy the state
+            if not self.engine_sample_list:
+                return  # nothing published yet
+            if not self.engine_poly_list:
+                self.create_engine_polys()
+            engine = self.engine.snapshot()
+        for which, rows in engine.index_dic.items():
+            if which == 'C':
+                points_list = engine.centers(which).tolist()
+            else:
+                points_list = engine.vertices(which, self.args.extended)
+            for row, points in zip(rows, points_list):
+                Shape.set_poly_center(self.engine_poly_list[row], which, points)
+        self.dirty_set.update(self.engine_poly_list)  # every instance moves each step
+
+    def is_matched(self):
+        """@return True once any writer matched a reader"""
+        return any(writer.publication_matched_status.current_count
+                   for writer in self.writer_dic.values())
 
-    def adjust_zorder(self, limit=500):
-        """Periodically, reset the zorder to prevent runaway growth"""
-        for child in self.matplotlib.axes.get_children():
-            if child.zorder > limit:
-                for child2 in self.matplotlib.axes.get_children():
-                    if child2.zorder > 10:  # skip base zorder items
-                        child2.set(zorder=int(child2.zorder/2))
-                Shape.shared_zorder = int(Shape.shared_zorder / 2)
-                break
+    def stop_threads(self):
+        """stop the --writer_rate thread, if running, then end any registered instances"""
+        if self.publish_thread:
+            self.publish_thread.stop()
+        if self.handle_dic:
+            self.end_instances()
 
     def draw(self, _):
         """callback for matplotlib to update shapes"""
+        if self.engine:
+            if not self.publish_thread:
+                self.publish_engine_samples()
+            if not self.args.justdds:
+                self.render_engine_samples()
+            return self.frame_artists(self.engine_poly_list)
         for pub_dic in self.pub_config_list:
             self.publish_sample(pub_dic)
-        return self.poly_dic.values()
+        return self.frame_artists(self.poly_dic.values())
 
     def __repr__(self):
         return ('<ConnextPublisher:\n' +
                 f'  pub_config_list: {self.pub_config_list}\n' +
                 f'  shapes: {self.shape_dic}\n' +
                 f'  samples: {self.sample_dic}\n' +
-                f'  writers: {self.writer_dic}' +
+                f'  writers: {self.writer_dic}\n' +
+                f'  engine: {self.engine}' +
                 '> ')
         #self.publisher = dds.Publisher(self.participant_with_qos)
@@ -11,19 +11,28 @@
 """Subscribes to Shapes and updates them in matplotlib"""
 
 # python imports
-from collections import defaultdict
+from collections import Counter, OrderedDict
+import itertools
 import json
 import logging
+from operator import itemgetter
 
 # Connext imports
-import rti.connextdds as dds
+from transport import dds
 
+from artist_pool import ArtistPool
 from connext import Connext, possibly_log_qos
+from event_redraw import WakeThread
 from instance_gen import InstanceGen
+from latency_stats import LatencyTracker
+from sample_log import SampleLogWriter, SampleReplayer, read_sample_log
 from shape import Shape, COLOR_MAP
 from shape_listener import ShapeListener
+from take_thread import LatestStateTable, TakeThread
 
 LOG = logging.getLogger(__name__)
+# the participant is shared, so each subscriber's content filter names are made unique
+CFT_SERIAL = itertools.count(1)
 
 class ConnextSubscriber(Connext):
     """Subscriber can subscribe to one or more shapes"""
@@ -33,7 +42,7 @@ class ConnextSubscriber(Connext):
         self.instance_gen_dic = {}  # Topic-color: InstanceGen
         self.shape_dic = {}  # Topic-color: InstanceGen
         self.reader_dic = {}  # one reader per Shape key: CST values: dds.DataReader
-        self.poly_pub_dic = defaultdict(list)  # key: pubHandle values: [poly_key1, poly_key2...]
+        self.serial = next(CFT_SERIAL)
         self.subscriber = dds.Subscriber(self.participant_with_qos)
         possibly_log_qos(self.args.log_qos, self.subscriber)
         reader_qos = self.qos_provider.datareader_qos
@@ -43,15 +52,49 @@ class ConnextSubscriber(Connext):
         for which in config.keys():
             LOG.info(f'Subscribing to {which=} {config[which]=}')
             topic = self._init_get_topic(which, config)
-            self.reader_dic[which] = dds.DataReader(
-                self.subscriber,
-                topic,
-                reader_qos,
-                listener,
-                status_mask
-            )
+            with self.factory.timer.phase('readers'):
+                self.reader_dic[which] = dds.DataReader(
+                    self.subscriber,
+                    topic,
+                    reader_qos,
+                    listener,
+                    status_mask
+                )
             possibly_log_qos(self.args.log_qos, self.reader_dic[which])
 
+        # samples are coalesced per instance in latest_state before any Shape is touched
+        # with --take_thread, the readers are drained into it off the animation thread
+        self.depth_dic = {
+            which: self.get_max_samples_per_instance(which) for which in self.reader_dic}
+        # history slots draw with pooled artists; gone instances are retired oldest first
+        #  when a kind has none free, so the artist count stays bounded in long sessions
+        self.artist_pool = None
+        if not args.justdds:
+            self.artist_pool = ArtistPool(
+                matplotlib, Shape.zorder_manager, self.depth_dic, args.artist_pool)
+        self.gone_dic = {which: OrderedDict() for which in self.reader_dic}  # which: {color}
+        self.latency = LatencyTracker() if args.latency else None
+        self.capture = SampleLogWriter(args.capture) if args.capture else None
+        self.latest_state = LatestStateTable(timestamps=bool(self.latency), capture=self.capture)
+        # with --replay, samples captured earlier are written to this process' readers
+        self.replayer = None
+        if args.replay:
+            self.replayer = SampleReplayer(self.topic_dic, read_sample_log(args.replay),
+                                           args.replay_speed, args.extended)
+        self.take_thread = None
+        if args.take_thread:
+            self.take_thread = TakeThread(self.reader_dic, self.depth_dic, self.latest_state)
+            self.take_thread.start()
+        # with --event_redraw, a frame is drawn only when the WakeThread sees data or a status
+        #  the take thread and the replayer need frames of their own, so they keep the timer
+        self.wake_thread = None
+        if args.event_redraw:
+            if args.take_thread or args.replay or args.justdds:
+                LOG.warning('--event_redraw ignored with --take_thread, --replay or --justdds')
+            else:
+                self.wake_thread = WakeThread(self.reader_dic)
+                listener.on_status = self.wake_thread.status_changed
+
     def _init_get_topic(self, which, config):
         """get a Content Filtered or normal Topic"""
         topic = self.topic_dic[which]
@@ -73,7 +116,8 @@ class ConnextSubscriber(Connext):
         else:
             expr = "x <= %0 AND y <= %1 AND x >= %2 and y >= %3"
         params = [str(n) for sublist in cfxy for n in sublist]
-        topic = dds.ContentFilteredTopic(topic, f"CFTxy-{which}-{in_ex}", dds.Filter(expr, params))
+        topic = dds.ContentFilteredTopic(
+            topic, f"CFTxy-{which}-{in_ex}-{self.serial}", dds.Filter(expr, params))
         anchor = (
             min(cfxy[0][0], cfxy[1][0]),
             #min(self.matplotlib.flip_y(cfxy[0][1]), self.matplotlib.flip_y(cfxy[1][1]))
@@ -86,6 +130,7 @@ class ConnextSubscriber(Connext):
         rect = self.matplotlib.create_rectangle(anchor, extents, colors)
         rect.set(hatch=hatch_pattern[which])
         self.matplotlib.axes.add_patch(rect)
+        self.matplotlib.add_static(rect)
         return topic
 
     def _init_content_filter_color(self, topic, which, cf_color, in_ex):
@@ -94,7 +139,8 @@ class ConnextSubscriber(Connext):
             expr = "NOT " + expr
         params = [f"'{cf_color}'"]  # doubly-quoted string is needed, i.e. ["'RED'"]
         LOG.info(f'filtering for {expr=} {params=} {in_ex=}')
-        return dds.ContentFilteredTopic(topic, f"CFT-{which}-{in_ex}", dds.Filter(expr, params))
+        return dds.ContentFilteredTopic(
+            topic, f"CFT-{which}-{in_ex}-{self.serial}", dds.Filter(expr, params))
 
     def get_max_samples_per_instance(self, which):
         """ helper to fetch depth from a reader"""
@@ -132,13 +178,10 @@ class ConnextSubscriber(Connext):
 
         def _create_shape(self, which, instance_gen_key):
             """helper to create a new shape"""
-            LOG.info(f'{which=} {pub_handle=}')
-            inst = InstanceGen(self.get_max_samples_per_instance(which))
+            inst = InstanceGen(self.depth_dic[which])
             self.instance_gen_dic[instance_gen_key] = inst
-            LOG.info(f'ADD {instance_gen_key=} at {pub_handle=}')
-            self.poly_pub_dic[pub_handle].append(instance_gen_key)
-            LOG.info(f'{self.poly_pub_dic[pub_handle]=}')
-            return inst, Shape.from_sub_sample(
+            LOG.debug('ADD instance_gen_key=%s at pub_handle=%s', instance_gen_key, pub_handle)
+            return inst, self.shape_factory.from_sub_sample(
                 matplotlib=self.matplotlib,
                 which=which,
                 seq=seq,
@@ -154,21 +197,28 @@ class ConnextSubscriber(Connext):
             prev_poly = self.poly_dic.get(prev_poly_key)
             if prev_poly:
                 prev_poly.set(lw=self.matplotlib.THIN_EDGE_LINE_WIDTH)
+                self.matplotlib.set_history(prev_poly, True)
+                self.mark_dirty(prev_poly)
 
         ## create/update a matplotlib polygon from the sample data, add to poly_dic
         ## remove the prior poly's edge
         self.sample_counter.update([f'{which}-read'])
         instance_gen_key = self.form_poly_key(which, data.color)
         #LOG.info('sample:%s', data)
+        self.poly_dic.set_publication(pub_handle, which, data.color)
         inst = self.instance_gen_dic.get(instance_gen_key)
         if inst:  # same key for shape
             shape = self.shape_dic[instance_gen_key]
             if shape.gone:
                 # on update of a sample for a Gone instance, remove all the Xs
                 # Alternatively, recode to remove instances one-at-a-time like ShapesDemoJ does
-                gone_keys = [key for key in self.poly_dic if instance_gen_key in key]
+                gone_keys = self.poly_dic.keys_for_instance(which, data.color, gone=True)
                 for key in gone_keys:
-                    del self.poly_dic[key]
+                    line = self.poly_dic.pop(key)
+                    self.matplotlib.remove_patch(line)
+                    Shape.zorder_manager.forget(line)
+                    self.mark_dirty(line)
+                self.gone_dic[which].pop(data.color, None)
                 LOG.info(f'{gone_keys=}')
             shape.update(data.x, data.y, data.angle if self.args.extended else None)
         else:
@@ -182,38 +232,63 @@ class ConnextSubscriber(Connext):
             LOG.info("early exit")
             return
         if not poly:
-            poly = shape.create_poly()
+            if not self.artist_pool.available(which) and self.gone_dic[which]:
+                self.retire_instance(which, next(iter(self.gone_dic[which])))
+            poly = self.artist_pool.acquire(shape)
             self.poly_dic[poly_key] = poly
             LOG.debug('added poly_key:%s', poly_key)
-            self.matplotlib.axes.add_patch(poly)
 
         shape.set_poly_center(poly, which, shape.get_points())
         poly.set(lw=self.matplotlib.WIDE_EDGE_LINE_WIDTH, zorder=shape.zorder)
+        self.matplotlib.set_history(poly, False)
+        Shape.zorder_manager.touch(poly)
+        self.mark_dirty(poly)
         _fixup_edges(self, which, shape.color, inst.get_prev_ix(), poly_key)
 
     def _mark_gone(self, gone_guid):
         """add a gone multistep line Xing the shape"""
         new_gones = {}
-        gone_keys = self.poly_pub_dic.get(gone_guid)
-        if gone_keys is None:
-            LOG.warning(f'{gone_guid=} {self.poly_pub_dic=}')
-        for poly_key, poly in self.poly_dic.items():
-            LOG.debug('checking %s', poly_key)
-            for gone_key in gone_keys or []:
-                LOG.info(f'checking {gone_key=}')
-                if gone_key in poly_key:
-                    LOG.info(f'match: {gone_key=} {self.shape_dic=} {poly_key=}')
-                    shape = self.shape_dic[gone_key]
-                    key, gone = self.mark_gone(shape, poly_key)
-                    new_gones[key] = gone
-                else:
-                    LOG.info(f'no match, add to new dic {gone_key=} {poly_key=} {poly=}')
+        gone_instances = self.poly_dic.instances_for_publication(gone_guid)
+        if not gone_instances:
+            LOG.warning(f'{gone_guid=} {self.poly_dic=}')
+        # only the instances this publication wrote, and only their drawn slots, are visited
+        for which, color in gone_instances:
+            shape = self.shape_dic.get(self.form_poly_key(which, color))
+            if shape is None or shape.gone:
+                continue  # not drawn (justdds) or already Xed
+            for poly_key in self.poly_dic.keys_for_instance(which, color, gone=False):
+                LOG.debug('match: gone_guid=%s poly_key=%s', gone_guid, poly_key)
+                key, gone = self.mark_gone(shape, poly_key)
+                Shape.zorder_manager.attach(gone, self.poly_dic[poly_key])
+                new_gones[key] = gone
+            self.gone_dic[which][color] = None  # latest gone last
         # add new gone markers to the displayable polygons dic so plotlib will show them
-        LOG.info(f'{new_gones=}')
+        LOG.info('%d new gones', len(new_gones))
         for key, value in new_gones.items():
             self.poly_dic[key] = value
+            self.mark_dirty(value)
         LOG.debug('poly_dic: %s', self.poly_dic)
 
+    def retire_instance(self, which, color):
+        """forget an instance, returning its history artists to the pool and
+        taking its gone markers off the axes"""
+        for key in self.poly_dic.keys_for_instance(which, color):
+            artist = self.poly_dic.pop(key)
+            if key.gone:
+                self.matplotlib.remove_patch(artist)
+                Shape.zorder_manager.forget(artist)
+            else:
+                self.artist_pool.release(which, artist)
+            self.mark_dirty(artist)
+        self.poly_dic.forget_instance(which, color)
+        self.gone_dic[which].pop(color, None)
+        instance_gen_key = self.form_poly_key(which, color)
+        self.instance_gen_dic.pop(instance_gen_key, None)
+        shape = self.shape_dic.pop(instance_gen_key, None)
+        if shape is not None and self.shape_store is not None:
+            self.shape_store.release(shape)
+        LOG.debug('retired %s-%s', which, color)
+
     def mark_reader_gone(self, p_reader, guid):
         """update status and mark shape gone"""
         handles = p_reader.matched_publications
@@ -221,23 +296,57 @@ class ConnextSubscriber(Connext):
         self._mark_gone(guid)
 
     def handle_samples(self, reader, which):
-        """get samples and handle each"""
-        for data, info in reader.take():
-            if info.valid:
-                LOG.debug('sample:%s', data)
-                self.handle_one_sample(
-                    which,
-                    info.reception_sequence_number.value,
-                    data,
-                    str(info.publication_handle)
-                )
-            else:
-                LOG.info(f"State changed: {info.state}")
-                self.process_state(reader, info)
+        """take samples into the latest-state table, which coalesces each instance to
+        its history depth so samples overwritten within a frame never reach a Shape"""
+        self.latest_state.put(which, reader, self.depth_dic[which], reader.take())
+
+    def handle_latest_state(self):
+        """handle the samples kept since the last frame, in arrival order"""
+        instance_dic, state_list, taken = self.latest_state.swap()
+        kept = Counter()
+        pending = []  # (arrival, handler, handler_args)
+        for (which, _), entries in instance_dic.items():
+            kept[f'{which}-read'] += len(entries)
+            for arrival, seq, data, pub_handle, stamps in entries:
+                if stamps:
+                    self.latency.received(which, data.color, *stamps)
+                pending.append((arrival, self.handle_one_sample, (which, seq, data, pub_handle)))
+        for arrival, _, reader, info in state_list:
+            LOG.info(f"State changed: {info.state}")
+            pending.append((arrival, self.process_state, (reader, info)))
+        pending.sort(key=itemgetter(0))
+        for _, handler, handler_args in pending:
+            handler(*handler_args)
+        self.sample_counter.update(taken - kept)  # count the overwritten samples as read
+
+    def is_matched(self):
+        """@return True once any reader matched a writer"""
+        return any(reader.subscription_matched_status.current_count
+                   for reader in self.reader_dic.values())
+
+    def stop_threads(self):
+        """stop the --take_thread or --event_redraw thread, if running, then close
+        any --capture or --replay"""
+        if self.take_thread:
+            self.take_thread.stop()
+        if self.wake_thread:
+            self.wake_thread.stop()
+        if self.capture:
+            self.capture.close()
+        if self.replayer:
+            self.replayer.close()
 
     def draw(self, _):
         """The animation function, called periodically in a set interval, reads the
         last image received and draws it"""
-        for which, reader in self.reader_dic.items():
-            self.handle_samples(reader, which)
-        return self.poly_dic.values()  # give back the updated values so they are rendered
+        if self.replayer:
+            self.replayer.write_due()
+        if not self.take_thread:
+            for which, reader in self.reader_dic.items():
+                self.handle_samples(reader, which)
+        self.handle_latest_state()
+        # give back the updated values so they are rendered
+        artists = self.frame_artists(self.poly_dic.values())
+        if self.latency:
+            self.latency.rendered()
+        return artists
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Schedules a subscriber's screen updates when DDS data or a status arrives, for --event_redraw"""
+
+# python imports
+import logging
+import threading
+import time
+
+# Connext imports
+from transport import dds
+
+## Without --event_redraw, a timer draws every --publish_rate ms, taking from empty readers
+#   and blitting an unchanged window; with it, nothing runs while no data arrives:
+#  a WakeThread waits on a ReadCondition per reader, and a GuardCondition the ShapeListener
+#   triggers on a status change, then asks the GUI thread for a frame, once
+#   it waits again only after that frame took the samples, so it cannot spin on a
+#   ReadCondition still triggered by samples the frame has yet to take
+#  the GUI thread is reached through a Qt signal, queued to the canvas' thread;
+#   other backends poll a flag on a timer instead, which is cheap but not zero
+#  the panels of --panels draw in one frame, so one WakeThread waits on all their readers,
+#   if each panel waits on its own; any panel needing the timer keeps the timer for all
+#  EventRedraw draws the frame no sooner than --publish_rate ms after the last one, so a
+#   burst of samples is coalesced into one frame, as the timer would have done
+
+LOG = logging.getLogger(__name__)
+
+WAIT_TIMEOUT_SEC = 1.0  # only bounds how long stop() can take; the guards wake the wait
+
+
+class WakeThread(threading.Thread):
+    """wait on a ReadCondition per reader and a status guard, call on_wake once per frame"""
+
+    def __init__(self, reader_dic):
+        super().__init__(name='WakeThread', daemon=True)
+        self.reader_dic = reader_dic
+        self.on_wake = None  # set by EventRedraw.start, called on this thread
+        self.stop_event = threading.Event()
+        self.armed = threading.Event()  # cleared from a wake until the frame is drawn
+        self.armed.set()
+        self.wake_count = 0
+        self.guard = dds.GuardCondition()  # wakes the WaitSet on stop()
+        self.status_guard = dds.GuardCondition()  # triggered by status_changed
+        self.waitset = dds.WaitSet()
+        self.waitset.attach_condition(self.guard)
+        self.waitset.attach_condition(self.status_guard)
+        self.condition_list = []
+        for reader in reader_dic.values():
+            self.condition_list.append(dds.ReadCondition(reader, dds.DataState.any))
+            self.waitset.attach_condition(self.condition_list[-1])
+
+    def status_changed(self):
+        """a reader's status changed: draw a frame; called on a listener thread"""
+        self.status_guard.trigger_value = True
+
+    def is_triggered(self):
+        """@return True if a frame should take samples or show a status change"""
+        return (self.status_guard.trigger_value
+                or any(condition.trigger_value for condition in self.condition_list))
+
+    def run(self):
+        LOG.info('waking on %s', list(self.reader_dic.keys()))
+        while not self.stop_event.is_set():
+            if not self.armed.wait(WAIT_TIMEOUT_SEC):
+                continue  # the last frame is still pending
+            self.waitset.wait(dds.Duration(WAIT_TIMEOUT_SEC))
+            if self.stop_event.is_set() or not self.is_triggered():
+                continue
+            self.status_guard.trigger_value = False
+            self.armed.clear()
+            self.wake_count += 1
+            self.on_wake()
+
+    def rearm(self):
+        """the frame took the samples; wait for the next ones"""
+        self.armed.set()
+
+    def stop(self, timeout=WAIT_TIMEOUT_SEC):
+        """ask the thread to finish and wait for it, if it was started"""
+        self.stop_event.set()
+        self.armed.set()
+        self.guard.trigger_value = True
+        if self.is_alive():
+            self.join(timeout)
+
+
+def combined_wake_thread(wake_threads):
+    """@return one WakeThread over the readers of several, woken by their status changes
+    too; for the panels of one figure, drawn by one frame"""
+    reader_dic = {f'{ix}-{key}': reader for ix, wake_thread in enumerate(wake_threads)
+                  for key, reader in wake_thread.reader_dic.items()}
+    combined = WakeThread(reader_dic)
+    for wake_thread in wake_threads:
+        wake_thread.status_guard = combined.status_guard  # their listeners wake it
+    return combined
+
+
+def gui_caller(canvas, func, poll_interval):
+    """@return a function any thread may call to have func called on the canvas' GUI thread"""
+    if type(canvas).__module__.startswith('matplotlib.backends.backend_qt'):
+        # pylint: disable=import-outside-toplevel
+        from matplotlib.backends.qt_compat import QtCore
+
+        class Bridge(QtCore.QObject):
+            """emitting from another thread queues the call to this object's thread"""
+            wake = QtCore.Signal()
+
+        bridge = Bridge()
+        bridge.wake.connect(func)
+        canvas.wake_bridge = bridge  # keep it alive with the canvas
+        return bridge.wake.emit
+
+    wake_event = threading.Event()
+
+    def poll():
+        if wake_event.is_set():
+            wake_event.clear()
+            func()
+
+    timer = canvas.new_timer(interval=poll_interval)
+    timer.add_callback(poll)
+    timer.start()
+    canvas.wake_timer = timer
+    return wake_event.set
+
+
+class EventRedraw:
+    """draws a frame when woken, no sooner than min_interval ms after the last one"""
+
+    def __init__(self, canvas, frame, min_interval, clock=time.monotonic):
+        self.canvas, self.frame = canvas, frame
+        self.min_interval, self.clock = min_interval, clock
+        self.wake_thread = None
+        self.last_frame_sec = None
+        self.pending = False  # a frame is due on the timer
+        self.frame_count = 0
+        self.timer = canvas.new_timer(interval=min_interval)
+        self.timer.single_shot = True
+        self.timer.add_callback(self.on_frame_due)
+
+    def start(self, wake_thread):
+        """start the WakeThread, calling on_wake on the GUI thread; @return self"""
+        self.wake_thread = wake_thread
+        wake_thread.on_wake = gui_caller(self.canvas, self.on_wake, self.min_interval)
+        wake_thread.start()
+        return self
+
+    def on_wake(self):
+        """data or a status arrived: draw now, or when min_interval has passed"""
+        if self.pending:
+            return
+        now = self.clock()
+        wait_ms = (0 if self.last_frame_sec is None
+                   else self.min_interval - (now - self.last_frame_sec) * 1000)
+        if wait_ms <= 0:
+            self.on_frame_due()
+        else:
+            self.pending = True
+            self.timer.interval = max(1, round(wait_ms))
+            self.timer.start()
+
+    def on_frame_due(self):
+        """draw a frame, then let the WakeThread wait for more"""
+        self.pending = False
+        self.last_frame_sec = self.clock()
+        self.frame()
+        self.frame_count += 1
+        if self.wake_thread:
+            self.wake_thread.rearm()
+
+    def __repr__(self):
+        wakes = self.wake_thread.wake_count if self.wake_thread else 0
+        return f'<EventRedraw: {self.frame_count} frames for {wakes} wakes> '
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+"""Helpers the tests share: shapes_demo args, samples, and a Matplotlib drawing on Agg"""
+import os
+
+import matplotlib
+from arg_parser import ArgParser
+from config_parser import ConfigParser
+from shapes_demo import DEFAULT_DIC
+from shape_types import ShapeTypeExtended
+
+
+def parse_app_args(argv, box_title='test'):
+    """@return the shapes_demo args, command and config for argv"""
+    args = ArgParser(DEFAULT_DIC).parse_args(list(argv))
+    args.box_title = box_title
+    return ConfigParser(DEFAULT_DIC).get_config(args)
+
+
+def use_agg():
+    """draw with no display, even if an earlier test imported pyplot with another backend"""
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    matplotlib.use('Agg')
+
+
+def agg_matplotlib(argv, box_title='test'):
+    """@return a Matplotlib drawing on an Agg canvas, and its args and config for argv"""
+    use_agg()
+    args, _, config = parse_app_args(argv, box_title)
+    # pylint: disable=import-outside-toplevel
+    from matplotlib_ import Matplotlib  # only once the backend is chosen
+    return Matplotlib(args), args, config
+
+
+def make_data(color, x=120, y=135):
+    """@return a sample as read from DDS"""
+    data = ShapeTypeExtended()
+    data.color, data.x, data.y, data.shapesize, data.angle = color, x, y, 30, 0
+    return data
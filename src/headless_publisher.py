@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Publishes Shapes with no figure at all, as a load generator"""
+
+# python imports
+import logging
+
+# application imports - none of these may import matplotlib or PyQt5
+from connext_publisher import ConnextPublisher
+from rate_scheduler import RateScheduler
+
+LOG = logging.getLogger(__name__)
+
+REPORT_INTERVAL_SEC = 1.0
+
+
+class HeadlessPublisher(ConnextPublisher):
+    """Publish the ShapeEngine's motion at a target aggregate rate, no artists"""
+
+    def __init__(self, args, config_list):
+        args.vectorized = True  # motion comes only from the engine
+        args.writer_rate = None  # run() is the clock
+        super().__init__(None, args, config_list)
+
+    def run(self, target_rate, duration=None, metrics=None):
+        """publish target_rate samples/sec across all instances until duration or ^C
+        polling the MetricsReporter, if any, after each frame
+        @return the report dictionary"""
+        instance_count = len(self.engine)
+        scheduler = RateScheduler(target_rate / instance_count)
+        LOG.info('publishing %d instances at %.1f samples/sec (%.1f frames/sec)',
+                 instance_count, target_rate, target_rate / instance_count)
+        next_report = REPORT_INTERVAL_SEC
+        try:
+            while duration is None or scheduler.elapsed() < duration:
+                scheduler.wait_next()
+                self.publish_engine_samples()
+                if metrics:
+                    metrics.poll()
+                if scheduler.elapsed() >= next_report:
+                    next_report += REPORT_INTERVAL_SEC
+                    LOG.info('achieved %.1f samples/sec',
+                             scheduler.achieved_rate() * instance_count)
+        except KeyboardInterrupt:
+            LOG.info('interrupted')
+        return self.report(scheduler, target_rate)
+
+    def report(self, scheduler, target_rate):
+        """@return a summary of the requested and achieved rates"""
+        instance_count = len(self.engine)
+        return {
+            'instances': instance_count,
+            'target_rate': target_rate,
+            'achieved_rate': round(scheduler.achieved_rate() * instance_count, 1),
+            'samples': scheduler.ticks * instance_count,
+            'seconds': round(scheduler.elapsed(), 3),
+            'resyncs': scheduler.resyncs,
+        }
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Registry of drawn polygons, indexed by instance and by publication"""
+
+# python imports
+from collections import defaultdict, namedtuple
+from collections.abc import MutableMapping
+import logging
+
+LOG = logging.getLogger(__name__)
+
+# slot is the subscriber's history index, None for a publisher; gone marks the X over a slot
+PolyKey = namedtuple('PolyKey', ['which', 'color', 'slot', 'gone'], defaults=[None, False])
+
+
+class InstanceRegistry(MutableMapping):
+    """a dict of PolyKey: polygon that also knows each instance's keys and publication
+
+    lookups by instance or publication cost O(keys of the instances affected), not a scan
+    """
+
+    def __init__(self):
+        self._poly_dic = {}  # PolyKey: polygon
+        self._instance_dic = defaultdict(set)  # (which, color): {PolyKey}
+        self._pub_dic = defaultdict(set)  # publication handle: {(which, color)}
+        self._owner_dic = {}  # (which, color): publication handle
+
+    @staticmethod
+    def instance_key(poly_key):
+        """@return the (which, color) instance a key belongs to"""
+        return poly_key.which, poly_key.color
+
+    def __getitem__(self, poly_key):
+        return self._poly_dic[poly_key]
+
+    def __setitem__(self, poly_key, poly):
+        self._poly_dic[poly_key] = poly
+        self._instance_dic[self.instance_key(poly_key)].add(poly_key)
+
+    def __delitem__(self, poly_key):
+        del self._poly_dic[poly_key]
+        instance_key = self.instance_key(poly_key)
+        keys = self._instance_dic[instance_key]
+        keys.discard(poly_key)
+        if not keys:
+            del self._instance_dic[instance_key]
+
+    def __iter__(self):
+        return iter(self._poly_dic)
+
+    def __len__(self):
+        return len(self._poly_dic)
+
+    def values(self):
+        """the polygons, without the Mapping view's per-item lookups"""
+        return self._poly_dic.values()
+
+    def keys_for_instance(self, which, color, gone=None):
+        """@return the keys of one instance, only gone or not gone ones unless gone is None"""
+        keys = self._instance_dic.get((which, color), ())
+        return [key for key in keys if gone is None or key.gone == gone]
+
+    def set_publication(self, pub_handle, which, color):
+        """record which publication last wrote an instance"""
+        instance_key = (which, color)
+        owner = self._owner_dic.get(instance_key)
+        if owner == pub_handle:
+            return
+        if owner is not None:
+            self._pub_dic[owner].discard(instance_key)
+        self._owner_dic[instance_key] = pub_handle
+        self._pub_dic[pub_handle].add(instance_key)
+        LOG.info('%s-%s published by %s', which, color, pub_handle)
+
+    def forget_instance(self, which, color):
+        """drop an instance's publication; its keys must already be deleted"""
+        owner = self._owner_dic.pop((which, color), None)
+        if owner is not None:
+            instances = self._pub_dic[owner]
+            instances.discard((which, color))
+            if not instances:
+                del self._pub_dic[owner]
+
+    def instances_for_publication(self, pub_handle):
+        """@return the (which, color) instances last written by a publication"""
+        return list(self._pub_dic.get(pub_handle, ()))
+
+    def __repr__(self):
+        return (f'<InstanceRegistry: {len(self)} polys {len(self._instance_dic)} instances '
+                f'{len(self._pub_dic)} publications> ')
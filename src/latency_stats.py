@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Streaming latency histograms per topic and per instance"""
+
+# python imports
+from collections import Counter, defaultdict
+import logging
+import math
+import time
+
+## A LatencyHistogram counts samples in log-spaced buckets, each RESOLUTION wider than the last,
+#   so a percentile is within RESOLUTION of the true value and memory is bounded by the
+#   MIN_SEC..MAX_SEC range (a few hundred buckets at most) however many samples are recorded
+#  write-receive is reception_timestamp - source_timestamp, i.e. across the writer's clock
+#  receive-render is the subscriber's clock at the draw return - reception_timestamp
+
+LOG = logging.getLogger(__name__)
+
+RESOLUTION = 0.05
+MIN_SEC = 1e-6
+MAX_SEC = 1e3
+WRITE_RECEIVE, RECEIVE_RENDER = 'write-receive', 'receive-render'
+PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    """count, min, max, mean and approximate percentiles of latencies in seconds"""
+
+    def __init__(self, resolution=RESOLUTION):
+        self._log_growth = math.log1p(resolution)
+        self.buckets = Counter()  # bucket index: count
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.negative = 0  # writer clock ahead of ours; counted as MIN_SEC
+
+    def _index(self, seconds):
+        return int(math.log(seconds / MIN_SEC) / self._log_growth)
+
+    def _upper(self, index):
+        return MIN_SEC * math.exp((index + 1) * self._log_growth)
+
+    def record(self, seconds):
+        """add one latency"""
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        if seconds < 0:
+            self.negative += 1
+        self.buckets[self._index(min(max(seconds, MIN_SEC), MAX_SEC))] += 1
+
+    def percentile(self, pct):
+        """@return the latency pct percent of samples are at or below, None if empty"""
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * pct / 100)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def mean(self):
+        """@return the mean latency, None if empty"""
+        return self.total / self.count if self.count else None
+
+    def summary(self):
+        """@return one line of milliseconds"""
+        if not self.count:
+            return 'no samples'
+        pcts = ' '.join(f'p{pct}:{self.percentile(pct) * 1e3:.2f}' for pct in PERCENTILES)
+        text = (f'n:{self.count} min:{self.min * 1e3:.2f} {pcts} '
+                f'max:{self.max * 1e3:.2f} mean:{self.mean() * 1e3:.2f} ms')
+        return text + (f' negative:{self.negative}' if self.negative else '')
+
+
+class LatencyTracker:
+    """write-to-receive and receive-to-render histograms per topic and per instance"""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.topic_dic = defaultdict(LatencyHistogram)  # (which, stage): histogram
+        self.instance_dic = defaultdict(LatencyHistogram)  # (which, color, stage): histogram
+        self._unrendered = []  # (which, color, reception_sec) handled since the last draw
+
+    def record(self, which, color, stage, seconds):
+        """add a latency to the topic's and the instance's histogram"""
+        self.topic_dic[(which, stage)].record(seconds)
+        self.instance_dic[(which, color, stage)].record(seconds)
+
+    def received(self, which, color, source_sec, reception_sec):
+        """a sample about to be drawn; its render latency is recorded by rendered()"""
+        self.record(which, color, WRITE_RECEIVE, reception_sec - source_sec)
+        self._unrendered.append((which, color, reception_sec))
+
+    def rendered(self):
+        """the draw callback is returning the artists of every sample received"""
+        now = self.clock()
+        for which, color, reception_sec in self._unrendered:
+            self.record(which, color, RECEIVE_RENDER, now - reception_sec)
+        self._unrendered.clear()
+
+    def summary(self):
+        """@return a multi-line report, topics then instances"""
+        lines = ['latency per topic:']
+        lines += [f'  {which} {stage}: {hist.summary()}'
+                  for (which, stage), hist in sorted(self.topic_dic.items())]
+        lines.append('latency per instance:')
+        lines += [f'  {which}-{color} {stage}: {hist.summary()}'
+                  for (which, color, stage), hist in sorted(self.instance_dic.items())]
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f'<LatencyTracker: {len(self.topic_dic)} topics {len(self.instance_dic)} instances> '
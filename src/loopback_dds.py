@@ -0,0 +1,616 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""In-process loopback implementation of the rti.connextdds subset used by ShapesDemo"""
+
+# python imports
+from collections import defaultdict, deque
+import copy
+from enum import Enum, IntFlag
+from fnmatch import fnmatchcase
+import itertools
+import logging
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+## Only the names the app uses are here, with the same signatures as rti.connextdds
+#   writers deliver straight into the matching readers of the same domain, in the same process
+#   each reader keeps the last max_samples_per_instance samples of each instance, from the
+#     QoS file's resource_limits as with Connext, until take()
+#   a DataWriter.close() is the loss of its liveliness: readers get an invalid sample per
+#     instance it wrote (NOT_ALIVE_NO_WRITERS) and on_liveliness_changed
+#   content filters support AND/OR of comparisons, MATCH and NOT on top-level fields
+
+LOG = logging.getLogger(__name__)
+
+LENGTH_UNLIMITED = -1
+_GUIDS = itertools.count(1)
+_DOMAIN_DIC = defaultdict(lambda: defaultdict(lambda: {'readers': [], 'writers': []}))
+_DOMAIN_LOCK = threading.RLock()  # guards _DOMAIN_DIC: domain: topic name: entities
+
+
+class StatusMask(IntFlag):
+    """the subset of statuses a listener can ask for"""
+    NONE = 0
+    REQUESTED_DEADLINE_MISSED = 1 << 0
+    REQUESTED_INCOMPATIBLE_QOS = 1 << 1
+    SAMPLE_LOST = 1 << 2
+    SAMPLE_REJECTED = 1 << 3
+    DATA_AVAILABLE = 1 << 4
+    LIVELINESS_LOST = 1 << 5
+    LIVELINESS_CHANGED = 1 << 6
+    PUBLICATION_MATCHED = 1 << 7
+    SUBSCRIPTION_MATCHED = 1 << 8
+    ALL = (1 << 9) - 1
+
+
+class InstanceState(Enum):
+    """lifecycle of an instance as seen by a reader"""
+    ALIVE = 'ALIVE'
+    NOT_ALIVE_DISPOSED = 'NOT_ALIVE_DISPOSED'
+    NOT_ALIVE_NO_WRITERS = 'NOT_ALIVE_NO_WRITERS'
+
+
+class DataState:
+    """the state of a sample; DataState.any matches every sample"""
+    any = None  # set below
+
+    def __init__(self, instance_state=None):
+        self.instance_state = instance_state
+
+    def __repr__(self):
+        return f'DataState({self.instance_state})'
+
+DataState.any = DataState()
+
+
+class Duration:
+    """a span of time"""
+
+    def __init__(self, sec=0, nanosec=0):
+        self.sec, self.nanosec = sec, nanosec
+
+    def to_seconds(self):
+        """@return the span as float seconds"""
+        return self.sec + self.nanosec / 1e9
+
+
+class Time(Duration):
+    """a point in time, seconds since the epoch"""
+
+    @classmethod
+    def now(cls):
+        """@return the current time"""
+        now_ns = time.time_ns()
+        return cls(now_ns // 1_000_000_000, now_ns % 1_000_000_000)
+
+
+class Guid:
+    """identifies a DataWriter; is both source_guid and publication_handle"""
+
+    def __init__(self):
+        self.value = next(_GUIDS)
+
+    def __eq__(self, other):
+        return isinstance(other, Guid) and self.value == other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __str__(self):
+        return f'loopback-writer-{self.value}'
+
+    __repr__ = __str__
+
+
+class InstanceHandle:
+    """identifies an instance of a writer by its key, the color"""
+
+    def __init__(self, key):
+        self.key = key
+
+    def __eq__(self, other):
+        return isinstance(other, InstanceHandle) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f'InstanceHandle({self.key})'
+
+
+class SequenceNumber:
+    """a reception sequence number"""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class SampleInfo:
+    """meta-data delivered with each sample"""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, valid, instance_state, writer_guid, source_timestamp, seq, key):
+        self.valid = valid
+        self.state = DataState(instance_state)
+        self.publication_handle = self.source_guid = writer_guid
+        self.instance_handle = key
+        self.source_timestamp = source_timestamp
+        self.reception_timestamp = Time.now()
+        self.reception_sequence_number = SequenceNumber(seq)
+
+    def __repr__(self):
+        return (f'<SampleInfo: valid:{self.valid} {self.state} from:{self.source_guid} '
+                f'seq:{self.reception_sequence_number.value}> ')
+
+
+# pylint: disable=too-few-public-methods
+class _Qos:
+    """a bag of QoS values; attributes are created on first set"""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+    def to_string(self):
+        """@return the values, as Connext's to_string"""
+        return repr(self)
+
+    def __repr__(self):
+        values = ' '.join(f'{key}:{value}' for key, value in vars(self).items())
+        return f'<{self.__class__.__name__}: {values}>'
+
+
+class EntityName(_Qos):
+    """participant name and role"""
+
+    def __init__(self, name=None):
+        super().__init__(name=name, role_name=None)
+
+
+class ParticipantQos(_Qos):
+    """participant QoS"""
+
+
+class DataReaderQos(_Qos):
+    """reader QoS; only resource_limits.max_samples_per_instance is acted on"""
+
+
+class DataWriterQos(_Qos):
+    """writer QoS"""
+
+
+class QosProvider:
+    """reads the resource_limits of a profile from a Connext QoS XML file"""
+    default = None  # set below
+
+    def __init__(self, uri=None, profile=None):
+        self.uri, self.profile = uri, profile
+        max_samples_per_instance = LENGTH_UNLIMITED
+        if uri and profile:
+            max_samples_per_instance = self._read_max_samples_per_instance(uri, profile)
+        self.datareader_qos = DataReaderQos(
+            resource_limits=_Qos(max_samples_per_instance=max_samples_per_instance))
+        self.datawriter_qos = DataWriterQos()
+        self.participant_qos = ParticipantQos(participant_name=EntityName())
+
+    @staticmethod
+    def _read_max_samples_per_instance(uri, profile):
+        lib_name, profile_name = profile.split('::')
+        path = (f"qos_library[@name='{lib_name}']/qos_profile[@name='{profile_name}']"
+                '/datareader_qos/resource_limits/max_samples_per_instance')
+        try:
+            element = ET.parse(uri).getroot().find(path)
+        except (OSError, ET.ParseError) as exc:
+            LOG.warning('no QoS from %s: %s', uri, exc)
+            return LENGTH_UNLIMITED
+        return int(element.text) if element is not None else LENGTH_UNLIMITED
+
+    def participant_qos_from_profile(self, _profile):
+        """@return a fresh participant QoS"""
+        return ParticipantQos(participant_name=EntityName())
+
+QosProvider.default = QosProvider()
+
+
+class DomainParticipant:
+    """joins a domain; entities of the same domain in this process see each other"""
+
+    def __init__(self, domain_id, qos=None):
+        self.domain_id = domain_id
+        self.qos = qos or ParticipantQos(participant_name=EntityName())
+
+    def topics(self):
+        """@return this domain's topic name: entity dic"""
+        return _DOMAIN_DIC[self.domain_id]
+
+
+class Topic:
+    """a named topic of a type"""
+
+    def __init__(self, participant, name, data_type):
+        self.participant, self.name, self.type = participant, name, data_type
+        self.filter = None
+
+
+class Filter:
+    """a content filter expression and its %n parameters"""
+    _TERM = re.compile(r'^\s*(NOT\s+)?(\w+)\s*(<=|>=|<>|!=|=|<|>|MATCH)\s*(\S+)\s*$',
+                       re.IGNORECASE)
+
+    def __init__(self, expression, parameters=None):
+        self.expression, self.parameters = expression, list(parameters or [])
+        self._or_terms = [  # OR of ANDs of (negate, field, op, value)
+            [self._parse_term(term) for term in re.split(r'\s+AND\s+', ands, flags=re.IGNORECASE)]
+            for ands in re.split(r'\s+OR\s+', expression, flags=re.IGNORECASE)]
+
+    def _parse_term(self, term):
+        match = self._TERM.match(term)
+        if not match:
+            raise ValueError(f'unsupported filter term: {term!r} in {self.expression!r}')
+        negate, field, operator, value = match.groups()
+        if value.startswith('%'):
+            value = self.parameters[int(value[1:])]
+        value = value.strip("'\"")
+        return bool(negate), field, operator.upper(), value
+
+    @staticmethod
+    def _compare(actual, operator, value):
+        if operator == 'MATCH':
+            return any(fnmatchcase(str(actual), pattern) for pattern in value.split(','))
+        if not isinstance(actual, str):
+            value = type(actual)(float(value))
+        return {
+            '<': actual < value, '>': actual > value, '<=': actual <= value,
+            '>=': actual >= value, '=': actual == value, '<>': actual != value,
+            '!=': actual != value
+        }[operator]
+
+    def passes(self, sample):
+        """@return True if the sample passes the filter"""
+        return any(
+            all(self._compare(getattr(sample, field), operator, value) != negate
+                for negate, field, operator, value in and_terms)
+            for and_terms in self._or_terms)
+
+
+class ContentFilteredTopic(Topic):
+    """a topic whose readers only receive samples passing the filter"""
+
+    def __init__(self, topic, name, content_filter):
+        super().__init__(topic.participant, topic.name, topic.type)
+        self.filter_name, self.filter = name, content_filter
+
+
+class Publisher:
+    """groups DataWriters"""
+
+    def __init__(self, participant, qos=None):
+        self.participant, self.qos = participant, qos or _Qos()
+
+
+class Subscriber:
+    """groups DataReaders"""
+
+    def __init__(self, participant, qos=None):
+        self.participant, self.qos = participant, qos or _Qos()
+
+
+class LivelinessChangedStatus:
+    """counts of live writers, as passed to on_liveliness_changed"""
+
+    def __init__(self, alive_count=0, alive_count_change=0, not_alive_count=0,
+                 last_publication_handle=None):
+        self.alive_count, self.alive_count_change = alive_count, alive_count_change
+        self.not_alive_count = not_alive_count
+        self.last_publication_handle = last_publication_handle
+
+
+class SubscriptionMatchedStatus:
+    """counts of matched writers, as passed to on_subscription_matched"""
+
+    def __init__(self, current_count=0, current_count_change=0):
+        self.current_count, self.current_count_change = current_count, current_count_change
+
+
+class PublicationMatchedStatus(SubscriptionMatchedStatus):
+    """counts of matched readers, as read from a writer"""
+
+
+class RequestedDeadlineMissedStatus:
+    """never raised by the loopback"""
+
+
+class RequestedIncompatibleQosStatus:
+    """never raised by the loopback"""
+
+
+class SampleLostStatus:
+    """never raised by the loopback"""
+
+
+class SampleRejectedStatus:
+    """never raised by the loopback"""
+
+
+class NoOpDataReaderListener:
+    """base for reader listeners, every callback does nothing"""
+
+    # pylint: disable=missing-function-docstring, unused-argument
+    def on_requested_deadline_missed(self, reader, status):
+        pass
+
+    def on_sample_rejected(self, reader, status):
+        pass
+
+    def on_sample_lost(self, reader, status):
+        pass
+
+    def on_requested_incompatible_qos(self, reader, status):
+        pass
+
+    def on_subscription_matched(self, reader, status):
+        pass
+
+    def on_liveliness_changed(self, reader, status):
+        pass
+
+    def on_data_available(self, reader):
+        pass
+
+
+class DataWriter:
+    """writes samples to every matching reader in the domain"""
+
+    def __init__(self, publisher, topic, qos=None):
+        self.publisher, self.topic = publisher, topic
+        self.qos = qos or DataWriterQos()
+        self.guid = self.instance_handle = Guid()
+        self.written_keys = set()  # instance keys written, for the liveliness loss on close
+        self.closed = False
+        with _DOMAIN_LOCK:
+            entities = publisher.participant.topics()[topic.name]
+            entities['writers'].append(self)
+            readers = list(entities['readers'])
+        for reader in readers:
+            reader.match_writer(self, 1)
+
+    @property
+    def topic_name(self):
+        """the name of the topic written"""
+        return self.topic.name
+
+    def _readers(self):
+        with _DOMAIN_LOCK:
+            return list(self.publisher.participant.topics()[self.topic.name]['readers'])
+
+    @property
+    def publication_matched_status(self):
+        """the readers currently matched"""
+        return PublicationMatchedStatus(len(self._readers()))
+
+    def register_instance(self, sample):
+        """@return the handle of the sample's instance, to pass to write"""
+        self.written_keys.add(sample.color)
+        return InstanceHandle(sample.color)
+
+    def write(self, sample, handle=None):
+        """deliver a copy of the sample, as if serialized, to each matching reader"""
+        if self.closed:
+            raise RuntimeError(f'{self.guid} is closed')
+        if handle is not None and handle.key != sample.color:
+            raise ValueError(f'{handle} is not the instance of {sample.color}')
+        source_timestamp = Time.now()
+        self.written_keys.add(sample.color)
+        for reader in self._readers():
+            reader.deliver(copy.copy(sample), self.guid, source_timestamp)
+
+    def _end_instance(self, handle, instance_state):
+        self.written_keys.discard(handle.key)
+        for reader in self._readers():
+            reader.end_instance(handle.key, self.guid, instance_state)
+
+    def unregister_instance(self, handle):
+        """this writer stops writing an instance; readers see no writers"""
+        self._end_instance(handle, InstanceState.NOT_ALIVE_NO_WRITERS)
+
+    def dispose_instance(self, handle):
+        """the instance is deleted; readers see it disposed"""
+        self._end_instance(handle, InstanceState.NOT_ALIVE_DISPOSED)
+
+    def close(self):
+        """leave the domain; readers see this writer's liveliness lost"""
+        if self.closed:
+            return
+        self.closed = True
+        with _DOMAIN_LOCK:
+            self.publisher.participant.topics()[self.topic.name]['writers'].remove(self)
+        for reader in self._readers():
+            reader.lose_writer(self)
+
+
+class DataReader:
+    """keeps the latest samples of each instance from matching writers until take()"""
+
+    # pylint: disable=too-many-arguments, too-many-instance-attributes
+    def __init__(self, subscriber, topic, qos=None, listener=None, mask=StatusMask.NONE):
+        self.subscriber, self.topic = subscriber, topic
+        self.qos = qos or DataReaderQos(
+            resource_limits=_Qos(max_samples_per_instance=LENGTH_UNLIMITED))
+        self.listener, self.mask = listener, mask
+        depth = self.qos.resource_limits.max_samples_per_instance
+        self._maxlen = depth if depth > 0 else None
+        self._lock = threading.Lock()
+        self._instance_dic = {}  # key: deque of (seq, data, info)
+        self._seq = itertools.count(1)
+        self._conditions = []  # ReadConditions to wake on delivery
+        self.matched_publications = []
+        self.status_changes = StatusMask.NONE
+        self.liveliness_changed_status = LivelinessChangedStatus()
+        with _DOMAIN_LOCK:
+            entities = subscriber.participant.topics()[topic.name]
+            entities['readers'].append(self)
+            writers = list(entities['writers'])
+        for writer in writers:
+            self.match_writer(writer, 1)
+
+    @property
+    def topic_name(self):
+        """the name of the topic read"""
+        return self.topic.name
+
+    @property
+    def subscription_matched_status(self):
+        """the writers currently matched"""
+        return SubscriptionMatchedStatus(len(self.matched_publications))
+
+    def _notify(self, status, callback_name, *args):
+        """record a status change and call the listener, if it asked for it"""
+        self.status_changes |= status
+        if self.listener and self.mask & status:
+            getattr(self.listener, callback_name)(self, *args)
+
+    def match_writer(self, writer, change):
+        """a writer on the topic appeared (+1) or went away (-1)"""
+        if change > 0:
+            self.matched_publications.append(writer.guid)
+        else:
+            self.matched_publications.remove(writer.guid)
+        count = len(self.matched_publications)
+        self._notify(StatusMask.SUBSCRIPTION_MATCHED, 'on_subscription_matched',
+                     SubscriptionMatchedStatus(count, change))
+        self.liveliness_changed_status = LivelinessChangedStatus(
+            count, change, 0 if change > 0 else 1, writer.guid)
+        self._notify(StatusMask.LIVELINESS_CHANGED, 'on_liveliness_changed',
+                     self.liveliness_changed_status)
+
+    def _append(self, key, data, info):
+        with self._lock:
+            entries = self._instance_dic.get(key)
+            if entries is None:
+                entries = self._instance_dic[key] = deque(maxlen=self._maxlen)
+            entries.append((info.reception_sequence_number.value, data, info))
+        for condition in list(self._conditions):
+            condition.wake()
+
+    def deliver(self, sample, guid, source_timestamp):
+        """a writer wrote a sample; keep it if it passes the topic's filter"""
+        if self.topic.filter and not self.topic.filter.passes(sample):
+            return
+        info = SampleInfo(True, InstanceState.ALIVE, guid, source_timestamp,
+                          next(self._seq), sample.color)
+        self._append(sample.color, sample, info)
+
+    def end_instance(self, key, guid, instance_state):
+        """an instance is no longer alive: an invalid sample with its new state"""
+        info = SampleInfo(False, instance_state, guid, Time.now(), next(self._seq), key)
+        self._append(key, None, info)
+
+    def lose_writer(self, writer):
+        """a writer's liveliness is lost: an invalid sample for each instance it wrote"""
+        self.status_changes |= StatusMask.LIVELINESS_LOST
+        for key in writer.written_keys:
+            self.end_instance(key, writer.guid, InstanceState.NOT_ALIVE_NO_WRITERS)
+        self.match_writer(writer, -1)
+
+    def take(self):
+        """@return and forget every (data, info) kept, oldest first"""
+        with self._lock:
+            entries = [entry for entries in self._instance_dic.values() for entry in entries]
+            self._instance_dic = {}
+            self.status_changes = StatusMask.NONE
+        entries.sort(key=lambda entry: entry[0])
+        return [(data, info) for _, data, info in entries]
+
+    def has_samples(self):
+        """@return True if a take() would return anything"""
+        with self._lock:
+            return bool(self._instance_dic)
+
+    def close(self):
+        """leave the domain"""
+        with _DOMAIN_LOCK:
+            self.subscriber.participant.topics()[self.topic.name]['readers'].remove(self)
+
+
+class _Condition:
+    """a condition that can wake the WaitSets it is attached to"""
+
+    def __init__(self):
+        self.waitsets = []
+
+    def wake(self):
+        """tell every attached WaitSet to look at its conditions"""
+        for waitset in self.waitsets:
+            waitset.event.set()
+
+
+class GuardCondition(_Condition):
+    """a condition triggered by the application"""
+
+    def __init__(self):
+        super().__init__()
+        self._trigger_value = False
+
+    @property
+    def trigger_value(self):
+        """True once set"""
+        return self._trigger_value
+
+    @trigger_value.setter
+    def trigger_value(self, value):
+        self._trigger_value = value
+        if value:
+            self.wake()
+
+
+class ReadCondition(_Condition):
+    """triggered while the reader has samples to take"""
+
+    def __init__(self, reader, _state=None):
+        super().__init__()
+        self.reader = reader
+        reader._conditions.append(self)  # pylint: disable=protected-access
+
+    @property
+    def trigger_value(self):
+        """True while the reader has samples"""
+        return self.reader.has_samples()
+
+
+class WaitSet:
+    """blocks until one of its conditions triggers"""
+
+    def __init__(self):
+        self.conditions = []
+        self.event = threading.Event()
+
+    def attach_condition(self, condition):
+        """add a condition to wait on"""
+        self.conditions.append(condition)
+        condition.waitsets.append(self)
+
+    def wait(self, timeout=None):
+        """@return the triggered conditions, empty if the timeout passed first"""
+        deadline = time.monotonic() + (timeout.to_seconds() if timeout else 1e9)
+        while True:
+            self.event.clear()
+            triggered = [condition for condition in self.conditions if condition.trigger_value]
+            remaining = deadline - time.monotonic()
+            if triggered or remaining <= 0:
+                return triggered
+            self.event.wait(remaining)
+
+
+def reset():
+    """forget every entity in every domain, as if the process restarted"""
+    with _DOMAIN_LOCK:
+        _DOMAIN_DIC.clear()
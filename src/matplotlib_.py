@@ -11,18 +11,25 @@
 """Wrapper class for the graphing matplotlib"""
 
 # python imports
+from functools import lru_cache
 import logging
 import os
 
 from matplotlib import rcParams
 
+from blit_manager import BlitManager
+from collection_renderer import LOD_BUDGET_FRACTION, CollectionRenderer, LevelOfDetail
+from event_redraw import EventRedraw
+from static_layer import StaticLayer, cached_image
+from zorder_manager import ZORDER_BASE
+
 LOG = logging.getLogger(__name__)
 
 try:
 # animation imports
     import matplotlib
 # TODO - use Qt5 if not on PC
-    if os.name != 'nt':
+    if os.name != 'nt' and not os.environ.get('MPLBACKEND'):  # MPLBACKEND=Agg for offscreen
         matplotlib.use('Qt5Agg')  # must precede pyplot
     import matplotlib.pyplot as plt
     from matplotlib.animation import FuncAnimation
@@ -32,21 +39,52 @@ except ImportError as exc:
     LOG.fatal("No matplotlib %s", exc)
 
 # space between panels
-ZORDER_BASE, HGAP, VGAP = 10, 35, 85
+HGAP, VGAP = 35, 85
+LOGO_ZOOM = 0.3
+
+
+@lru_cache(maxsize=None)
+def read_image(image_filename):
+    """@return the image of a file at LOGO_ZOOM, read once however many panels show it"""
+    return cached_image(image_filename, LOGO_ZOOM)
 
 
 class Matplotlib:
     """Wrapper to create a graphing environment using the matplotlib library"""
     WIDE_EDGE_LINE_WIDTH, THIN_EDGE_LINE_WIDTH = 2, 1
 
-    def __init__(self, args, image_filename=None):
-        """init the figure attributes - some is Mac-specific, some must be done b4 creating fig"""
+    def __init__(self, args, image_filename=None, axes=None):
+        """init the figure attributes - some is Mac-specific, some must be done b4 creating fig
+        with axes, draw in that panel of a figure shared with other panels instead"""
+        self.plt = plt
+        if axes is None:
+            self.init_figure(args)
+        else:
+            self.init_panel(args, axes)
+
+        # with --collections, create_* return items batched into one collection per kind
+        #  with --lod, a kind of shape switches to points past a threshold set by the frame time
+        self.renderer = None
+        if args.collections or args.lod:
+            lod = None
+            if args.lod:
+                lod = LevelOfDetail(args.lod, args.publish_rate * LOD_BUDGET_FRACTION / 1000)
+            self.renderer = CollectionRenderer(self.axes, lod=lod)
+        # the logo, filter regions and text are drawn from one cached bitmap per zorder
+        self.static_layer_dic = {}  # zorder: StaticLayer
+
+        self.init_text(args.text)
+        if axes is None:
+            self.init_set_position(args.position)
+        self.init_show_image(image_filename)
+
+    def init_figure(self, args):
+        """create the figure with a single axes"""
         # taken from https://stackoverflow.com/questions/
         #     7449585/how-do-you-set-the-absolute-position-of-figure-windows-with-matplotlib
 
         # turn off toolbar - do this FIRST
         matplotlib.rcParams['toolbar'] = 'None'
-        self.plt = plt
         # create the Figure - SECOND
         #self.fig, self.axes = self.plt.subplots(figsize=args.figure_xy, num=args.box_title)
         self.fig, self.axes = self.plt.subplots(num=args.box_title)
@@ -72,9 +110,17 @@ class Matplotlib:
             # remove margin
             plt.subplots_adjust(left=0, bottom=0, right=1, top=1, wspace=0, hspace=0)
 
-        self.init_text(args.text)
-        self.init_set_position(args.position)
-        self.init_show_image(image_filename)
+    def init_panel(self, args, axes):
+        """use one axes of an existing figure; the figure's owner sizes and places it"""
+        self.fig, self.axes = axes.figure, axes
+        self.axes.set_xlim((0, args.graph_xy[0]))
+        self.axes.set_ylim((0, args.graph_xy[1]))
+        if args.subtitle:
+            self.axes.set_title(args.subtitle, fontsize='small')
+        self.axes.use_sticky_edges = False
+        if not args.ticks:
+            self.axes.get_xaxis().set_visible(False)
+            self.axes.get_yaxis().set_visible(False)
 
     def init_set_position(self, position):
         """set the position of the canvas on the screen"""
@@ -82,7 +128,9 @@ class Matplotlib:
         def generic_set_position(figure, x, y):
             """straddle different backends"""
             backend = matplotlib.get_backend()
-            if backend == 'TkAgg':
+            if getattr(figure.canvas.manager, 'window', None) is None:
+                LOG.info('%s has no window to position', backend)  # i.e. Agg
+            elif backend == 'TkAgg':
                 figure.canvas.manager.window.wm_geometry(f"+{x}+{y}")
             elif backend == 'WXAgg':
                 figure.canvas.manager.window.SetPosition((x, y))
@@ -119,12 +167,21 @@ class Matplotlib:
     def init_show_image(self, image_filename):
         """set a background image, if provided; imagebox is used to scale when resizing"""
         if image_filename:
-            image = plt.imread(image_filename)
-            imagebox = OffsetImage(image, zoom=0.3, alpha=0.15)
+            image = read_image(image_filename)  # already zoomed
+            imagebox = OffsetImage(image, zoom=1, alpha=0.15)
             imagebox.image.axes = self.axes
             abox = AnnotationBbox(imagebox, (0.5, 0.5),
                                   xycoords='axes fraction', bboxprops={'lw':0})
             self.axes.add_artist(abox)
+            self.add_static(abox)
+
+    def add_static(self, artist):
+        """draw an artist on the axes that never changes from its zorder's cached layer"""
+        layer = self.static_layer_dic.get(artist.zorder)
+        if layer is None:
+            layer = self.static_layer_dic[artist.zorder] = StaticLayer(artist.zorder)
+            self.axes.add_artist(layer)
+        layer.add(artist)
 
     @staticmethod
     def get_param_from_iterable(iter, ix, default_):
@@ -145,7 +202,7 @@ class Matplotlib:
                     'weight': self.get_param_from_iterable(vals, 6, rcParams['font.weight']),
                     'zorder': 100
                 }
-                self.plt.text(x, y, vals[2], fontdict=fontdict)
+                self.add_static(self.axes.text(x, y, vals[2], fontdict=fontdict))
             except Exception as exc:
                 msg = 'text argument must be a quoted string, i.e.: "50 70 hello green 8 italic"'
                 help = 'text values: x y text [color:black] [size:10] [style:normal] [weight:normal]'
@@ -164,15 +221,52 @@ class Matplotlib:
 
     def create_circle(self, center_xy, radius):
         """return a circle """
+        if self.renderer:
+            return self.renderer.create_circle(center_xy, radius)
         return Circle(center_xy, radius)
 
     def create_square(self, points):
         """return a square, avoid Rectangle whose coords are diff from Triangle"""
-        return Polygon(points, 4)
+        if self.renderer:
+            return self.renderer.create_polygon(points)
+        return Polygon(points, closed=True)
 
     def create_triangle(self, points):
         """return a triangle from the Polygon"""
-        return Polygon(points, 3)
+        if self.renderer:
+            return self.renderer.create_polygon(points)
+        return Polygon(points, closed=True)
+
+    def add_patch(self, poly):
+        """add a shape from create_* to the axes; collection items are already drawn"""
+        if not getattr(poly, 'is_collection_item', False):
+            self.axes.add_patch(poly)
+
+    @staticmethod
+    def remove_patch(poly):
+        """take a shape or line from add_patch, or a collection item, off the axes"""
+        poly.remove()
+
+    def animated_artists(self, polys):
+        """@return the artists to hand back to the animation for these shapes"""
+        if not self.renderer:
+            return polys
+        artists = [poly for poly in polys if not getattr(poly, 'is_collection_item', False)]
+        return artists + self.renderer.artists()
+
+    def dirty_artists(self, polys):
+        """@return the artists to hand back for --dirty_blit: these changed shapes,
+        and with --collections, the collections that changed"""
+        artists = [poly for poly in polys if not getattr(poly, 'is_collection_item', False)]
+        if self.renderer:
+            artists += self.renderer.artists(changed_only=True)
+        return artists
+
+    @staticmethod
+    def set_history(poly, history):
+        """mark a shape as an older sample's slot, or the latest, for --lod"""
+        if getattr(poly, 'is_collection_item', False):
+            poly.set_history(history)
 
     @staticmethod
     def create_rectangle(anchor, extents, colors, zorder=ZORDER_BASE):
@@ -197,3 +291,15 @@ class Matplotlib:
     def func_animation(fig, callback, interval, blit):
         """passthru wrapper"""
         return FuncAnimation(fig=fig, func=callback, interval=interval, blit=blit)
+
+    @staticmethod
+    def dirty_blit_animation(fig, callback, interval):
+        """as func_animation with blit, but callback returns only the artists that changed"""
+        return BlitManager(fig).start(callback, interval)
+
+    @staticmethod
+    def event_animation(fig, callback, min_interval, wake_thread):
+        """as dirty_blit_animation, but callback is called when wake_thread wakes,
+        at most every min_interval milliseconds"""
+        manager = BlitManager(fig).start(callback)
+        return EventRedraw(fig.canvas, manager.on_timer, min_interval).start(wake_thread)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Prints the sample counts periodically, for the orchestrator to collect"""
+
+# python imports
+import json
+import logging
+import sys
+import time
+
+## With --metrics_interval, each line is METRICS_PREFIX then a JSON object, on stdout
+#   {"time": seconds since start, "samples": total count, "counts": {key: count}}
+#  the orchestrator takes the rates from successive lines, and their arrival as health
+#  a window polls from its draw callback, and from a canvas timer too, since with
+#   --event_redraw an idle subscriber draws no frames yet must not look stalled
+
+LOG = logging.getLogger(__name__)
+
+METRICS_PREFIX = 'METRICS '
+
+
+class MetricsReporter:
+    """prints a metrics line when one is due, polled from the draw or publish loop"""
+
+    def __init__(self, connext_obj, interval, clock=time.monotonic, stream=None):
+        self.connext_obj = connext_obj  # read for its sample_counter at each report
+        self.interval, self.clock = interval, clock
+        self.stream = stream or sys.stdout
+        self.start = clock()
+        self.next_due = self.start  # report at once, so the orchestrator sees us start
+        self.timer = None
+
+    def poll(self):
+        """print a line if one is due"""
+        now = self.clock()
+        if now >= self.next_due:
+            self.next_due = now + self.interval
+            counter = self.connext_obj.sample_counter
+            line = {'time': round(now - self.start, 3),
+                    'samples': sum(counter.values()),
+                    'counts': dict(counter)}
+            print(METRICS_PREFIX + json.dumps(line), file=self.stream, flush=True)
+
+    def start_timer(self, canvas):
+        """poll on a timer of the canvas too, so lines are due with no frames; @return self"""
+        self.timer = canvas.new_timer(interval=max(1, round(self.interval * 1000)))
+        self.timer.add_callback(self.poll)
+        self.timer.start()
+        return self
+
+    def wrap(self, draw):
+        """@return the draw callback, polling after each frame"""
+        def metrics_draw(frame):
+            artists = draw(frame)
+            self.poll()
+            return artists
+        return metrics_draw
+
+
+def parse_metrics_line(line):
+    """@return the metrics of a line printed by MetricsReporter, None for other output"""
+    if not line.startswith(METRICS_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(METRICS_PREFIX):])
+    except ValueError:
+        LOG.warning('bad metrics line: %s', line.rstrip())
+        return None
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Runs many publisher and subscriber panels in one figure of one process"""
+
+# python imports
+from collections import Counter
+import logging
+from math import ceil
+import os
+import shlex
+
+from event_redraw import combined_wake_thread
+from matplotlib_ import Matplotlib, plt
+
+## A panel file has one shapes_demo command line per panel, as the lines of a scenario's run.sh
+#   each panel's arguments follow those of the command line, so the later ones win
+#   --index places a panel in the 15 slots, 3 rows of PANEL_COLUMNS; otherwise the next free one
+#   a relative --config is relative to the panel file
+#  the panels share one participant per domain and one animation clock, each has its own
+#   readers or writers, content filters, shapes and counters
+
+LOG = logging.getLogger(__name__)
+
+PANEL_COLUMNS = 5
+PANELS_OPTION = '--panels'
+
+
+def read_panel_file(path):
+    """@return the argument list of each panel line, skipping blanks and # comments"""
+    with open(path, encoding='utf-8') as panel_file:
+        return [shlex.split(line) for line in panel_file
+                if line.strip() and not line.lstrip().startswith('#')]
+
+
+def common_argv(argv):
+    """@return the command line arguments to apply to every panel, i.e. all but --panels"""
+    common, skip = [], False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg == PANELS_OPTION:
+            skip = True
+        elif not arg.startswith(PANELS_OPTION + '='):
+            common.append(arg)
+    return common
+
+
+def parse_panels(path, argv, arg_parser):
+    """@return the parsed arguments of each panel in the file"""
+    panel_dir = os.path.dirname(os.path.abspath(path))
+    args_list = []
+    for panel_argv in read_panel_file(path):
+        args = arg_parser.parse_args(common_argv(argv) + panel_argv)
+        if args.config and not os.path.isabs(args.config):
+            args.config = os.path.join(panel_dir, args.config)
+        args_list.append(args)
+    if not args_list:
+        raise ValueError(f'{path} has no panels')
+    return args_list
+
+
+def assign_slots(args_list):
+    """@return the 1-based slot of each panel: its --index, else the next free slot"""
+    taken = {args.index for args in args_list if args.index}
+    free = (slot for slot in range(1, len(args_list) + len(taken) + 1) if slot not in taken)
+    return [args.index or next(free) for args in args_list]
+
+
+class PanelViewer:
+    """a figure of panels, drawn together as if one Connext"""
+
+    def __init__(self, args, args_list, image_filename=None):
+        self.args_list = args_list
+        self.slots = assign_slots(args_list)
+        columns = min(PANEL_COLUMNS, max(self.slots))
+        rows = ceil(max(self.slots) / columns)
+        plt.rcParams['toolbar'] = 'None'
+        self.plt = plt
+        self.fig = plt.figure(num=args.box_title,
+                              figsize=(columns * args.figure_xy[0], rows * args.figure_xy[1]))
+        self.matplotlib_list = [
+            Matplotlib(panel_args, image_filename,
+                       self.fig.add_subplot(rows, columns, slot))
+            for panel_args, slot in zip(args_list, self.slots)]
+        self.fig.tight_layout()
+        self.connext_list = []
+        self.wake_thread = None
+        LOG.info('%d panels in %d rows of %d', len(args_list), rows, columns)
+
+    def create_panels(self, create_connext):
+        """create each panel's publisher or subscriber with create_connext(matplotlib, args)"""
+        self.connext_list = [create_connext(matplotlib, args)
+                             for matplotlib, args in zip(self.matplotlib_list, self.args_list)]
+        wake_threads = [getattr(connext_obj, 'wake_thread', None)
+                        for connext_obj in self.connext_list]
+        if all(wake_threads):  # with --event_redraw, every panel a subscriber
+            self.wake_thread = combined_wake_thread(wake_threads)
+
+    @property
+    def factory(self):
+        """the ParticipantFactory shared by the panels"""
+        return self.connext_list[0].factory
+
+    @property
+    def sample_counter(self):
+        """the sample counts of every panel"""
+        return sum((connext_obj.sample_counter for connext_obj in self.connext_list), Counter())
+
+    def is_matched(self):
+        """@return True once any panel matched"""
+        return any(connext_obj.is_matched() for connext_obj in self.connext_list)
+
+    def draw(self, frame):
+        """draw every panel; @return all of their artists"""
+        artists = []
+        for connext_obj in self.connext_list:
+            artists.extend(connext_obj.draw(frame))
+        return artists
+
+    def stop_threads(self):
+        """stop the --event_redraw thread, if any, and each panel's threads"""
+        if self.wake_thread:
+            self.wake_thread.stop()
+        for connext_obj in self.connext_list:
+            connext_obj.stop_threads()
+
+    def exit_summary(self):
+        """@return each panel's summary, under its slot and subtitle"""
+        return '\n'.join(
+            f'panel {slot} {args.subtitle}: {connext_obj.exit_summary()}'
+            for slot, args, connext_obj in zip(self.slots, self.args_list, self.connext_list))
+
+    def __repr__(self):
+        return f'<PanelViewer: {len(self.connext_list)} panels {self.factory}> '
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Renders frames to an Agg buffer with no window, timing DDS apart from rendering"""
+
+# python imports
+import logging
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from latency_stats import LatencyHistogram
+
+## With --offscreen FRAMES, shapes_demo selects Agg before matplotlib is imported, so no
+#   window is created or positioned, and an OffscreenRenderer drives the frames:
+#   dds: the draw callback, i.e. take, handle the samples (or publish) and update the artists
+#   render: a full canvas draw into the Agg buffer and its copy to a NumPy array
+#  frames are paced at --publish_rate as the animation timer would; a slow frame is not
+#   made up for, so the frame count, not the duration, is fixed
+#  with --frame_dump, a FrameWriter thread writes the arrays, so encoding is in neither time:
+#   a path with a %d field is a PNG sequence, written as the frames arrive; the queue is
+#   bounded, so a slow disk slows the frames rather than growing memory
+#   a .gif path is one animated file, which PIL writes only once it holds every frame
+#   (merging identical consecutive ones, lengthening the first), so the GIF keeps at most
+#   MAX_GIF_FRAMES frames and the later ones are dropped
+
+LOG = logging.getLogger(__name__)
+
+QUEUE_FRAMES = 32
+MAX_GIF_FRAMES = 300  # PIL holds them all until the file is written
+
+
+class FrameWriter(threading.Thread):
+    """write the frames put to it, as PNG files or one animated GIF"""
+
+    def __init__(self, path, interval, max_frames=QUEUE_FRAMES, max_gif_frames=MAX_GIF_FRAMES):
+        super().__init__(name='FrameWriter', daemon=True)
+        if '%' not in path and not path.lower().endswith('.gif'):
+            raise ValueError(f'--frame_dump {path} needs a %d field, or a .gif suffix')
+        self.path, self.interval = path, interval
+        self.queue = queue.Queue(maxsize=max_frames)
+        self.frame_limit = None if '%' in path else max_gif_frames
+        self.put_count = self.dropped = 0
+        self.written = 0
+        self.write_hist = LatencyHistogram()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def put(self, frame):
+        """queue an RGBA array to write; blocks while the queue is full, drops frames
+        past a GIF's limit"""
+        if self.frame_limit is not None and self.put_count >= self.frame_limit:
+            if not self.dropped:
+                LOG.warning('%s keeps the first %d frames only', self.path, self.frame_limit)
+            self.dropped += 1
+            return
+        self.put_count += 1
+        self.queue.put(frame)
+
+    def frames(self):
+        """@return the queued frames, until close()"""
+        while True:
+            frame = self.queue.get()
+            if frame is None:
+                return
+            yield frame
+
+    def run(self):
+        # pylint: disable=import-outside-toplevel
+        from PIL import Image  # installed with matplotlib
+        if '%' in self.path:
+            for frame in self.frames():
+                start = time.perf_counter()
+                Image.fromarray(frame).save(self.path % self.written)
+                self.written += 1
+                self.write_hist.record(time.perf_counter() - start)
+        else:
+            images = (Image.fromarray(frame) for frame in self.frames())
+            first = next(images, None)
+            if first is not None:
+                self.written = 1
+                first.save(self.path, save_all=True, append_images=self._count(images),
+                           duration=self.interval, loop=0)
+        LOG.info('wrote %d frames to %s, dropped %d', self.written, self.path, self.dropped)
+
+    def _count(self, images):
+        """@return the images, counted as PIL appends them"""
+        for image in images:
+            self.written += 1
+            yield image
+
+    def close(self):
+        """write what is queued, then finish"""
+        self.queue.put(None)
+        self.join()
+
+
+class OffscreenRenderer:
+    """draw frames of a figure into its Agg buffer"""
+
+    def __init__(self, fig, draw, interval, writer=None, clock=time.perf_counter):
+        self.fig, self.canvas = fig, fig.canvas
+        self.draw, self.interval, self.writer = draw, interval, writer
+        self.clock = clock
+        self.frame_count = 0
+        self.hist_dic = {'dds': LatencyHistogram(), 'render': LatencyHistogram()}
+
+    def render_frame(self):
+        """run one draw callback, render it; @return the frame as an (h, w, 4) uint8 array"""
+        start = self.clock()
+        self.draw(self.frame_count)
+        drawn = self.clock()
+        self.canvas.draw()
+        frame = np.array(self.canvas.buffer_rgba())  # a copy, the buffer is reused
+        rendered = self.clock()
+        self.hist_dic['dds'].record(drawn - start)
+        self.hist_dic['render'].record(rendered - drawn)
+        self.frame_count += 1
+        if self.writer:
+            self.writer.put(frame)
+        return frame
+
+    def run(self, frames, sleep=time.sleep):
+        """render frames, each at least interval milliseconds after the last began"""
+        for _ in range(frames):
+            start = self.clock()
+            self.render_frame()
+            sleep(max(0, self.interval / 1000 - (self.clock() - start)))
+        if self.writer:
+            self.writer.close()
+
+    def summary(self):
+        """@return the per-frame times of each stage, one line each"""
+        lines = [f'offscreen frames: {self.frame_count}']
+        lines += [f'  {stage}: {hist.summary()}' for stage, hist in self.hist_dic.items()]
+        if self.writer and '%' in self.writer.path:
+            lines.append(f'  write: {self.writer.write_hist.summary()}')
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f'<OffscreenRenderer: {self.frame_count} frames> '
@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Launches the windows of a scenario manifest, watches their health and reports metrics
+
+python orchestrator.py ../scenarios/busy/busy.json --duration 60 --report busy_report.json
+"""
+
+# python imports
+import argparse
+import json
+import logging
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from metrics_reporter import parse_metrics_line
+
+## A manifest is JSON; relative paths in it are relative to the manifest file
+#   {"common": "--domain_id 27 --log_level 50", "max_starting": 4,
+#    "windows": [{"name": "Blue", "config": "pub_blue.cfg", "index": 1,
+#                 "flags": "--subtitle 'Blue Extended'"}, ...]}
+#  each window is a shapes_demo.py process with --metrics_interval, so it prints its counts
+#  at most max_starting windows start at once; a window has started at its first metrics
+#   line or START_TIMEOUT_SEC after launch, so discovery is spread out instead of a storm
+#  a window is healthy while its metrics keep arriving; CPU and RSS are sampled by pid
+#  only the processes started here are signalled at shutdown: SIGINT, which a window handles
+#   as ^C, then terminate and kill for any that do not exit; never pkill
+
+LOG = logging.getLogger(__name__)
+
+SHAPES_DEMO = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'shapes_demo.py')
+MAX_STARTING = 4
+INTERVAL_SEC = 1.0
+START_TIMEOUT_SEC = 30.0
+STALL_INTERVALS = 5  # a window with no metrics for this many intervals is stalled
+STOP_GRACE_SEC = 5.0
+PROC_DIR = '/proc'
+
+
+def window_argv(spec, common, interval):
+    """@return the shapes_demo command line of a manifest window"""
+    argv = [sys.executable, SHAPES_DEMO] + shlex.split(common)
+    if spec.get('config'):
+        argv += ['--config', spec['config']]
+    if spec.get('index'):
+        argv += ['--index', str(spec['index'])]
+    return argv + shlex.split(spec.get('flags', '')) + ['--metrics_interval', str(interval)]
+
+
+def parse_cpu_time(text):
+    """@return the seconds of a ps cputime: [dd-][hh:]mm:ss[.ss]"""
+    days, _, clock = text.rpartition('-')
+    seconds = 0.0
+    for part in clock.split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds + int(days or 0) * 86400
+
+
+def _proc_usage(pid):
+    """@return (cpu seconds, rss KB) from /proc, more precise than ps"""
+    with open(f'{PROC_DIR}/{pid}/stat', encoding='ascii') as stat_file:
+        fields = stat_file.read().rpartition(')')[2].split()
+    ticks = os.sysconf('SC_CLK_TCK')
+    rss_kb = int(fields[21]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    return (int(fields[11]) + int(fields[12])) / ticks, rss_kb
+
+
+def sample_usage(pids):
+    """@return {pid: (cpu seconds, rss KB)} of those pids still running"""
+    if not pids:
+        return {}
+    if os.path.isdir(PROC_DIR):
+        usage = {}
+        for pid in pids:
+            try:
+                usage[pid] = _proc_usage(pid)
+            except (OSError, IndexError, ValueError):
+                pass  # exited
+        return usage
+    result = subprocess.run(['ps', '-o', 'pid=,time=,rss=', '-p', ','.join(map(str, pids))],
+                            capture_output=True, text=True, check=False)
+    usage = {}
+    for line in result.stdout.splitlines():
+        pid, cpu_time, rss_kb = line.split()
+        usage[int(pid)] = parse_cpu_time(cpu_time), int(rss_kb)
+    return usage
+
+
+class Window:
+    """one shapes_demo process of a scenario, with its metrics and resource usage"""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, spec, argv, cwd, clock=time.monotonic):
+        self.name = spec.get('name') or f"window {spec.get('index', '')}".strip()
+        self.argv, self.cwd, self.clock = argv, cwd, clock
+        self.process = None
+        self.started_at = self.ready_at = self.last_metrics_at = None
+        self.metrics = []  # metrics dictionaries, as printed by the window
+        self.usage = []  # (time, cpu seconds, rss KB)
+        self.reader = None
+
+    def start(self):
+        """launch the process in its own session, so a ^C here does not reach it directly"""
+        LOG.info('starting %s: %s', self.name, shlex.join(self.argv))
+        self.process = subprocess.Popen(  # pylint: disable=consider-using-with
+            self.argv, cwd=self.cwd, stdout=subprocess.PIPE, text=True, bufsize=1,
+            start_new_session=os.name != 'nt')
+        self.started_at = self.clock()
+        self.reader = threading.Thread(target=self._read_stdout, daemon=True,
+                                       name=f'stdout {self.name}')
+        self.reader.start()
+
+    def _read_stdout(self):
+        for line in self.process.stdout:
+            metrics = parse_metrics_line(line)
+            if metrics is None:
+                print(f'[{self.name}] {line}', end='', flush=True)
+                continue
+            now = self.clock()
+            if self.ready_at is None:
+                self.ready_at = now
+                LOG.info('%s started in %.1f sec', self.name, now - self.started_at)
+            self.last_metrics_at = now
+            self.metrics.append(metrics)
+
+    @property
+    def pid(self):
+        """the process id, None until started"""
+        return self.process.pid if self.process else None
+
+    def is_alive(self):
+        """@return True from start until the process exits"""
+        return self.process is not None and self.process.poll() is None
+
+    def is_starting(self, now):
+        """@return True if launched, but not yet reporting nor timed out"""
+        return (self.is_alive() and self.ready_at is None
+                and now - self.started_at < START_TIMEOUT_SEC)
+
+    def state(self, now, stall_sec):
+        """@return pending, starting, running, stalled, exited or failed"""
+        if self.process is None:
+            return 'pending'
+        returncode = self.process.poll()
+        if returncode is not None:
+            return 'exited' if returncode == 0 else 'failed'
+        if self.last_metrics_at is None:
+            return 'starting'
+        return 'stalled' if now - self.last_metrics_at > stall_sec else 'running'
+
+    def add_usage(self, now, cpu_sec, rss_kb):
+        """record a sample of the process' CPU time and resident memory"""
+        self.usage.append((now, cpu_sec, rss_kb))
+
+    def signal_stop(self):
+        """ask the process to exit as if ^C"""
+        if self.is_alive():
+            if os.name == 'nt':
+                self.process.terminate()
+            else:
+                self.process.send_signal(signal.SIGINT)
+
+    def report(self, now, stall_sec):
+        """@return the window's throughput, CPU and RSS as a dictionary"""
+        rates = [(later['samples'] - earlier['samples']) / (later['time'] - earlier['time'])
+                 for earlier, later in zip(self.metrics, self.metrics[1:])
+                 if later['time'] > earlier['time']]
+        cpu_percents = [100 * (later[1] - earlier[1]) / (later[0] - earlier[0])
+                        for earlier, later in zip(self.usage, self.usage[1:])
+                        if later[0] > earlier[0]]
+        last = self.metrics[-1] if self.metrics else {'samples': 0, 'time': 0.0, 'counts': {}}
+        return {
+            'name': self.name,
+            'pid': self.pid,
+            'state': self.state(now, stall_sec),
+            'returncode': self.process.poll() if self.process else None,
+            'startup_sec': (round(self.ready_at - self.started_at, 3)
+                            if self.ready_at is not None else None),
+            'samples': last['samples'],
+            'mean_rate': round(last['samples'] / last['time'], 1) if last['time'] else 0.0,
+            'last_rate': round(rates[-1], 1) if rates else 0.0,
+            'peak_rate': round(max(rates), 1) if rates else 0.0,
+            'counts': last['counts'],
+            'cpu_percent': (round(sum(cpu_percents) / len(cpu_percents), 1)
+                            if cpu_percents else None),
+            'peak_cpu_percent': round(max(cpu_percents), 1) if cpu_percents else None,
+            'rss_mb': round(self.usage[-1][2] / 1024, 1) if self.usage else None,
+            'peak_rss_mb': round(max(usage[2] for usage in self.usage) / 1024, 1)
+                           if self.usage else None,
+            'argv': self.argv,
+        }
+
+
+class Orchestrator:
+    """starts a manifest's windows a few at a time, samples them, and stops them"""
+
+    def __init__(self, manifest_path, max_starting=None, interval=INTERVAL_SEC,
+                 clock=time.monotonic):
+        with open(manifest_path, encoding='utf-8') as manifest_file:
+            manifest = json.load(manifest_file)
+        cwd = os.path.dirname(os.path.abspath(manifest_path))
+        common = manifest.get('common', '')
+        self.interval, self.clock = interval, clock
+        self.max_starting = max_starting or manifest.get('max_starting', MAX_STARTING)
+        self.stall_sec = STALL_INTERVALS * interval
+        self.windows = [Window(spec, window_argv(spec, common, interval), cwd, clock)
+                        for spec in manifest['windows']]
+        if not self.windows:
+            raise ValueError(f'{manifest_path} has no windows')
+        self.state_dic = {}  # window name: last state logged
+
+    def start_due(self, now):
+        """start pending windows while fewer than max_starting are starting"""
+        starting = sum(window.is_starting(now) for window in self.windows)
+        for window in self.windows:
+            if starting >= self.max_starting:
+                break
+            if window.process is None:
+                window.start()
+                starting += 1
+
+    def sample(self, now):
+        """record each live window's CPU and RSS, and log its state changes"""
+        windows = [window for window in self.windows if window.is_alive()]
+        usage = sample_usage([window.pid for window in windows])
+        for window in windows:
+            if window.pid in usage:
+                window.add_usage(now, *usage[window.pid])
+        for window in self.windows:
+            state = window.state(now, self.stall_sec)
+            if self.state_dic.get(window.name) != state:
+                self.state_dic[window.name] = state
+                log_level = logging.WARNING if state in ('stalled', 'failed') else logging.INFO
+                LOG.log(log_level, '%s is %s', window.name, state)
+
+    def is_done(self):
+        """@return True once every window was started and has exited"""
+        return all(window.process is not None and not window.is_alive()
+                   for window in self.windows)
+
+    def run(self, duration=None):
+        """start the windows and sample them until duration, all exit, or ^C; then stop them"""
+        start = self.clock()
+        try:
+            while not self.is_done() and (duration is None or self.clock() - start < duration):
+                now = self.clock()
+                self.start_due(now)
+                self.sample(now)
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            LOG.info('interrupted')
+        finally:
+            self.stop()
+
+    def stop(self, grace_sec=STOP_GRACE_SEC):
+        """stop the windows started here: ^C, then terminate, then kill"""
+        for window in self.windows:
+            window.signal_stop()
+        for escalate in ('terminate', 'kill'):
+            deadline = self.clock() + grace_sec
+            for window in self.windows:
+                if window.process is None:
+                    continue
+                try:
+                    window.process.wait(max(0.0, deadline - self.clock()))
+                except subprocess.TimeoutExpired:
+                    LOG.warning('%s did not exit, %s pid %d', window.name, escalate, window.pid)
+                    getattr(window.process, escalate)()
+        for window in self.windows:
+            if window.process is not None:
+                window.process.wait()
+                window.reader.join(grace_sec)
+
+    def report(self):
+        """@return the report of every window, and their totals"""
+        now = self.clock()
+        windows = [window.report(now, self.stall_sec) for window in self.windows]
+        return {
+            'windows': windows,
+            'total_mean_rate': round(sum(window['mean_rate'] for window in windows), 1),
+            'total_peak_rss_mb': round(sum(window['peak_rss_mb'] or 0 for window in windows), 1),
+        }
+
+
+def format_report(report):
+    """@return the report as a table"""
+    lines = [f"{'window':24} {'state':8} {'samples':>8} {'mean/s':>8} {'peak/s':>8} "
+             f"{'cpu%':>6} {'rss MB':>7}"]
+    for window in report['windows']:
+        cpu = '-' if window['cpu_percent'] is None else f"{window['cpu_percent']:.1f}"
+        rss = '-' if window['peak_rss_mb'] is None else f"{window['peak_rss_mb']:.1f}"
+        lines.append(f"{window['name'][:24]:24} {window['state']:8} {window['samples']:8d} "
+                     f"{window['mean_rate']:8.1f} {window['peak_rate']:8.1f} {cpu:>6} {rss:>7}")
+    lines.append(f"total mean rate/s: {report['total_mean_rate']} "
+                 f"total peak RSS MB: {report['total_peak_rss_mb']}")
+    return '\n'.join(lines)
+
+
+def main(argv):
+    """run a scenario manifest and print, and possibly write, its report"""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('manifest', help='the scenario manifest, a JSON file')
+    parser.add_argument('--duration', '-d', type=float, default=None,
+                        help='stop the windows after this many seconds [until ^C or all exit]')
+    parser.add_argument('--max_starting', '-m', type=int, default=None,
+                        help=f'windows starting at once [manifest max_starting or {MAX_STARTING}]')
+    parser.add_argument('--interval', '-i', type=float, default=INTERVAL_SEC,
+                        help=f'seconds between metrics and samples [{INTERVAL_SEC}]')
+    parser.add_argument('--report', '-r', type=str, default=None,
+                        help='also write the report to this JSON file')
+    parser.add_argument('--log_level', '-ll', type=int, default=logging.INFO,
+                        help=f'log level [{logging.INFO}]')
+    args = parser.parse_args(argv)
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s', level=args.log_level)
+
+    orchestrator = Orchestrator(args.manifest, args.max_starting, args.interval)
+    orchestrator.run(args.duration)
+    report = orchestrator.report()
+    print(format_report(report))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+    return 0 if all(window['state'] != 'failed' for window in report['windows']) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
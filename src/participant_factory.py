@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Shares DomainParticipants, Topics and parsed QoS profiles within a process"""
+
+# python imports
+import logging
+
+# Connext imports
+from transport import dds
+from startup_timer import StartupTimer
+
+## Everything is cached per transport too, so a test or benchmark may switch transports
+#   one participant per domain: no second participant to discover, no duplicate Topics
+#    except per topic type, since a participant cannot have two types of one topic name
+#   one QosProvider per (file, profile): the XML is parsed once per process
+
+LOG = logging.getLogger(__name__)
+
+PARTICIPANT_PROFILE = "ShapeTypeExtended_Library::ShapeTypeExtended_Profile"
+
+
+class ParticipantFactory:
+    """creates each DDS entity once, timing the first creation as a startup phase"""
+
+    def __init__(self):
+        self.timer = StartupTimer()
+        self._participant_qos_dic = {}  # transport: participant QoS
+        self._provider_dic = {}  # (transport, qos_file, profile): QosProvider
+        self._participant_dic = {}  # (transport, domain_id, type_name): DomainParticipant
+        self._topic_dic = {}  # (transport, domain_id, name, type): Topic
+
+    def participant_qos(self):
+        """@return the participant QoS of PARTICIPANT_PROFILE, looked up on first use"""
+        qos = self._participant_qos_dic.get(dds.name)
+        if qos is None:
+            with self.timer.phase('participant_qos'):
+                qos = self._participant_qos_dic[dds.name] = (
+                    dds.QosProvider.default.participant_qos_from_profile(PARTICIPANT_PROFILE))
+        return qos
+
+    def qos_provider(self, qos_file, profile):
+        """@return the QosProvider of a profile in a file, parsing the file once"""
+        key = (dds.name, qos_file, profile)
+        provider = self._provider_dic.get(key)
+        if provider is None:
+            with self.timer.phase('qos_provider'):
+                provider = self._provider_dic[key] = dds.QosProvider(qos_file, profile)
+        return provider
+
+    def participant(self, domain_id, qos, type_name=None):
+        """@return the participant of a domain and topic type; the first caller's QoS is used"""
+        key = (dds.name, domain_id, type_name)
+        participant = self._participant_dic.get(key)
+        if participant is None:
+            with self.timer.phase('participant'):
+                participant = self._participant_dic[key] = dds.DomainParticipant(domain_id, qos)
+            LOG.info('created participant on domain %d', domain_id)
+        return participant
+
+    def topic(self, participant, name, data_type):
+        """@return the Topic of a name and type on a participant"""
+        key = (dds.name, participant.domain_id, name, data_type)
+        topic = self._topic_dic.get(key)
+        if topic is None:
+            with self.timer.phase('topics'):
+                topic = self._topic_dic[key] = dds.Topic(participant, name, data_type)
+        return topic
+
+    def __repr__(self):
+        return (f'<ParticipantFactory: {len(self._participant_dic)} participants '
+                f'{len(self._provider_dic)} providers {len(self._topic_dic)} topics> ')
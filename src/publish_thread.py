@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Publishes on its own clock so screen repaints cannot delay the writes"""
+
+# python imports
+import logging
+import threading
+
+from rate_scheduler import RateScheduler
+
+LOG = logging.getLogger(__name__)
+
+
+class PublishThread(threading.Thread):
+    """call publish at a fixed rate, independent of the matplotlib animation timer"""
+
+    def __init__(self, publish, rate_hz):
+        super().__init__(name='PublishThread', daemon=True)
+        self.publish = publish
+        self.scheduler = RateScheduler(rate_hz)
+        self.stop_event = threading.Event()
+
+    def run(self):
+        LOG.info('publishing at %.1f updates/sec', 1.0 / self.scheduler.period)
+        while not self.stop_event.is_set():
+            self.scheduler.wait_next()
+            self.publish()
+
+    def stop(self, timeout=1.0):
+        """ask the thread to finish and wait for it"""
+        self.stop_event.set()
+        self.join(timeout)
+        LOG.info(self.scheduler)
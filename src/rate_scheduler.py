@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Paces a loop at a fixed rate and measures the rate actually achieved"""
+
+# python imports
+import logging
+import time
+
+LOG = logging.getLogger(__name__)
+
+MAX_LAG_SEC = 0.1  # beyond this far behind, stop bursting to catch up and resync
+
+
+class RateScheduler:
+    """sleeps to absolute deadlines so an oversleep is made up on later ticks, not lost"""
+
+    def __init__(self, rate_hz, clock=time.perf_counter, sleep=time.sleep):
+        if rate_hz <= 0:
+            raise ValueError(f'rate must be positive not {rate_hz}')
+        self.period = 1.0 / rate_hz
+        self.clock, self.sleep = clock, sleep
+        self.start_time = self.next_deadline = None
+        self.ticks = 0
+        self.resyncs = 0  # times we fell more than MAX_LAG_SEC behind
+
+    def wait_next(self):
+        """block until the next tick is due"""
+        now = self.clock()
+        if self.next_deadline is None:
+            self.start_time = self.next_deadline = now
+        else:
+            self.next_deadline += self.period
+            delay = self.next_deadline - now
+            if delay > 0:
+                self.sleep(delay)
+            elif delay < -MAX_LAG_SEC:
+                LOG.debug('%.3fs behind schedule, resyncing', -delay)
+                self.resyncs += 1
+                self.next_deadline = now
+        self.ticks += 1
+
+    def elapsed(self):
+        """@return seconds since the first tick"""
+        return 0.0 if self.start_time is None else self.clock() - self.start_time
+
+    def achieved_rate(self):
+        """@return ticks per second since the first tick, which starts the clock so
+        is not counted: ticks n+1 at the target rate span n periods"""
+        elapsed = self.elapsed()
+        return (self.ticks - 1) / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (f'<RateScheduler: target:{1.0 / self.period:.1f}Hz '
+                f'achieved:{self.achieved_rate():.1f}Hz ticks:{self.ticks} '
+                f'resyncs:{self.resyncs}> ')
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Captures received samples to a memory-mappable file and replays them"""
+
+# python imports
+import logging
+import threading
+import time
+
+import numpy as np
+
+from shape_types import ShapeFillKind, ShapeType, ShapeTypeExtended
+from transport import dds
+
+## A sample log is a HEADER then fixed-size RECORD_DTYPE records, so it is read back with
+#   np.memmap, i.e. without parsing or loading the whole file
+#  capture appends from the latest-state table, so with or without --take_thread
+#  replay writes the records to DataWriters, one per captured topic and publication, so
+#   liveliness and ownership stay per publication; a subscriber in the same process on the
+#   loopback transport renders them
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b'SHAPELOG'
+VERSION = 1
+HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('record_size', '<u4')])
+RECORD_DTYPE = np.dtype([
+    ('time', '<f8'), ('topic', 'S1'), ('color', 'S31'), ('x', '<i4'), ('y', '<i4'),
+    ('size', '<i4'), ('fill', '<i4'), ('angle', '<f4'), ('pub', 'S48')
+])
+FLUSH_RECORDS = 4096
+REPLAY_BATCH = 1000  # records per write_due() as fast as possible
+
+
+class SampleLogWriter:
+    """appends records, buffered, to a sample log"""
+
+    def __init__(self, path, flush_records=FLUSH_RECORDS):
+        self.path = path
+        self.lock = threading.Lock()
+        self.buffer = np.zeros(flush_records, dtype=RECORD_DTYPE)
+        self.count = self.written = 0
+        self.file = open(path, 'wb')  # pylint: disable=consider-using-with
+        header = np.array([(MAGIC, VERSION, RECORD_DTYPE.itemsize)], dtype=HEADER)
+        self.file.write(header.tobytes())
+        LOG.info('capturing to %s', path)
+
+    def append(self, stamp, which, data, pub_handle):
+        """add one received sample; a ShapeType has no fill or angle, logged as 0"""
+        with self.lock:
+            if self.count == len(self.buffer):
+                self._flush()
+            self.buffer[self.count] = (
+                stamp, which, data.color, data.x, data.y, data.shapesize,
+                int(getattr(data, 'fillKind', 0)), getattr(data, 'angle', 0.0), pub_handle)
+            self.count += 1
+
+    def _flush(self):
+        self.file.write(self.buffer[:self.count].tobytes())
+        self.written += self.count
+        self.count = 0
+
+    def close(self):
+        """write what is buffered and close the file"""
+        with self.lock:
+            if not self.file.closed:
+                self._flush()
+                self.file.close()
+                LOG.info('captured %d samples to %s', self.written, self.path)
+
+
+def read_sample_log(path):
+    """@return the records of a sample log, memory-mapped read-only"""
+    header = np.fromfile(path, dtype=HEADER, count=1)
+    if len(header) != 1 or header['magic'][0] != MAGIC:
+        raise ValueError(f'{path} is not a sample log')
+    if header['version'][0] != VERSION or header['record_size'][0] != RECORD_DTYPE.itemsize:
+        raise ValueError(f'{path} is version {header["version"][0]}, not {VERSION}')
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER.itemsize)
+
+
+class SampleReplayer:
+    """writes logged samples when they are due, at speed x the captured rate
+
+    speed 0 is as fast as possible: REPLAY_BATCH records per write_due()
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, topic_dic, records, speed=1.0, extended=True, clock=time.perf_counter):
+        self.records, self.speed, self.clock = records, speed, clock
+        self.topic_dic = topic_dic  # which: Topic
+        self.extended = extended
+        self.writer_dic = {}  # (which, pub): DataWriter
+        self.publisher = None
+        self.times = np.asarray(records['time'])
+        self.position = 0
+        self.start = None
+
+    def _writer(self, which, pub):
+        writer = self.writer_dic.get((which, pub))
+        if writer is None:
+            if self.publisher is None:
+                self.publisher = dds.Publisher(self.topic_dic[which].participant)
+            writer = self.writer_dic[(which, pub)] = dds.DataWriter(
+                self.publisher, self.topic_dic[which])
+            LOG.info('replaying %s from %s', which, pub)
+        return writer
+
+    @property
+    def done(self):
+        """True once every record is written"""
+        return self.position >= len(self.records)
+
+    def _due_end(self):
+        if not self.speed:
+            return min(self.position + REPLAY_BATCH, len(self.records))
+        if self.start is None:
+            self.start = self.clock()
+        due_time = self.times[0] + (self.clock() - self.start) * self.speed
+        return int(np.searchsorted(self.times, due_time, side='right'))
+
+    def next_due_sec(self):
+        """@return seconds until the next record is due, 0 if now or as fast as possible"""
+        if self.done or not self.speed or self.start is None:
+            return 0.0
+        due_at = self.start + (self.times[self.position] - self.times[0]) / self.speed
+        return max(0.0, due_at - self.clock())
+
+    def write_due(self):
+        """write the records due by now; @return how many"""
+        if self.done:
+            return 0
+        end = self._due_end()
+        for record in self.records[self.position:end]:
+            sample = ShapeTypeExtended() if self.extended else ShapeType()
+            sample.color = record['color'].decode()
+            sample.x, sample.y = int(record['x']), int(record['y'])
+            sample.shapesize = int(record['size'])
+            if self.extended:
+                sample.fillKind = ShapeFillKind(int(record['fill']))
+                sample.angle = float(record['angle'])
+            which = record['topic'].decode()
+            self._writer(which, record['pub'].decode()).write(sample)
+        count = max(0, end - self.position)
+        self.position = max(self.position, end)
+        return count
+
+    def close(self):
+        """close the writers, as their publications leaving"""
+        for writer in self.writer_dic.values():
+            writer.close()
@@ -9,14 +9,21 @@
 """Implements shape class - holds Shape attributes"""
 
 # python imports
+from functools import lru_cache
 import logging
 import math
-from typing import List, Optional, Tuple, Union
+import zlib
+from typing import List, Optional, Tuple, Union, TYPE_CHECKING
 
 # application imports
-from matplotlib.patches import Polygon
-from matplotlib_ import Matplotlib, ZORDER_BASE
-from ShapeTypeExtended import ShapeTypeExtended
+from zorder_manager import ZorderManager
+
+# these are only needed for type hints; keep matplotlib and Connext out of light importers
+#   such as config_parser, and matplotlib out of headless publishers
+if TYPE_CHECKING:
+    from matplotlib.patches import Polygon
+    from matplotlib_ import Matplotlib
+    from shape_types import ShapeTypeExtended
 
 ## Interface to App for all things shapey
 #   Shape is responsible for:
@@ -28,50 +35,68 @@ from ShapeTypeExtended import ShapeTypeExtended
 ## This file had type hints generated then tweaked; not done elsewhere
 
 LOG = logging.getLogger(__name__)
-ZORDER_INC = 2  # allow room for gone line
 COLOR_MAP = {  # map the ShapeDemo color to the matplotlib color RGB code
     'BLACK': 'k', 'WHITE': 'w', 'GREY': '#bebebe', 'GREYx': 'grey',
     'PURPLE': '#c03bff', 'BLUE': '#0632ff', 'RED': '#ff2600', 'GREEN': '#00fa00',
     'YELLOW': '#fffb00', 'CYAN': '#00fdff', 'MAGENTA': '#ff41ff', 'ORANGE': '#ff9500'
 }
 HATCH_MAP = {0: None, 1: None, 2: "--", 3: "||"}
+PALETTE = [color for color in COLOR_MAP if color not in ('BLACK', 'WHITE', 'GREY', 'GREYx')]
+
+
+def instance_color(color: str, ix: int) -> str:
+    """@return the synthetic key of instance ix of a color, such as BLUE-000123;
+    successive instances step through the palette so they can be told apart"""
+    start = PALETTE.index(color) if color in PALETTE else 0
+    return f'{PALETTE[(start + ix) % len(PALETTE)]}-{ix:06d}'
+
+
+@lru_cache(maxsize=None)
+def display_color(color: str) -> str:
+    """@return the COLOR_MAP name to draw a color key in: itself, the prefix of a
+    synthetic key, or for any other key a palette color picked by its hash"""
+    if color in COLOR_MAP:
+        return color
+    prefix = color.split('-', 1)[0]
+    if prefix in COLOR_MAP:
+        return prefix
+    return PALETTE[zlib.crc32(color.encode()) % len(PALETTE)]
 
 
 # pylint: disable=too-many-instance-attributes
 class Shape():
     """holds shape attributes and helpers"""
-    shared_zorder = ZORDER_BASE  # keep zorder at Shape-level and for each instance
-    limit_xy, matplotlib, poly_create_func_dic = None, None, None
+    # no per-instance __dict__; ShapeView keeps the changing attributes in a ShapeStore row
+    __slots__ = ('matplotlib', 'limit_xy', 'zorder', '_gone', 'seq', 'color', 'which',
+                 'display_color', 'color_code', 'xy', 'size', 'angle', 'fill', 'pub')
+    zorder_manager = ZorderManager()  # keep zorder at Shape-level and for each instance
 
     # pylint: disable=too-many-arguments
-    def __init__(self, matplotlib: Matplotlib, seq: int, which: str,
+    def __init__(self, matplotlib: 'Matplotlib', seq: int, which: str,
             color: str, xy: Tuple[int, int], size: int, pub: Optional[bool]=False,
             angle: Optional[float]=None, fill: Optional[int]=None) -> None:
         """generic constructor"""
         assert which in 'CST', f'shape must be one of CST not {which}'
-        self.zorder = self.shared_zorder + ZORDER_INC
+        self.zorder = self.zorder_manager.next()
         self._gone = False
-        if not self.matplotlib:  # use matplotlib as a init-once gate
-            self.matplotlib = matplotlib
-            self.limit_xy = int(matplotlib.axes.get_xlim()[1]), int(matplotlib.axes.get_ylim()[1])
-            self.poly_create_func_dic = {
-                'C': self.create_circle, 'S': self.create_square, 'T': self.create_triangle
-            }
+        self.matplotlib = matplotlib
+        self.limit_xy = int(matplotlib.axes.get_xlim()[1]), int(matplotlib.axes.get_ylim()[1])
         self.seq = seq
         self.color, self.which = color, which
         # now init the Shape params
-        self.color_code = COLOR_MAP[color]
+        self.display_color = display_color(color)  # many instance keys share a color
+        self.color_code = COLOR_MAP[self.display_color]
         self.xy = xy[0], self.limit_xy[1] - xy[1]
         #self.xy = xy[0], self.matplotlib.flip_y(xy[1])  # use flip consistently? breaks tests
         self.size = int(round(size / 2))  ## RTI ShapesDemo: top-to-bottom, MPL: radius
         self.angle, self.fill = angle, fill
         self.pub = pub
-        LOG.info('created self=%s', self)
+        LOG.debug('created self=%s', self)
 
     # pylint: disable=too-many-arguments
     @classmethod
-    def from_sub_sample(cls, matplotlib: Matplotlib, seq: int, which: str,
-                        data: ShapeTypeExtended, extended: bool):
+    def from_sub_sample(cls, matplotlib: 'Matplotlib', seq: int, which: str,
+                        data: 'ShapeTypeExtended', extended: bool, **kwargs):
         """create flattened Shape attributes from DDS attributes"""
         return cls(
             matplotlib=matplotlib, seq=seq,
@@ -80,12 +105,13 @@ class Shape():
             xy=(data.x, data.y),
             size=data.shapesize,
             angle=data.angle if extended else None,
-            fill=int(data.fillKind) if extended else None
+            fill=int(data.fillKind) if extended else None,
+            **kwargs
         )
 
     @classmethod
-    def from_pub_sample(cls, matplotlib: Matplotlib, which: str,
-                        sample: ShapeTypeExtended, extended: bool):
+    def from_pub_sample(cls, matplotlib: 'Matplotlib', which: str,
+                        sample: 'ShapeTypeExtended', extended: bool, **kwargs):
         """create from a publisher sample"""
         return cls(
             matplotlib=matplotlib, seq=42,
@@ -95,7 +121,8 @@ class Shape():
             size=sample.shapesize,
             pub=True,
             angle=sample.angle if extended else None,
-            fill=sample.fillKind if extended else None
+            fill=sample.fillKind if extended else None,
+            **kwargs
         )
 
     @property
@@ -114,8 +141,7 @@ class Shape():
         self.xy = x, self.limit_xy[1] - y
         if angle is not None:
             self.angle = angle
-        Shape.shared_zorder += ZORDER_INC
-        self.zorder = self.shared_zorder
+        self.zorder = self.zorder_manager.next()
         LOG.debug('zorder:%d', self.zorder)
         self.gone = False
 
@@ -136,7 +162,7 @@ class Shape():
         return new_pos, delta_xy
 
     @staticmethod
-    def set_poly_center(poly: Polygon, which: str, xy: List[int]) -> Polygon:
+    def set_poly_center(poly: 'Polygon', which: str, xy: List[int]) -> 'Polygon':
         """helper to set the poly's centerpoint"""
         assert which in 'CST', f'Invalid shape: {which}'
         if which == 'C':
@@ -193,10 +219,10 @@ class Shape():
         #  matplotlib sets hatch to black if edge is black, so we cannot match Java Shapes
         if self.fill:
             fcolor = COLOR_MAP['WHITE']
-            ecolor = COLOR_MAP[self.color]
+            ecolor = COLOR_MAP[self.display_color]
         else:
-            fcolor = COLOR_MAP[self.color]
-            ecolor = COLOR_MAP['RED'] if self.color == 'BLUE' else COLOR_MAP['BLUE']
+            fcolor = COLOR_MAP[self.display_color]
+            ecolor = COLOR_MAP['RED'] if self.display_color == 'BLUE' else COLOR_MAP['BLUE']
             if self.pub:
                 ecolor = COLOR_MAP['BLACK']
         return fcolor, ecolor
@@ -215,7 +241,10 @@ class Shape():
 
     def create_poly(self):
         """create a matplot polygon"""
-        poly = self.poly_create_func_dic[self.which]()
+        return self.style_poly(self.poly_create_func_dic[self.which](self))
+
+    def style_poly(self, poly):
+        """set a new or reused polygon's colors, hatch and zorder for this shape"""
         fcolor, ecolor = self.face_and_edge_color_code()
         hatch = HATCH_MAP[0] if self.fill is None else HATCH_MAP[self.fill]
 
@@ -223,6 +252,8 @@ class Shape():
         poly.set(ec=ecolor, fc=fcolor, hatch=hatch, zorder=self.zorder+1)
         return poly
 
+    poly_create_func_dic = {'C': create_circle, 'S': create_square, 'T': create_triangle}
+
     def __repr__(self):
         text = ('Shape:<'
                 f'{self.which} seq:{self.seq} {self.xy} {self._gone} '
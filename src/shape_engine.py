@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Vectorized motion state for all of a publisher's instances"""
+
+# python imports
+import copy
+import logging
+
+import numpy as np
+
+## ShapeEngine mirrors the publisher half of Shape for many instances at once:
+#   xy, delta_xy, size, angle and delta_angle live in one row per configured instance
+#   wall bounce, rotation and vertex generation are whole-array operations
+#   coordinates are matplotlib (MPL) coordinates; y is flipped only when filling samples
+
+LOG = logging.getLogger(__name__)
+
+# vertex offsets from the center, in units of the (half) size, same order as Shape.get_points
+VERTEX_OFFSETS = {
+    'S': np.array([[-1, -1], [-1, 1], [1, 1], [1, -1]], dtype=float),
+    'T': np.array([[0, 1], [1, -1], [-1, -1]], dtype=float),
+}
+
+
+class ShapeEngine:
+    """holds positions, deltas, sizes and angles for all instances in NumPy arrays"""
+
+    def __init__(self, config_list, limit_xy):
+        """config_list is the list of pub_dic from ConfigParser; limit_xy is the graph extent"""
+        self.limit_xy = np.array(limit_xy, dtype=float)
+        self.which = np.array([config['which'] for config in config_list])
+        self.colors = [config['color'] for config in config_list]
+        self.fill = np.array([config['fillKind'] for config in config_list], dtype=int)
+        # RTI ShapesDemo: top-to-bottom, MPL: radius
+        self.size = np.array(
+            [int(round(config['shapesize'] / 2)) for config in config_list], dtype=float)
+        self.xy = np.array(
+            [[config['xy'][0], limit_xy[1] - config['xy'][1]] for config in config_list],
+            dtype=float).reshape(-1, 2)
+        self.delta_xy = np.array(
+            [config['delta_xy'] for config in config_list], dtype=float).reshape(-1, 2)
+        self.angle = np.array([config['angle'] for config in config_list], dtype=float)
+        self.delta_angle = np.array(
+            [config['delta_angle'] for config in config_list], dtype=float)
+        # row numbers of each kind of shape, so vertices are built per kind in one pass
+        self.index_dic = {letter: np.flatnonzero(self.which == letter) for letter in 'CST'}
+        LOG.info('engine created for %d instances', len(self))
+
+    def __len__(self):
+        return len(self.which)
+
+    def step(self):
+        """move every instance by its delta, reversing at the walls, and rotate it"""
+        half = self.size[:, np.newaxis]
+        new_xy = self.xy + self.delta_xy
+        high = new_xy + half > self.limit_xy
+        low = (new_xy - half < 0) & ~high
+        self.delta_xy[high | low] *= -1
+        new_xy = np.where(high, self.limit_xy - half, new_xy)
+        self.xy = np.where(low, half, new_xy)
+        self.angle = np.mod(self.angle + self.delta_angle, 360)
+
+    def vertices(self, which, extended=True):
+        """@return an (instances, vertices, 2) array of the polygon points for a shape kind"""
+        rows = self.index_dic[which]
+        center = self.xy[rows][:, np.newaxis, :]
+        offsets = VERTEX_OFFSETS[which] * self.size[rows][:, np.newaxis, np.newaxis]
+        if not extended:
+            return center + offsets
+        radians = np.deg2rad(self.angle[rows])[:, np.newaxis]
+        cos_rad, sin_rad = np.cos(radians), np.sin(radians)
+        adj_x, adj_y = offsets[..., 0], offsets[..., 1]
+        points = np.empty_like(offsets)
+        points[..., 0] = (cos_rad * adj_x) + (sin_rad * adj_y)
+        points[..., 1] = (cos_rad * adj_y) - (sin_rad * adj_x)
+        return np.rint(center + points)
+
+    def centers(self, which):
+        """@return an (instances, 2) array of the centers for a shape kind"""
+        return self.xy[self.index_dic[which]]
+
+    def snapshot(self):
+        """@return a copy whose positions and angles no longer change with step()"""
+        snap = copy.copy(self)
+        snap.xy, snap.angle = self.xy.copy(), self.angle.copy()
+        return snap
+
+    def fill_samples(self, samples, extended):
+        """copy the current state into the DDS samples, flipping y to ShapesDemo coordinates"""
+        x_list = self.xy[:, 0].astype(int).tolist()
+        y_list = (self.limit_xy[1] - self.xy[:, 1]).astype(int).tolist()
+        if extended:
+            for sample, x, y, angle in zip(samples, x_list, y_list, self.angle.tolist()):
+                sample.x, sample.y, sample.angle = x, y, angle
+        else:
+            for sample, x, y in zip(samples, x_list, y_list):
+                sample.x, sample.y = x, y
+
+    def __repr__(self):
+        counts = {letter: len(rows) for letter, rows in self.index_dic.items()}
+        return f'<ShapeEngine: {len(self)} instances {counts}> '
@@ -15,7 +15,7 @@
 import logging
 
 # Connext imports
-import rti.connextdds as dds
+from transport import dds
 from connext import possibly_log_qos
 
 LOG = logging.getLogger(__name__)
@@ -28,16 +28,12 @@ class ShapeListener(dds.NoOpDataReaderListener):
         """using qos logging flag for now"""
         super().__init__()
         self.args = args
+        self.on_status = None  # with --event_redraw, schedules a screen update
 
-    _status_mask = (
-        dds.StatusMask.REQUESTED_DEADLINE_MISSED |
-        dds.StatusMask.SAMPLE_REJECTED |
-        dds.StatusMask.SAMPLE_LOST |
-        dds.StatusMask.REQUESTED_INCOMPATIBLE_QOS |
-        dds.StatusMask.SUBSCRIPTION_MATCHED |
-        dds.StatusMask.LIVELINESS_LOST |
-        dds.StatusMask.LIVELINESS_CHANGED
-    )
+    def notify(self):
+        """tell the on_status callback, if any, that a status changed"""
+        if self.on_status:
+            self.on_status()
 
     listener_called = False  # TODO test me
 
@@ -45,24 +41,38 @@ class ShapeListener(dds.NoOpDataReaderListener):
     def on_requested_deadline_missed(self, reader: dds.DataReader, status: dds.RequestedDeadlineMissedStatus):
         LOG.warning("Deadline missed")
         possibly_log_qos(self.args.log_qos, reader)
+        self.notify()
 
     def on_sample_rejected(self, reader: dds.DataReader, status: dds.SampleRejectedStatus):
         LOG.warning("Sample rejected")
+        self.notify()
 
     def on_sample_lost(self, reader: dds.DataReader, status: dds.SampleLostStatus):
         LOG.warning("Sample lost")
+        self.notify()
 
     def on_requested_incompatible_qos(self, reader: dds.DataReader, status: dds.RequestedIncompatibleQosStatus):
         LOG.warning("Requested incompatible QoS")
+        self.notify()
 
     def on_subscription_matched(self, reader: dds.DataReader, status: dds.SubscriptionMatchedStatus):
         LOG.warning("Subscription matched")
         possibly_log_qos(self.args.log_qos, reader)
+        self.notify()
 
     def on_liveliness_changed(self, reader: dds.DataReader, status: dds.LivelinessChangedStatus):
         LOG.warning("Liveliness changed")
         possibly_log_qos(self.args.log_qos, reader)
+        self.notify()
 
     def get_mask(self):
-        """return the mask for all the handlers"""
-        return self._status_mask
+        """return the mask for all the handlers, from the selected transport"""
+        return (
+            dds.StatusMask.REQUESTED_DEADLINE_MISSED |
+            dds.StatusMask.SAMPLE_REJECTED |
+            dds.StatusMask.SAMPLE_LOST |
+            dds.StatusMask.REQUESTED_INCOMPATIBLE_QOS |
+            dds.StatusMask.SUBSCRIPTION_MATCHED |
+            dds.StatusMask.LIVELINESS_LOST |
+            dds.StatusMask.LIVELINESS_CHANGED
+        )
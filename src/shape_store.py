@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Array-backed storage for the shapes a publisher or subscriber draws"""
+
+# python imports
+import logging
+from math import cos, isnan, radians, sin
+
+import numpy as np
+
+from shape import Shape
+from shape_engine import VERTEX_OFFSETS
+
+## A ShapeStore keeps the attributes that change on every sample in preallocated columns
+#   xy, angle (NaN for none), zorder and gone, one row per shape, plus a row of vertices
+#   a ShapeView is a slotted Shape that reads and writes its row, so Connext and the
+#   subscriber use it as a Shape; it is opt-in, with --shape_store
+#  per call, NumPy's small-array overhead makes a view's update and get_points slower
+#   than a Shape's, whose tuples CPython frees at once, so the default stays Shape
+#  the constant attributes (which, color, size, fill, ...) stay in the view's slots
+#  get_points returns the row's vertex buffer, valid until the next call for that shape;
+#   the patches copy it, as Polygon.set_xy and CollectionItem.set_xy do
+#  a released row is reused by the next shape, so retired instances do not grow the store
+
+LOG = logging.getLogger(__name__)
+
+INITIAL_CAPACITY = 64
+MAX_VERTEX_COUNT = max(len(offsets) for offsets in VERTEX_OFFSETS.values())
+
+
+class ShapeStore:
+    """the columns of every ShapeView it created, grown by doubling"""
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.count = 0
+        self.free_rows = []  # released rows, reused before the columns grow
+        self.xy = np.zeros((capacity, 2), dtype=np.int64)
+        self.angle = np.full(capacity, np.nan)
+        self.zorder = np.zeros(capacity, dtype=np.int64)
+        self.gone = np.zeros(capacity, dtype=bool)
+        self.points = np.zeros((capacity, MAX_VERTEX_COUNT, 2), dtype=np.int64)
+        # scratch for get_points, so rotating a shape allocates no arrays
+        self.offsets = np.zeros((MAX_VERTEX_COUNT, 2))
+        self.rotated = np.zeros((MAX_VERTEX_COUNT, 2))
+        self.rotation = np.eye(2)
+
+    def __len__(self):
+        return self.count - len(self.free_rows)
+
+    def _grow(self):
+        """double the capacity of every column"""
+        for name in ('xy', 'angle', 'zorder', 'gone', 'points'):
+            array = getattr(self, name)
+            grown = np.zeros((len(array) * 2,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+        self.angle[self.count:] = np.nan
+        LOG.debug('grown to %d rows', len(self.angle))
+
+    def allocate(self):
+        """@return a released row, else the next free row"""
+        if self.free_rows:
+            return self.free_rows.pop()
+        if self.count == len(self.angle):
+            self._grow()
+        self.count += 1
+        return self.count - 1
+
+    def release(self, view):
+        """give back a view's row; the view must not be used after"""
+        self.angle[view.row] = np.nan
+        self.free_rows.append(view.row)
+
+    def from_sub_sample(self, **kwargs):
+        """@return a view created as Shape.from_sub_sample would create a Shape"""
+        return ShapeView.from_sub_sample(store=self, **kwargs)
+
+    def from_pub_sample(self, **kwargs):
+        """@return a view created as Shape.from_pub_sample would create a Shape"""
+        return ShapeView.from_pub_sample(store=self, **kwargs)
+
+    def __repr__(self):
+        return f'<ShapeStore: {len(self)} of {len(self.angle)} rows> '
+
+
+class ShapeView(Shape):
+    """a Shape whose xy, angle, zorder and gone are a row of a ShapeStore"""
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store, **kwargs):
+        """allocate the row, then init as a Shape"""
+        self.store, self.row = store, store.allocate()
+        super().__init__(**kwargs)
+
+    @property
+    def xy(self):
+        """the MPL center, as a tuple of ints"""
+        return tuple(self.store.xy[self.row].tolist())
+
+    @xy.setter
+    def xy(self, value):
+        self.store.xy[self.row] = value
+
+    @property
+    def angle(self):
+        """the angle in degrees, or None"""
+        angle = self.store.angle[self.row]
+        return None if isnan(angle) else float(angle)
+
+    @angle.setter
+    def angle(self, value):
+        self.store.angle[self.row] = np.nan if value is None else value
+
+    @property
+    def zorder(self):
+        """the zorder of the latest update"""
+        return int(self.store.zorder[self.row])
+
+    @zorder.setter
+    def zorder(self, value):
+        self.store.zorder[self.row] = value
+
+    @property
+    def _gone(self):
+        return bool(self.store.gone[self.row])
+
+    @_gone.setter
+    def _gone(self, value):
+        self.store.gone[self.row] = value
+
+    def update(self, x, y, angle=None):
+        """change position of existing shape, in place in the store"""
+        store, row = self.store, self.row
+        store.xy[row, 0] = x
+        store.xy[row, 1] = self.limit_xy[1] - y
+        if angle is not None:
+            store.angle[row] = angle
+        store.zorder[row] = self.zorder_manager.next()
+        store.gone[row] = False
+
+    def get_points(self):
+        """Given size and center, return vertices: the center of a circle, else
+        the row's (vertices, 2) buffer, overwritten by the next call"""
+        if self.which == 'C':
+            return self.xy
+        store, row = self.store, self.row
+        count = len(VERTEX_OFFSETS[self.which])
+        offsets, rotated = store.offsets[:count], store.rotated[:count]
+        np.multiply(VERTEX_OFFSETS[self.which], self.size, out=offsets)
+        angle = store.angle[row]
+        if isnan(angle):
+            rotated[...] = offsets
+        else:  # as Shape._rotate: x' = cos x + sin y, y' = cos y - sin x
+            rad = radians(angle)
+            cos_rad, sin_rad = cos(rad), sin(rad)
+            rotation = store.rotation
+            rotation[0, 0] = rotation[1, 1] = cos_rad
+            rotation[0, 1], rotation[1, 0] = -sin_rad, sin_rad
+            np.matmul(offsets, rotation, out=rotated)
+        np.add(rotated, store.xy[row], out=rotated)
+        points = store.points[row, :count]
+        np.rint(rotated, out=rotated)
+        np.copyto(points, rotated, casting='unsafe')
+        return points
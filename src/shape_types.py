@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""The Shape types: generated from the IDL, or plain dataclasses without Connext"""
+
+# python imports
+from dataclasses import dataclass
+from enum import IntEnum
+
+try:
+    from ShapeTypeExtended import ShapeFillKind, ShapeType, ShapeTypeExtended
+except ImportError:  # no rti.idl; the loopback transport only needs the same fields
+
+    @dataclass
+    class ShapeType:
+        """as generated from ShapeTypeExtended.idl"""
+        color: str = ""
+        x: int = 0
+        y: int = 0
+        shapesize: int = 0
+
+    class ShapeFillKind(IntEnum):
+        """as generated from ShapeTypeExtended.idl"""
+        SOLID_FILL = 0
+        TRANSPARENT_FILL = 1
+        HORIZONTAL_HATCH_FILL = 2
+        VERTICAL_HATCH_FILL = 3
+
+    @dataclass
+    class ShapeTypeExtended(ShapeType):
+        """as generated from ShapeTypeExtended.idl"""
+        fillKind: ShapeFillKind = ShapeFillKind.SOLID_FILL
+        angle: float = 0.0
+
+__all__ = ['ShapeFillKind', 'ShapeType', 'ShapeTypeExtended']
@@ -15,16 +15,20 @@ import logging
 import os.path
 import sys
 import textwrap
+import time
 
 # application imports
 from arg_parser import ArgParser
 from config_parser import ConfigParser
-from connext import get_cwd
-from connext_publisher import ConnextPublisher
-from connext_subscriber import ConnextSubscriber
-from matplotlib_ import Matplotlib
+from metrics_reporter import MetricsReporter
+from startup_timer import StartupTimer
+
+## Only light modules are imported here, so --config_help and argument errors are quick
+#   matplotlib, Qt, Connext, the generated types and numpy load in the handler that needs them
+# pylint: disable=import-outside-toplevel
 
 LOG = logging.getLogger(__name__)
+STARTUP_TIMER = StartupTimer()  # phases of --startup_profile
 
 DEFAULT_DIC = {
     'COLOR': 'BLUE',
@@ -99,26 +103,140 @@ def handle_config_help_and_exit():
 
 def get_connext_obj_or_die(matplotlib, args):
     """create either a Publisher or a Subscriber from config"""
+    with STARTUP_TIMER.phase('imports'):
+        from connext_publisher import ConnextPublisher
+        from connext_subscriber import ConnextSubscriber
     parser = ConfigParser(DEFAULT_DIC)
     parser.parse(args.config)
     args, is_pub, config = parser.get_config(args)
     LOG.info(config)
-    return (ConnextPublisher(matplotlib, args, config) if is_pub
-       else ConnextSubscriber(matplotlib, args, config))
+    with STARTUP_TIMER.phase('participant'):
+        return (ConnextPublisher(matplotlib, args, config) if is_pub
+           else ConnextSubscriber(matplotlib, args, config))
+
+
+def print_startup_profile(connext_obj):
+    """print the startup phases, then those of the DDS entities"""
+    print(STARTUP_TIMER.summary())
+    print(connext_obj.factory.timer.summary())
+
+
+def profile_draw(connext_obj):
+    """@return connext_obj.draw, adding the discovery and first_frame phases when they end"""
+    start = STARTUP_TIMER.clock()  # the participant and its readers or writers exist
+    pending = ['first_frame', 'discovery']
+
+    def draw(frame):
+        artists = connext_obj.draw(frame)
+        if pending:
+            elapsed = STARTUP_TIMER.clock() - start
+            if 'first_frame' in pending:
+                STARTUP_TIMER.add(pending.pop(pending.index('first_frame')), elapsed)
+            if connext_obj.is_matched():
+                STARTUP_TIMER.add(pending.pop(pending.index('discovery')), elapsed)
+            if not pending:
+                print_startup_profile(connext_obj)
+        return artists
+
+    draw.pending = pending
+    return draw
+
+
+def handle_headless_and_exit(args):
+    """publish from the engine alone, never creating a figure, then report the rate"""
+    with STARTUP_TIMER.phase('imports'):
+        from headless_publisher import HeadlessPublisher
+    parser = ConfigParser(DEFAULT_DIC)
+    parser.parse(args.config)
+    args, is_pub, config = parser.get_config(args)
+    if not is_pub:
+        LOG.error('--headless requires a publisher, use --publish or a pub config')
+        sys.exit(-1)
+    with STARTUP_TIMER.phase('participant'):
+        publisher = HeadlessPublisher(args, config)
+    LOG.info(publisher)
+    LOG.info(publisher.factory.timer.summary())
+    if args.startup_profile:
+        print_startup_profile(publisher)
+    metrics = (MetricsReporter(publisher, args.metrics_interval)
+               if args.metrics_interval else None)
+    LOG.info(publisher.run(args.target_rate, args.duration, metrics))
+    publisher.stop_threads()
+    LOG.info(publisher.sample_counter)
+    sys.exit(0)
+
+
+def handle_replay_and_exit(args):
+    """write a --capture file to DataWriters at --replay_speed, never creating a figure"""
+    from connext import Connext
+    from sample_log import SampleReplayer, read_sample_log
+    connext_obj = Connext(None, args)
+    replayer = SampleReplayer(connext_obj.topic_dic, read_sample_log(args.replay),
+                              args.replay_speed, args.extended)
+    LOG.info('replaying %d samples from %s', len(replayer.records), args.replay)
+    try:
+        while not replayer.done:
+            connext_obj.sample_counter['replay-write'] += replayer.write_due()
+            time.sleep(replayer.next_due_sec())
+    except KeyboardInterrupt:
+        LOG.info('replay interrupted')
+    finally:
+        replayer.close()
+    LOG.info(connext_obj.exit_summary())
+    sys.exit(0)
 
 
-def handle_justdds(args, connext_obj):
+def handle_justdds(args, connext_obj, draw):
     """For debugging, run some callbacks"""
     LOG.info('RUNNING args.justdds=%d reads', args.justdds)
     for i in range(args.justdds):
-        connext_obj.draw(10)
+        draw(10)
         LOG.info('%d of %d', i, args.justdds)
+    LOG.info(connext_obj.exit_summary())
+
+def handle_offscreen(args, matplotlib, draw):
+    """render --offscreen frames to the Agg buffer, writing any --frame_dump, and report"""
+    from offscreen import FrameWriter, OffscreenRenderer
+    writer = None
+    if args.frame_dump:
+        writer = FrameWriter(args.frame_dump, args.publish_rate)
+        writer.start()
+    renderer = OffscreenRenderer(matplotlib.fig, draw, args.publish_rate, writer)
+    LOG.info('RUNNING args.offscreen=%d frames', args.offscreen)
+    try:
+        renderer.run(args.offscreen)
+    except KeyboardInterrupt:
+        LOG.info('interrupted')
+        if writer:
+            writer.close()
+    print(renderer.summary())
+
 
 def main(args):
     """MAIN ENTRY POINT"""
 
+    if args.config_help:  # before any figure, logo or participant
+        handle_config_help_and_exit()
+
+    with STARTUP_TIMER.phase('imports'):
+        import transport
+    if args.replay and args.subscribe and not args.transport:
+        args.transport = 'loopback'  # render the replay without a network
+    transport.select(args.transport or transport.default_transport())
+    if args.replay and args.publish:
+        handle_replay_and_exit(args)
+    if args.headless:
+        handle_headless_and_exit(args)
+
+    if args.offscreen:
+        os.environ['MPLBACKEND'] = 'Agg'  # before matplotlib is imported, so no window
+    with STARTUP_TIMER.phase('imports'):
+        from matplotlib_ import Matplotlib  # only after headless, which must not load matplotlib
+        if args.panels:
+            from multi_panel import PanelViewer, parse_panels
+
     # first, create the plotting environment
-    image_filename = f'{get_cwd(__file__)}/RTI_Logo_RGB-Color.png'
+    image_filename = f'{os.path.dirname(os.path.realpath(__file__))}/RTI_Logo_RGB-Color.png'
     if not os.path.exists(image_filename):
         LOG.warning("Image file %s missing; no background art will be used.", image_filename)
         image_filename = None
@@ -126,24 +244,59 @@ def main(args):
     args.box_title = (f"Shapes Domain:{args.domain_id}"
         if args.title == DEFAULT_DIC['TITLE'] else args.title)
 
-    matplotlib = Matplotlib(args, image_filename)
-    if args.config_help:
-        handle_config_help_and_exit()
-
-    connext_obj = get_connext_obj_or_die(matplotlib, args)
+    if args.panels:  # one figure of panels, each a publisher or subscriber
+        panel_args_list = parse_panels(args.panels, sys.argv[1:], ArgParser(DEFAULT_DIC))
+        with STARTUP_TIMER.phase('figure'):
+            matplotlib = connext_obj = PanelViewer(args, panel_args_list, image_filename)
+        connext_obj.create_panels(get_connext_obj_or_die)
+    else:
+        with STARTUP_TIMER.phase('figure'):
+            matplotlib = Matplotlib(args, image_filename)
+        connext_obj = get_connext_obj_or_die(matplotlib, args)
     LOG.info(connext_obj)
+    LOG.info(connext_obj.factory.timer.summary())
+    profiled_draw = profile_draw(connext_obj) if args.startup_profile else None
+    draw = profiled_draw or connext_obj.draw
+    metrics = None
+    if args.metrics_interval:
+        metrics = MetricsReporter(connext_obj, args.metrics_interval)
+        draw = metrics.wrap(draw)
 
     if args.justdds:
-        handle_justdds(args, connext_obj)
-        sys.exit(0)
-
-    # lower interval if updates are jerky
-    _ = matplotlib.func_animation(matplotlib.fig, connext_obj.draw,
-                                  interval=args.publish_rate, blit=True)
-    # Show the image and block until the window is closed
-    matplotlib.plt.show()
-    LOG.info("Exiting...")
-    LOG.info(connext_obj.sample_counter)
+        handle_justdds(args, connext_obj, draw)
+    elif args.offscreen:
+        handle_offscreen(args, matplotlib, draw)
+        connext_obj.stop_threads()
+        LOG.info(connext_obj.exit_summary())
+    else:
+        # lower interval if updates are jerky
+        wake_thread = getattr(connext_obj, 'wake_thread', None)
+        if args.event_redraw and not wake_thread:
+            LOG.warning('--event_redraw needs a subscriber, in every panel with --panels; '
+                        'using the --publish_rate timer')
+        if wake_thread:
+            animation = Matplotlib.event_animation(
+                matplotlib.fig, draw, args.publish_rate, wake_thread)
+        elif args.dirty_blit:
+            animation = Matplotlib.dirty_blit_animation(
+                matplotlib.fig, draw, interval=args.publish_rate)
+        else:
+            animation = Matplotlib.func_animation(matplotlib.fig, draw,
+                                                  interval=args.publish_rate, blit=True)
+        if metrics:  # an idle --event_redraw window draws nothing, yet reports
+            metrics.start_timer(matplotlib.fig.canvas)
+        # Show the image and block until the window is closed, or ^C as from orchestrator.py
+        try:
+            matplotlib.plt.show()
+        except KeyboardInterrupt:
+            LOG.info('interrupted')
+        LOG.info("Exiting...")
+        if wake_thread:
+            LOG.info(animation)
+        connext_obj.stop_threads()
+        LOG.info(connext_obj.exit_summary())
+    if profiled_draw and profiled_draw.pending:  # never matched, or never drew
+        print_startup_profile(connext_obj)
 
 
 if __name__ == "__main__":
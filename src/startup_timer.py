@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Times the phases of startup"""
+
+# python imports
+from collections import Counter
+from contextlib import contextmanager
+import logging
+import time
+
+LOG = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """accumulates the seconds spent in each named phase, in first-seen order"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.created = clock()
+        self.phase_dic = {}  # phase name: seconds
+        self.count_dic = Counter()  # phase name: times entered
+
+    @contextmanager
+    def phase(self, name):
+        """time the body of a with statement as the named phase"""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.add(name, self.clock() - start)
+
+    def add(self, name, seconds):
+        """add seconds to a phase"""
+        self.phase_dic[name] = self.phase_dic.get(name, 0.0) + seconds
+        self.count_dic[name] += 1
+
+    def summary(self):
+        """@return one line of the phases in milliseconds"""
+        phases = ' '.join(
+            f'{name}:{seconds * 1e3:.1f}' + (f'x{self.count_dic[name]}'
+                                            if self.count_dic[name] > 1 else '')
+            for name, seconds in self.phase_dic.items())
+        return (f'startup ms: {phases} total:{sum(self.phase_dic.values()) * 1e3:.1f} '
+                f'since first use:{(self.clock() - self.created) * 1e3:.1f}')
+
+    def __repr__(self):
+        return f'<StartupTimer: {self.summary()}> '
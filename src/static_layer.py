@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Caches the static artists of an axes as one bitmap, and the downscaled logo on disk"""
+
+# python imports
+import hashlib
+import logging
+import os
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.backends.backend_agg import RendererAgg
+
+## The logo, the content filter rectangles and the --text labels never change, yet every
+#   full draw (the first, a resize, a zorder renumber) resamples the logo, hatches the
+#   rectangles and lays out the text again
+#  a StaticLayer draws its artists once into a bitmap of the canvas size, cropped to what
+#   they cover, then each full draw only blends that bitmap; it is rebuilt when the canvas
+#   size or dpi changes, or an artist is added
+#   its artists are set animated, so the axes skip them, and it draws at their zorder, so
+#   shapes stack above or below them as before; one layer per zorder keeps that true
+#  when saving, or with a renderer that is not Agg, the axes draw the artists themselves
+#  the logo is downscaled once and kept in the user's cache directory as a .npy,
+#   keyed by the file's path, size, modification time and the zoom
+
+LOG = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'shapes_demo')
+
+
+def cached_image(image_filename, zoom, cache_dir=None):
+    """@return the image of a file downscaled by zoom, from the disk cache if there"""
+    cache_dir = cache_dir or CACHE_DIR
+    stat = os.stat(image_filename)
+    key = f'{os.path.realpath(image_filename)}:{stat.st_size}:{stat.st_mtime_ns}:{zoom}'
+    cache_filename = os.path.join(
+        cache_dir, f'image-{hashlib.sha1(key.encode()).hexdigest()[:16]}.npy')
+    try:
+        return np.load(cache_filename)
+    except (OSError, ValueError):
+        pass  # not cached yet, or unreadable
+    # pylint: disable=import-outside-toplevel
+    from PIL import Image  # installed with matplotlib
+    with Image.open(image_filename) as image:
+        size = max(1, round(image.width * zoom)), max(1, round(image.height * zoom))
+        scaled = np.asarray(image.convert('RGBA').resize(size, Image.LANCZOS))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(cache_filename, scaled)
+        LOG.info('cached %s at %s', image_filename, cache_filename)
+    except OSError as exc:
+        LOG.warning('cannot cache %s: %s', image_filename, exc)
+    return scaled
+
+
+class StaticLayer(Artist):
+    """draws the bitmap of artists that never change, rendered once"""
+
+    def __init__(self, zorder):
+        super().__init__()
+        self.set_zorder(zorder)
+        self.artists = []
+        self.image, self.image_xy = None, (0, 0)  # RGBA rows, top first; its lower left
+        self.cache_key = None
+        self.render_count = 0
+
+    def add(self, artist):
+        """draw an artist, already on the axes, from the bitmap from now on"""
+        artist.set_animated(True)
+        self.artists.append(artist)
+        self.cache_key = None
+
+    def _render(self, renderer):
+        """draw the artists into a bitmap the size of the canvas, crop it to them"""
+        layer = RendererAgg(renderer.width, renderer.height, renderer.dpi)
+        for artist in sorted(self.artists, key=lambda artist: artist.zorder):
+            artist.draw(layer)
+        rgba = np.asarray(layer.buffer_rgba())
+        rows, cols = np.nonzero(rgba[..., 3])
+        if not len(rows):
+            self.image = None
+            return
+        top, bottom, left, right = rows.min(), rows.max() + 1, cols.min(), cols.max() + 1
+        self.image = rgba[top:bottom, left:right].copy()
+        self.image_xy = left, renderer.height - bottom
+        self.render_count += 1
+        LOG.debug('rendered %d artists, %s', len(self.artists), self.image.shape)
+
+    def draw(self, renderer):
+        if not self.get_visible() or not self.artists:
+            return
+        if self.figure.canvas.is_saving():
+            return  # the axes draw animated artists too when saving
+        if not isinstance(renderer, RendererAgg):
+            for artist in sorted(self.artists, key=lambda artist: artist.zorder):
+                artist.draw(renderer)
+            return
+        key = (renderer.width, renderer.height, renderer.dpi)
+        if key != self.cache_key:
+            self._render(renderer)
+            self.cache_key = key
+        if self.image is not None:
+            gc = renderer.new_gc()
+            renderer.draw_image(gc, *self.image_xy, self.image[::-1])
+            gc.restore()
+        self.stale = False
+
+    def __repr__(self):
+        return (f'<StaticLayer: zorder:{self.zorder} {len(self.artists)} artists '
+                f'rendered:{self.render_count}> ')
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Drains the DataReaders on a background thread into a latest-state table"""
+
+# python imports
+from collections import Counter, deque
+import itertools
+import logging
+import threading
+
+# Connext imports
+from transport import dds
+
+LOG = logging.getLogger(__name__)
+
+WAIT_TIMEOUT_SEC = 1.0  # only bounds how long stop() can take; the guard wakes the wait
+
+
+class LatestStateTable:
+    """the newest samples of each instance, swapped out whole by the animation callback"""
+
+    def __init__(self, timestamps=False, capture=None):
+        self.timestamps = timestamps  # keep (source, reception) seconds for latency stats
+        self.capture = capture  # a SampleLogWriter to append every valid sample to
+        self.lock = threading.Lock()
+        self._arrival = itertools.count()  # orders samples and state changes across instances
+        self._instance_dic = {}  # (which, color): deque of (arrival, seq, data, pub_handle, stamps)
+        self._state_list = []  # (arrival, which, reader, info) for invalid samples
+        self._taken = Counter()  # which-read: every sample taken, kept or not
+
+    def put(self, which, reader, depth, data_info_list):
+        """add a take() worth of samples, keeping only the last depth of each instance;
+        a depth below 1 (LENGTH_UNLIMITED) keeps them all"""
+        maxlen = depth if depth > 0 else None
+        with self.lock:
+            for data, info in data_info_list:
+                arrival = next(self._arrival)
+                if info.valid:
+                    key = (which, data.color)
+                    entries = self._instance_dic.get(key)
+                    if entries is None:
+                        entries = self._instance_dic[key] = deque(maxlen=maxlen)
+                    stamps = ((info.source_timestamp.to_seconds(),
+                               info.reception_timestamp.to_seconds())
+                              if self.timestamps else None)
+                    pub_handle = str(info.publication_handle)
+                    entries.append((arrival, info.reception_sequence_number.value,
+                                    data, pub_handle, stamps))
+                    if self.capture:
+                        self.capture.append(info.reception_timestamp.to_seconds(),
+                                            which, data, pub_handle)
+                    self._taken[f'{which}-read'] += 1
+                else:
+                    self._state_list.append((arrival, which, reader, info))
+
+    def swap(self):
+        """@return (instance_dic, state_list, taken) gathered since the last swap and reset"""
+        with self.lock:
+            swapped = self._instance_dic, self._state_list, self._taken
+            self._instance_dic, self._state_list, self._taken = {}, [], Counter()
+        return swapped
+
+
+class TakeThread(threading.Thread):
+    """wait on a ReadCondition per reader, take() whatever arrives into the table"""
+
+    def __init__(self, reader_dic, depth_dic, table):
+        super().__init__(name='TakeThread', daemon=True)
+        self.reader_dic, self.depth_dic, self.table = reader_dic, depth_dic, table
+        self.stop_event = threading.Event()
+        self.guard = dds.GuardCondition()  # wakes the WaitSet on stop()
+        self.waitset = dds.WaitSet()
+        self.waitset.attach_condition(self.guard)
+        self.condition_dic = {}  # which: ReadCondition
+        for which, reader in reader_dic.items():
+            self.condition_dic[which] = dds.ReadCondition(reader, dds.DataState.any)
+            self.waitset.attach_condition(self.condition_dic[which])
+
+    def run(self):
+        LOG.info('taking from %s', list(self.reader_dic.keys()))
+        while not self.stop_event.is_set():
+            self.waitset.wait(dds.Duration(WAIT_TIMEOUT_SEC))
+            for which, condition in self.condition_dic.items():
+                if condition.trigger_value:
+                    reader = self.reader_dic[which]
+                    self.table.put(which, reader, self.depth_dic[which], reader.take())
+
+    def stop(self, timeout=WAIT_TIMEOUT_SEC):
+        """ask the thread to finish and wait for it"""
+        self.stop_event.set()
+        self.guard.trigger_value = True
+        self.join(timeout)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Tests for ArtistPool"""
+import unittest
+from unittest.mock import MagicMock
+import matplotlib
+from artist_pool import ArtistPool
+from fixtures import agg_matplotlib
+from shape import Shape
+from zorder_manager import ZorderManager
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for ArtistPool"""
+
+    def setUp(self):
+        self.zorder_manager = ZorderManager()
+
+    def tearDown(self):
+        if hasattr(self, 'matplotlib'):
+            self.matplotlib.plt.close('all')
+
+    def _pool(self, argv=()):
+        self.matplotlib, _, _ = agg_matplotlib(argv, 'test_artist_pool')
+        return ArtistPool(self.matplotlib, self.zorder_manager, {'C': 2, 'S': 1}, 3)
+
+    def _shape(self, which, color='RED'):
+        return Shape(matplotlib=self.matplotlib, seq=1, which=which, color=color,
+                     xy=(50, 50), size=30, fill=0)
+
+    def test_preallocates_hidden(self):
+        pool = self._pool()
+        self.assertEqual((pool.available('C'), pool.available('S')), (6, 3))
+        self.assertEqual(len(self.matplotlib.axes.patches), 9)
+        self.assertFalse(any(patch.get_visible() for patch in self.matplotlib.axes.patches))
+
+    def test_acquire_release_reuses(self):
+        pool = self._pool()
+        circle = pool.acquire(self._shape('C'))
+        self.assertTrue(circle.get_visible())
+        self.assertEqual(circle.radius, 15)
+        pool.release('C', circle)
+        self.assertFalse(circle.get_visible())
+        self.assertIs(pool.acquire(self._shape('C', 'GREEN')), circle)
+        self.assertEqual(circle.get_facecolor(), matplotlib.colors.to_rgba('#00fa00'))
+
+    def test_grows_when_empty(self):
+        pool = self._pool()
+        artists = [pool.acquire(self._shape('S')) for _ in range(4)]
+        self.assertEqual(len(set(artists)), 4)
+        self.assertEqual(pool.created_count, 10)
+
+    def test_collection_items_hide(self):
+        pool = self._pool(['--collections'])
+        square = pool.acquire(self._shape('S'))
+        layer, row = square.layer, square.row
+        self.assertEqual(layer.facecolors[row][3], 1)
+        pool.release('S', square)
+        self.assertEqual(layer.facecolors[row][3], 0)
+        pool.acquire(self._shape('S', 'BLUE'))
+        self.assertEqual(tuple(layer.facecolors[row]), matplotlib.colors.to_rgba('#0632ff'))
+
+    def test_release_forgets_zorder(self):
+        pool = ArtistPool(MagicMock(), self.zorder_manager, {'T': 1}, 0)
+        artist = MagicMock()
+        self.zorder_manager.touch(artist)
+        pool.release('T', artist)
+        self.assertEqual(pool.available('T'), 1)
+        self.zorder_manager.current = self.zorder_manager.limit  # force a renumber
+        self.zorder_manager.next()
+        artist.set.assert_called_once_with(visible=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+"""Tests for the benchmark helpers"""
+import unittest
+from benchmark import compare, instance_keys, result
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for the benchmark helpers"""
+
+    def test_instance_keys_distinct(self):
+        keys = instance_keys(24)
+        self.assertEqual(len(set(keys)), 24)
+        self.assertEqual(keys[:3], [('S', 'PURPLE'), ('T', 'PURPLE'), ('C', 'PURPLE')])
+        keys = instance_keys(1000)
+        self.assertEqual(len(set(keys)), 1000)
+        self.assertEqual(keys[24:26], [('S', 'PURPLE-000000'), ('T', 'PURPLE-000000')])
+
+    def test_result_per_instance(self):
+        res = result('frame', 10, 6, (100, 0.002, 0.003))
+        self.assertEqual(res['per_instance_sec'], 0.0002)
+        self.assertEqual(res['depth'], 6)
+
+    def test_compare_flags_only_slower(self):
+        baseline = {'results': [result('a', 1, None, (1, 1.0, 1.0)),
+                                result('b', 1, None, (1, 1.0, 1.0))]}
+        current = {'results': [result('a', 1, None, (1, 1.2, 1.2)),
+                               result('b', 1, None, (1, 1.5, 1.5)),
+                               result('new', 1, None, (1, 9.0, 9.0))]}
+        regressions = compare(baseline, current, tolerance=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('b instances:1'))
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Tests for BlitManager"""
+import random
+import unittest
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
+from matplotlib.transforms import Bbox
+from blit_manager import BlitManager, merge_regions
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for BlitManager"""
+
+    @staticmethod
+    def _figure():
+        fig = Figure(figsize=(3, 3))
+        FigureCanvasAgg(fig)
+        axes = fig.add_subplot()
+        axes.set_xlim(0, 240)
+        axes.set_ylim(0, 270)
+        axes.text(50, 50, 'static')
+        return fig, axes
+
+    def _full_render(self, circles):
+        """@return the pixels of a fresh figure drawing the circles as they are now"""
+        fig, axes = self._figure()
+        for circle in circles:
+            if circle.axes is not None:
+                axes.add_patch(Circle(circle.center, circle.radius, fc=circle.get_facecolor(),
+                                      ec='k', zorder=circle.zorder, visible=circle.get_visible()))
+        fig.canvas.draw()
+        return np.asarray(fig.canvas.buffer_rgba()).astype(int)
+
+    def setUp(self):
+        random.seed(7)
+        self.fig, axes = self._figure()
+        self.manager = BlitManager(self.fig)
+        self.circles = []
+        for ix in range(12):
+            circle = Circle((random.randint(0, 240), random.randint(0, 270)), 15,
+                            fc=f'C{ix % 10}', ec='k', zorder=10 + ix)
+            axes.add_patch(circle)
+            self.circles.append(circle)
+        self.fig.canvas.draw()
+
+    def test_merge_regions(self):
+        boxes = [Bbox([[0, 0], [10, 10]]), Bbox([[20, 20], [30, 30]]), Bbox([[5, 5], [25, 25]])]
+        self.assertEqual(len(merge_regions(boxes)), 1)
+        apart = [Bbox([[ix * 20, 0], [ix * 20 + 10, 10]]) for ix in range(5)]
+        self.assertEqual(len(merge_regions(apart)), 5)
+        self.assertEqual(merge_regions(apart, max_regions=3)[0].x1, 90)
+
+    def test_artists_in_background_need_a_full_draw(self):
+        self.manager.update(self.circles)  # drawn into the background before now
+        self.assertEqual(self.manager.full_draw_count, 2)
+        self.assertTrue(all(circle.get_animated() for circle in self.circles))
+
+    def test_repaints_match_a_full_render(self):
+        self.manager.update(self.circles)
+        for step in range(30):
+            moved = random.sample(self.circles, 2)
+            for circle in moved:
+                circle.set(center=(random.randint(0, 240), random.randint(0, 270)))
+            if step == 10:
+                self.circles[0].remove()
+                moved.append(self.circles[0])
+            elif step == 15:
+                self.circles[1].set_visible(False)
+                moved.append(self.circles[1])
+            elif step == 20:
+                self.circles[2].set(zorder=100)
+                moved.append(self.circles[2])
+            self.manager.update(moved)
+        pixels = np.asarray(self.fig.canvas.buffer_rgba()).astype(int)
+        self.assertLessEqual(np.abs(pixels - self._full_render(self.circles)).max(), 1)
+        self.assertEqual(self.manager.full_draw_count, 2)  # no more after the first
+        self.assertNotIn(self.circles[0], self.manager.extent_dic)
+
+    def test_nothing_changed_draws_nothing(self):
+        self.manager.update(self.circles)
+        regions = self.manager.region_count
+        self.manager.update([])
+        self.assertEqual(self.manager.region_count, regions)
+
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
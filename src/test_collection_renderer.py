@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""Tests for CollectionRenderer"""
+import unittest
+from matplotlib.figure import Figure
+from matplotlib.colors import to_rgba
+from collection_renderer import (
+    CollectionRenderer, LevelOfDetail, CIRCLE_VERTEX_COUNT, COOLDOWN_FRAMES, LOD_MIN_THRESHOLD)
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for CollectionRenderer"""
+
+    def setUp(self):
+        self.axes = Figure().add_subplot()
+        self.renderer = CollectionRenderer(self.axes)
+        self.square = self.renderer.create_polygon([(0, 0), (0, 10), (10, 10), (10, 0)])
+        self.triangle = self.renderer.create_polygon([(5, 10), (10, 0), (0, 0)])
+
+    def test_one_layer_per_kind(self):
+        self.renderer.create_polygon([(1, 1), (1, 2), (2, 2), (2, 1)])
+        self.assertEqual(len(self.renderer.artists()), 2)
+        self.assertEqual(len(self.renderer.get_layer(4, None)), 2)
+
+    def test_get_xy_is_closed(self):
+        self.square.set_xy([(1, 1), (1, 2), (2, 2), (2, 1)])
+        points = self.square.get_xy().tolist()
+        self.assertEqual(len(points), 5)
+        self.assertEqual(points[0], points[-1])
+
+    def test_set_updates_arrays(self):
+        self.square.set(fc='red', ec='k', lw=2, zorder=42)
+        layer = self.square.layer
+        self.assertEqual(tuple(layer.facecolors[self.square.row]), to_rgba('red'))
+        self.assertEqual(layer.linewidths[self.square.row], 2)
+        self.assertEqual(self.square.zorder, 42)
+        collection = self.renderer.artists()[0]
+        self.assertEqual(tuple(collection.get_facecolor()[0]), to_rgba('red'))
+
+    def test_hatch_moves_layer(self):
+        self.square.set(fc='red', hatch='--')
+        self.assertEqual(self.square.layer.hatch, '--')
+        self.assertEqual(tuple(self.square.layer.facecolors[self.square.row]), to_rgba('red'))
+        self.assertEqual(len(self.renderer.get_layer(4, None)), 0)
+
+    def test_circle_center(self):
+        circle = self.renderer.create_circle((50, 60), radius=10)
+        circle.set(center=(70, 80))
+        self.assertEqual(circle.center, (70, 80))
+        self.assertEqual(circle.layer.vertex_count, CIRCLE_VERTEX_COUNT)
+        self.assertAlmostEqual(circle.get_xy()[:-1, 0].mean(), 70)
+
+    def test_circle_radius(self):
+        circle = self.renderer.create_circle((50, 60), radius=10)
+        circle.set(radius=20)
+        self.assertAlmostEqual(circle.get_xy()[:-1, 0].max(), 70)
+
+    def test_hidden_keeps_colors(self):
+        self.square.set(fc='red', ec='k')
+        self.square.set(visible=False)
+        self.assertEqual(self.square.layer.facecolors[self.square.row][3], 0)
+        self.square.set(ec='blue')
+        self.square.set(visible=True)
+        layer, row = self.square.layer, self.square.row
+        self.assertEqual(tuple(layer.facecolors[row]), to_rgba('red'))
+        self.assertEqual(tuple(layer.edgecolors[row]), to_rgba('blue'))
+
+    def test_remove_moves_last_row(self):
+        other = self.renderer.create_polygon([(7, 7), (7, 8), (8, 8), (8, 7)])
+        self.square.remove()
+        self.assertEqual(other.row, 0)
+        self.assertEqual(other.get_xy()[0].tolist(), [7, 7])
+
+    def test_rows_draw_in_zorder(self):
+        other = self.renderer.create_polygon([(7, 7), (7, 8), (8, 8), (8, 7)])
+        self.square.set(fc='red', zorder=30)  # above other, though its row is first
+        other.set(fc='blue', zorder=20)
+        collection = self.renderer.artists()[0]
+        colors = [tuple(color) for color in collection.get_facecolor()]
+        self.assertEqual(colors, [to_rgba('blue'), to_rgba('red')])
+        self.square.set(zorder=10)
+        collection = self.renderer.artists()[0]
+        colors = [tuple(color) for color in collection.get_facecolor()]
+        self.assertEqual(colors, [to_rgba('red'), to_rgba('blue')])
+
+    def test_grows(self):
+        for ix in range(40):
+            self.renderer.create_polygon([(ix, 0), (ix, 1), (ix + 1, 1), (ix + 1, 0)])
+        collection = self.renderer.artists()[0]
+        self.assertEqual(len(collection.get_paths()), 41)
+
+    def _lod_renderer(self, threshold, count=20):
+        # a zero budget is never over or under, so the threshold stays put
+        renderer = CollectionRenderer(self.axes, lod=LevelOfDetail(threshold, 0.0))
+        squares = [renderer.create_polygon([(ix, 0), (ix, 2), (ix + 2, 2), (ix + 2, 0)])
+                   for ix in range(count)]
+        for square in squares:
+            square.set(fc='red', ec='k', hatch='/')
+        return renderer, squares
+
+    def test_lod_switches_kind_to_points(self):
+        renderer, squares = self._lod_renderer(threshold=LOD_MIN_THRESHOLD)
+        squares[0].set_history(True)  # left out of the points
+        squares[1].set(visible=False)
+        renderer.artists()
+        self.assertEqual(renderer.point_kinds, {4})
+        points = renderer.point_dic[4].collection
+        self.assertTrue(points.get_visible())
+        self.assertFalse(renderer.get_layer(4, '/').collection.get_visible())
+        self.assertEqual(len(points.get_offsets()), 18)
+        self.assertEqual(points.get_offsets()[0].tolist(), [3, 1])  # the center of squares[2]
+        self.assertEqual(tuple(points.get_facecolor()[0]), to_rgba('red'))
+        self.assertEqual(renderer.artists(changed_only=True), [])
+        squares[2].set_xy([(50, 50), (50, 52), (52, 52), (52, 50)])
+        self.assertEqual(renderer.artists(changed_only=True), [points])
+
+    def test_lod_switches_back_below_hysteresis(self):
+        renderer, squares = self._lod_renderer(threshold=LOD_MIN_THRESHOLD, count=20)
+        renderer.artists()
+        for square in squares[:3]:  # 17 shown, not yet 0.8 x 16
+            square.set(visible=False)
+        renderer.artists()
+        self.assertEqual(renderer.point_kinds, {4})
+        for square in squares[3:8]:
+            square.set(visible=False)
+        artists = renderer.artists(changed_only=True)
+        self.assertEqual(renderer.point_kinds, set())
+        self.assertIn(renderer.point_dic[4].collection, artists)  # to be hidden
+        self.assertTrue(renderer.get_layer(4, '/').collection.get_visible())
+
+    def test_lod_threshold_follows_frame_time(self):
+        lod = LevelOfDetail(1000, 0.010)
+        counts = {4: 500, 3: 100}
+        for _ in range(20):  # slow frames
+            kinds = lod.observe(0.05, counts, set())
+            if kinds:
+                break
+        self.assertEqual((kinds, lod.threshold, lod.slow_count), ({4}, 499, 500))
+        for _ in range(COOLDOWN_FRAMES * 20):  # fast frames, as points
+            kinds = lod.observe(0.001, counts, kinds)
+        self.assertEqual(kinds, {4})  # the threshold stays below what was slow
+        self.assertEqual(lod.threshold, 499)
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
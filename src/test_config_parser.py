@@ -200,6 +200,16 @@ class Test(unittest.TestCase):
         pub_cfg_list = self.parser.get_pub_config()
         self.assertEqual(pub_cfg_list[0]['color'], 'RED') #, pprint(pub_cfg_list))
 
+    def test_expand_instances(self):
+        self.parser.parse(TRIANGLE_CONFIG_FILENAME)
+        pub_cfg_list = self.parser.get_pub_config()
+        expanded = ConfigParser.expand_instances(pub_cfg_list, 100)
+        self.assertEqual(len(expanded), 100 * len(pub_cfg_list))
+        self.assertEqual(expanded[0]['color'], 'RED-000000')
+        self.assertEqual(len({(pub['which'], pub['color']) for pub in expanded}), len(expanded))
+        self.assertNotEqual(expanded[1]['xy'], expanded[0]['xy'])
+        self.assertEqual(pub_cfg_list[0]['color'], 'RED')  # the configured shapes are untouched
+
     def test_sub_filter_xy(self):
         config = '''{"sub": {
              "square": { "content_filter_xy": [[0, 270], [240, 135]] },
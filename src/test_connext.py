@@ -7,6 +7,7 @@ from arg_parser import ArgParser
 from config_parser import ConfigParser
 from connext import Connext
 from shapes_demo import DEFAULT_DIC
+import transport
 
 LOG = logging.getLogger(__name__)
 logging.basicConfig(
@@ -20,6 +21,7 @@ class Test(unittest.TestCase):
     """Test ConnextPublisher"""
 
     def setUp(self):
+        self.transport = transport.select('loopback')  # no Connext license needed
         arg_parser = ArgParser(DEFAULT_DIC)
         args = arg_parser.parse_args(["-d", "27", "-pub", "S"])
         LOG.info(f'{args=}')
@@ -29,6 +31,10 @@ class Test(unittest.TestCase):
         self.assertTrue(is_pub)
         self.connext = Connext(MagicMock(), parsed_args)
 
+    def tearDown(self):
+        if self.transport:
+            transport.select(self.transport)
+
     def test_get_center_square(self):
         square_points = [[141, 33], [141, 63], [171, 63], [171, 33], [141, 33]]
         center_x, center_y = self.connext._get_center(square_points)
@@ -48,6 +54,13 @@ class Test(unittest.TestCase):
         self.assertEqual(center_x, 156)
         self.assertEqual(center_y, 48)
 
+    def test_state_per_instance(self):
+        other = Connext(MagicMock(), self.connext.args)
+        self.connext.sample_counter['S-read'] += 1
+        self.assertIsNot(other.poly_dic, self.connext.poly_dic)
+        self.assertEqual(other.sample_counter['S-read'], 0)
+        self.assertIs(other.participant, self.connext.participant)
+
 if __name__ == '__main__':
     unittest.main()
     Test()
@@ -6,7 +6,10 @@ from unittest.mock import MagicMock #, patch
 from arg_parser import ArgParser
 from config_parser import ConfigParser
 from connext_publisher import ConnextPublisher
+import loopback_dds
+from shape import PALETTE
 from shapes_demo import DEFAULT_DIC
+import transport
 
 LOG = logging.getLogger(__name__)
 logging.basicConfig(
@@ -19,6 +22,7 @@ class Test(unittest.TestCase):
     """Test ConnextPublisher"""
 
     def setUp(self):
+        self.transport = transport.select('loopback')  # no Connext license needed
         arg_parser = ArgParser(DEFAULT_DIC)
         args = arg_parser.parse_args(["-d", "27", "-pub", "S"])
         LOG.info(f'{args=}')
@@ -28,10 +32,43 @@ class Test(unittest.TestCase):
         self.assertTrue(is_pub)
         self.pub = ConnextPublisher(MagicMock(), parsed_args, self.config)
 
+    def tearDown(self):
+        if self.transport:
+            transport.select(self.transport)
+
     def test_create_default_sample(self):
         sample = self.pub.create_default_sample(self.config[0])
         self.assertEqual(sample.color, 'BLUE')
 
+    def test_register_instances_write_by_handle_then_dispose(self):
+        args = ArgParser(DEFAULT_DIC).parse_args(
+            ["-d", "27", "-pub", "S", "--vectorized", "--register_instances", "dispose"])
+        args, _, config = ConfigParser(DEFAULT_DIC).get_config(args)
+        pub = ConnextPublisher(MagicMock(), args, config)
+        reader = loopback_dds.DataReader(loopback_dds.Subscriber(pub.participant),
+                                         pub.topic_dic['S'])
+        self.assertEqual(list(pub.handle_dic), ['S-BLUE'])
+        self.assertEqual(pub.engine_handle_list, [pub.handle_dic['S-BLUE']])
+        pub.publish_engine_samples()
+        pub.stop_threads()
+        (data, info), (_, gone) = reader.take()
+        self.assertEqual((data.color, info.valid), ('BLUE', True))
+        self.assertEqual(gone.state.instance_state, loopback_dds.InstanceState.NOT_ALIVE_DISPOSED)
+        self.assertEqual(pub.handle_dic, {})
+
+    def test_instances_share_one_writer_per_topic(self):
+        args = ArgParser(DEFAULT_DIC).parse_args(["-d", "27", "-pub", "S", "--instances", "50"])
+        args, _, config = ConfigParser(DEFAULT_DIC).get_config(args)
+        pub = ConnextPublisher(MagicMock(), args, config)
+        reader = loopback_dds.DataReader(loopback_dds.Subscriber(pub.participant),
+                                         pub.topic_dic['S'])
+        self.assertEqual(list(pub.writer_dic), ['S'])
+        pub.publish_engine_samples()
+        colors = {data.color for data, _ in reader.take()}
+        self.assertEqual(len(colors), 50)
+        self.assertIn('BLUE-000048', colors)
+        self.assertLessEqual(len(pub.sample_counter), len(PALETTE))  # counted by palette color
+
 if __name__ == '__main__':
     unittest.main()
     Test()
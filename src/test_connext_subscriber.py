@@ -2,20 +2,92 @@
 
 """Testing of the ConnextSubscriber module"""
 import unittest
-from unittest.mock import MagicMock
 
+from fixtures import agg_matplotlib, make_data, parse_app_args
 from connext_subscriber import ConnextSubscriber
+from shape import Shape
+from shape_store import ShapeView
+import transport
 # pylint: disable=missing-function-docstring
 
 class Test(unittest.TestCase):
     """Testing of the ConnextSubscriber module"""
 
     def setUp(self):
-        self.sub = ConnextSubscriber(MagicMock(), MagicMock(), MagicMock())
+        self.transport = transport.select('loopback')  # no Connext license needed
+        matplotlib_, args, config = agg_matplotlib(['-sub', 'S', '--artist_pool', '0'])
+        self.sub = ConnextSubscriber(matplotlib_, args, config)
+
+    def tearDown(self):
+        transport.select(self.transport)
+        self.sub.matplotlib.plt.close('all')
 
     def silly(self):
         self.assertIsNotNone(self.sub)
 
+    def test_retire_oldest_gone_reuses_artists(self):
+        sub = self.sub
+        sub.handle_one_sample('S', 1, make_data('BLUE'), 'pub1')
+        blue = sub.poly_dic[sub.form_poly_key('S', 'BLUE', 0)]
+        sub._mark_gone('pub1')  # pylint: disable=protected-access
+        patch_count = len(sub.matplotlib.axes.patches)  # the shape and its X
+        sub.handle_one_sample('S', 2, make_data('RED'), 'pub2')
+        self.assertIs(sub.poly_dic[sub.form_poly_key('S', 'RED', 0)], blue)
+        self.assertEqual(sub.poly_dic.keys_for_instance('S', 'BLUE'), [])
+        self.assertEqual(len(sub.matplotlib.axes.patches), patch_count - 1)
+        self.assertEqual((len(sub.shape_dic), sub.artist_pool.created_count), (1, 1))
+
+    def test_shape_store_reuses_retired_rows(self):
+        args, _, config = parse_app_args(['-sub', 'S', '--artist_pool', '0', '--shape_store'])
+        sub = ConnextSubscriber(self.sub.matplotlib, args, config)
+        self.assertIsNone(self.sub.shape_store)  # tuple Shapes by default
+        sub.handle_one_sample('S', 1, make_data('BLUE'), 'pub1')
+        blue = sub.shape_dic[sub.form_poly_key('S', 'BLUE')]
+        self.assertIsInstance(blue, ShapeView)
+        sub._mark_gone('pub1')  # pylint: disable=protected-access
+        sub.handle_one_sample('S', 2, make_data('RED'), 'pub2')  # retires blue
+        self.assertEqual(len(sub.shape_store), 1)
+        sub.handle_one_sample('S', 3, make_data('GREEN'), 'pub2')
+        self.assertEqual(sub.shape_dic[sub.form_poly_key('S', 'GREEN')].row, blue.row)
+
+    def test_gone_x_stays_over_its_shape(self):
+        args, _, config = parse_app_args(['-sub', 'S'])  # artists to spare, none retired
+        sub = ConnextSubscriber(self.sub.matplotlib, args, config)
+        manager = Shape.zorder_manager
+        sub.handle_one_sample('S', 1, make_data('RED'), 'pub2')
+        sub.handle_one_sample('S', 2, make_data('BLUE'), 'pub1')
+        blue = sub.poly_dic[sub.form_poly_key('S', 'BLUE', 0)]
+        sub._mark_gone('pub1')  # pylint: disable=protected-access
+        gone = sub.poly_dic[sub.form_poly_key('S', 'BLUE', 0)._replace(gone=True)]
+        sub.handle_one_sample('S', 3, make_data('RED'), 'pub2')  # now above blue
+        red = sub.poly_dic[sub.form_poly_key('S', 'RED', 1)]
+        manager._renumber()  # pylint: disable=protected-access
+        self.assertEqual(gone.zorder, blue.zorder + 1)
+        self.assertLess(gone.zorder, red.zorder)
+        sub.handle_one_sample('S', 4, make_data('BLUE'), 'pub1')  # revived
+        self.assertNotIn(gone, manager._owner_dic)  # pylint: disable=protected-access
+
+    def test_dirty_blit_returns_only_changed(self):
+        sub = self.sub
+        sub.args.dirty_blit = True
+        self.assertEqual(sub.draw(0), [])
+        sub.handle_one_sample('S', 1, make_data('BLUE'), 'pub1')
+        blue = sub.poly_dic[sub.form_poly_key('S', 'BLUE', 0)]
+        self.assertEqual(sub.frame_artists(sub.poly_dic.values()), [blue])
+        self.assertEqual(sub.frame_artists(sub.poly_dic.values()), [])
+        sub._mark_gone('pub1')  # pylint: disable=protected-access
+        gone = sub.poly_dic[sub.form_poly_key('S', 'BLUE', 0)._replace(gone=True)]
+        self.assertEqual(sub.frame_artists(sub.poly_dic.values()), [gone])
+
+    def test_event_redraw_wakes_on_status(self):
+        args, _, config = parse_app_args(['-sub', 'S', '--artist_pool', '0', '--event_redraw'])
+        sub = ConnextSubscriber(self.sub.matplotlib, args, config)
+        self.assertFalse(sub.wake_thread.is_triggered())
+        reader = sub.reader_dic['S']
+        reader.listener.on_subscription_matched(reader, None)
+        self.assertTrue(sub.wake_thread.is_triggered())
+        sub.stop_threads()
+
 if __name__ == '__main__':
     unittest.main()
     Test()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""Tests for WakeThread and EventRedraw"""
+import threading
+import unittest
+from unittest.mock import MagicMock
+import loopback_dds
+import transport
+from event_redraw import EventRedraw, WakeThread, gui_caller
+from shape_types import ShapeTypeExtended
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for WakeThread and EventRedraw"""
+
+    def setUp(self):
+        self.previous = transport.select('loopback')
+        loopback_dds.reset()
+        participant = loopback_dds.DomainParticipant(0)
+        topic = loopback_dds.Topic(participant, 'Square', ShapeTypeExtended)
+        self.writer = loopback_dds.DataWriter(loopback_dds.Publisher(participant), topic)
+        self.reader = loopback_dds.DataReader(loopback_dds.Subscriber(participant), topic)
+        self.wakes = threading.Semaphore(0)
+        self.thread = WakeThread({'S': self.reader})
+        self.thread.on_wake = self.wakes.release
+
+    def tearDown(self):
+        self.thread.stop()
+        if self.previous:
+            transport.select(self.previous)
+
+    def _write(self, color='BLUE'):
+        sample = ShapeTypeExtended()
+        sample.color, sample.x, sample.y = color, 50, 50
+        self.writer.write(sample)
+
+    def test_idle_never_wakes(self):
+        self.thread.start()
+        self.assertFalse(self.wakes.acquire(timeout=0.1))
+
+    def test_wakes_once_until_rearmed(self):
+        self.thread.start()
+        self._write()
+        self.assertTrue(self.wakes.acquire(timeout=2))
+        self._write('RED')  # before the frame took the samples
+        self.assertFalse(self.wakes.acquire(timeout=0.1))
+        self.reader.take()
+        self.thread.rearm()
+        self.assertFalse(self.wakes.acquire(timeout=0.1))  # taken, so nothing new
+        self._write()
+        self.assertTrue(self.wakes.acquire(timeout=2))
+        self.assertEqual(self.thread.wake_count, 2)
+
+    def test_status_change_wakes(self):
+        self.thread.start()
+        self.thread.status_changed()
+        self.assertTrue(self.wakes.acquire(timeout=2))
+        self.thread.rearm()
+        self.assertFalse(self.wakes.acquire(timeout=0.1))  # the guard was reset
+
+    def test_stop_before_start(self):
+        self.thread.stop()
+        self.assertFalse(self.thread.is_alive())
+
+    def test_min_interval_coalesces(self):
+        now = [10.0]
+        frame, canvas = MagicMock(), MagicMock()
+        redraw = EventRedraw(canvas, frame, 20, clock=lambda: now[0])
+        redraw.wake_thread = self.thread
+        redraw.on_wake()  # the first frame is drawn at once
+        self.assertEqual(frame.call_count, 1)
+        now[0] += 0.005
+        redraw.on_wake()
+        redraw.on_wake()
+        self.assertEqual(frame.call_count, 1)
+        self.assertTrue(redraw.pending)
+        self.assertEqual(redraw.timer.interval, 15)
+        redraw.timer.start.assert_called_once()
+        now[0] += 0.015
+        redraw.on_frame_due()  # the timer fired
+        self.assertEqual(frame.call_count, 2)
+        self.assertFalse(redraw.pending)
+        now[0] += 1
+        redraw.on_wake()
+        self.assertEqual(frame.call_count, 3)
+        self.assertEqual(repr(redraw), '<EventRedraw: 3 frames for 0 wakes> ')
+
+    def test_gui_caller_polls_other_backends(self):
+        canvas, func = MagicMock(), MagicMock()
+        call = gui_caller(canvas, func, 20)
+        poll = canvas.new_timer.return_value.add_callback.call_args[0][0]
+        poll()
+        func.assert_not_called()
+        caller = threading.Thread(target=call)
+        caller.start()
+        caller.join()
+        poll()
+        poll()
+        func.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+"""Tests for HeadlessPublisher"""
+import unittest
+from fixtures import parse_app_args
+from headless_publisher import HeadlessPublisher
+import transport
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for HeadlessPublisher"""
+
+    def setUp(self):
+        self.transport = transport.select('loopback')  # no Connext license needed
+        args, _, config = parse_app_args(['-pub', 'S', '-n', '4'])
+        self.publisher = HeadlessPublisher(args, config)
+
+    def tearDown(self):
+        self.publisher.stop_threads()
+        if self.transport:
+            transport.select(self.transport)
+
+    def test_report_achieves_target_rate(self):
+        report = self.publisher.run(200, duration=0.3)
+        self.assertEqual(report['instances'], 4)
+        self.assertEqual(report['target_rate'], 200)
+        self.assertAlmostEqual(report['achieved_rate'], 200, delta=10)
+        self.assertEqual(report['samples'] % 4, 0)
+        self.assertGreaterEqual(report['seconds'], 0.3)
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
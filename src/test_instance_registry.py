@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Tests for InstanceRegistry"""
+import unittest
+from instance_registry import InstanceRegistry, PolyKey
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for InstanceRegistry"""
+
+    def setUp(self):
+        self.registry = InstanceRegistry()
+        for slot in range(3):
+            self.registry[PolyKey('S', 'RED', slot)] = f'S-RED-{slot}'
+            self.registry[PolyKey('S', 'REDDISH', slot)] = f'S-REDDISH-{slot}'
+        self.registry[PolyKey('S', 'RED', 1, gone=True)] = 'X'
+
+    def test_slot_zero_is_distinct(self):
+        self.assertNotEqual(PolyKey('S', 'RED', 0), PolyKey('S', 'RED'))
+        self.assertEqual(self.registry[PolyKey('S', 'RED', 0)], 'S-RED-0')
+
+    def test_keys_for_instance_no_prefix_match(self):
+        keys = self.registry.keys_for_instance('S', 'RED')
+        self.assertEqual(len(keys), 4)
+        self.assertTrue(all(key.color == 'RED' for key in keys))
+
+    def test_keys_for_instance_gone(self):
+        self.assertEqual(self.registry.keys_for_instance('S', 'RED', gone=True),
+                         [PolyKey('S', 'RED', 1, True)])
+        self.assertEqual(len(self.registry.keys_for_instance('S', 'RED', gone=False)), 3)
+
+    def test_delete_updates_index(self):
+        del self.registry[PolyKey('S', 'RED', 1, gone=True)]
+        self.assertEqual(self.registry.keys_for_instance('S', 'RED', gone=True), [])
+        self.assertEqual(len(self.registry), 6)
+        for slot in range(3):
+            del self.registry[PolyKey('S', 'RED', slot)]
+        self.assertEqual(self.registry.keys_for_instance('S', 'RED'), [])
+
+    def test_publication_index_follows_owner(self):
+        self.registry.set_publication('pub1', 'S', 'RED')
+        self.registry.set_publication('pub1', 'S', 'REDDISH')
+        self.registry.set_publication('pub2', 'S', 'RED')
+        self.assertEqual(self.registry.instances_for_publication('pub1'), [('S', 'REDDISH')])
+        self.assertEqual(self.registry.instances_for_publication('pub2'), [('S', 'RED')])
+        self.assertEqual(self.registry.instances_for_publication('pub3'), [])
+
+    def test_forget_instance(self):
+        self.registry.set_publication('pub1', 'S', 'RED')
+        self.registry.forget_instance('S', 'RED')
+        self.assertEqual(self.registry.instances_for_publication('pub1'), [])
+        self.registry.set_publication('pub1', 'S', 'RED')  # owned afresh
+        self.assertEqual(self.registry.instances_for_publication('pub1'), [('S', 'RED')])
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
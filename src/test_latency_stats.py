@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Tests for LatencyHistogram and LatencyTracker"""
+import unittest
+from latency_stats import (LatencyHistogram, LatencyTracker, RECEIVE_RENDER, RESOLUTION,
+                           WRITE_RECEIVE)
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for LatencyHistogram and LatencyTracker"""
+
+    def test_percentiles_within_resolution(self):
+        hist = LatencyHistogram()
+        for msec in range(1, 1001):
+            hist.record(msec / 1e3)
+        for pct, expected in ((50, 0.5), (90, 0.9), (99, 0.99)):
+            self.assertAlmostEqual(hist.percentile(pct), expected, delta=expected * RESOLUTION)
+        self.assertEqual(hist.percentile(100), 1.0)
+        self.assertAlmostEqual(hist.mean(), 0.5005)
+
+    def test_memory_bounded(self):
+        hist = LatencyHistogram()
+        for i in range(100000):
+            hist.record((i % 5000) / 1e4)
+        self.assertEqual(hist.count, 100000)
+        self.assertLess(len(hist.buckets), 300)
+
+    def test_negative_and_empty(self):
+        hist = LatencyHistogram()
+        self.assertIsNone(hist.percentile(50))
+        self.assertEqual(hist.summary(), 'no samples')
+        hist.record(-0.002)
+        self.assertEqual(hist.negative, 1)
+        self.assertIn('negative:1', hist.summary())
+
+    def test_tracker_render_at_draw(self):
+        now = [100.0]
+        tracker = LatencyTracker(clock=lambda: now[0])
+        tracker.received('S', 'RED', 99.9, 99.95)
+        tracker.received('S', 'BLUE', 99.8, 99.9)
+        now[0] = 100.1
+        tracker.rendered()
+        tracker.rendered()  # nothing new received, nothing recorded
+        self.assertEqual(tracker.topic_dic[('S', WRITE_RECEIVE)].count, 2)
+        self.assertEqual(tracker.topic_dic[('S', RECEIVE_RENDER)].count, 2)
+        self.assertAlmostEqual(tracker.instance_dic[('S', 'RED', RECEIVE_RENDER)].max, 0.15)
+        self.assertIn('S-BLUE write-receive', tracker.summary())
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
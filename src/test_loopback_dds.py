@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""Tests for the loopback transport"""
+import threading
+import unittest
+from unittest.mock import MagicMock
+import loopback_dds as dds
+from shape_types import ShapeTypeExtended
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for the loopback transport"""
+
+    def setUp(self):
+        dds.reset()
+        self.participant = dds.DomainParticipant(0)
+        self.topic = dds.Topic(self.participant, 'Square', ShapeTypeExtended)
+        self.writer = dds.DataWriter(dds.Publisher(self.participant), self.topic)
+        self.subscriber = dds.Subscriber(self.participant)
+
+    def _reader(self, topic=None, depth=dds.LENGTH_UNLIMITED, listener=None):
+        qos = dds.QosProvider().datareader_qos
+        qos.resource_limits.max_samples_per_instance = depth
+        return dds.DataReader(self.subscriber, topic or self.topic, qos, listener,
+                              dds.StatusMask.ALL)
+
+    @staticmethod
+    def _sample(color='BLUE', x=50, y=50):
+        sample = ShapeTypeExtended()
+        sample.color, sample.x, sample.y = color, x, y
+        return sample
+
+    def test_write_take_keeps_depth_per_instance(self):
+        reader = self._reader(depth=2)
+        for x in range(5):
+            self.writer.write(self._sample('BLUE', x))
+        self.writer.write(self._sample('RED', 99))
+        taken = reader.take()
+        self.assertEqual([data.x for data, _ in taken], [3, 4, 99])
+        self.assertTrue(all(info.valid for _, info in taken))
+        self.assertEqual(str(taken[0][1].publication_handle), str(taken[0][1].source_guid))
+        self.assertEqual(reader.take(), [])
+
+    def test_write_copies_sample(self):
+        reader = self._reader()
+        sample = self._sample()
+        self.writer.write(sample)
+        sample.x = 200
+        self.assertEqual(reader.take()[0][0].x, 50)
+
+    def test_other_domain_and_topic_not_delivered(self):
+        other = dds.DomainParticipant(1)
+        reader = dds.DataReader(dds.Subscriber(other), dds.Topic(other, 'Square', None))
+        circle = self._reader(dds.Topic(self.participant, 'Circle', ShapeTypeExtended))
+        self.writer.write(self._sample())
+        self.assertEqual(reader.take(), [])
+        self.assertEqual(circle.take(), [])
+
+    def test_filter_xy_and_color(self):
+        xy_filter = dds.Filter("x > %0 AND y > %1 AND x < %2 and y < %3",
+                               ['0', '135', '240', '270'])
+        self.assertTrue(xy_filter.passes(self._sample(x=10, y=200)))
+        self.assertFalse(xy_filter.passes(self._sample(x=10, y=100)))
+        color_filter = dds.Filter("color MATCH %0", ["'RED'"])
+        self.assertTrue(color_filter.passes(self._sample('RED')))
+        self.assertFalse(dds.Filter("NOT color MATCH %0", ["'RED'"]).passes(self._sample('RED')))
+        with self.assertRaises(ValueError):
+            dds.Filter("x BETWEEN 1 AND 2")
+
+    def test_content_filtered_topic(self):
+        cft = dds.ContentFilteredTopic(self.topic, 'CFT', dds.Filter("color MATCH %0", ["'RED'"]))
+        reader = self._reader(cft)
+        self.writer.write(self._sample('BLUE'))
+        self.writer.write(self._sample('RED'))
+        self.assertEqual([data.color for data, _ in reader.take()], ['RED'])
+
+    def test_close_loses_liveliness(self):
+        listener = MagicMock()
+        reader = self._reader(listener=listener)
+        listener.reset_mock()
+        self.writer.write(self._sample('BLUE'))
+        self.writer.close()
+        taken = reader.take()
+        self.assertEqual(len(taken), 2)
+        data, info = taken[1]
+        self.assertIsNone(data)
+        self.assertFalse(info.valid)
+        self.assertEqual(info.state.instance_state, dds.InstanceState.NOT_ALIVE_NO_WRITERS)
+        self.assertEqual(info.source_guid, self.writer.guid)
+        status = listener.on_liveliness_changed.call_args[0][1]
+        self.assertEqual(status.alive_count_change, -1)
+        self.assertEqual(reader.matched_publications, [])
+
+    def test_matched_status(self):
+        reader = self._reader()
+        self.assertEqual(reader.subscription_matched_status.current_count, 1)
+        self.assertEqual(self.writer.publication_matched_status.current_count, 1)
+        self.writer.close()
+        self.assertEqual(reader.subscription_matched_status.current_count, 0)
+
+    def test_register_write_by_handle_and_unregister(self):
+        reader = self._reader()
+        handle = self.writer.register_instance(self._sample('RED'))
+        self.writer.write(self._sample('RED', 7), handle)
+        with self.assertRaises(ValueError):
+            self.writer.write(self._sample('BLUE'), handle)
+        self.writer.unregister_instance(handle)
+        (data, _), (_, info) = reader.take()
+        self.assertEqual(data.x, 7)
+        self.assertEqual(info.state.instance_state, dds.InstanceState.NOT_ALIVE_NO_WRITERS)
+        self.assertEqual(info.instance_handle, 'RED')
+        self.assertEqual(self.writer.written_keys, set())
+
+    def test_waitset_wakes_on_write(self):
+        reader = self._reader()
+        condition = dds.ReadCondition(reader, dds.DataState.any)
+        waitset = dds.WaitSet()
+        waitset.attach_condition(condition)
+        self.assertEqual(waitset.wait(dds.Duration(0, 1000)), [])
+        threading.Timer(0.01, self.writer.write, [self._sample()]).start()
+        self.assertEqual(waitset.wait(dds.Duration(5)), [condition])
+
+    def test_qos_provider_reads_depth(self):
+        provider = dds.QosProvider('./SimpleShape.xml', 'MyQosLibrary::MyProfile')
+        self.assertEqual(provider.datareader_qos.resource_limits.max_samples_per_instance, 6)
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
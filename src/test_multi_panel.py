@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Tests for the multi-panel viewer"""
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from arg_parser import ArgParser
+from config_parser import ConfigParser
+from connext_subscriber import ConnextSubscriber
+from fixtures import use_agg
+from multi_panel import PanelViewer, assign_slots, common_argv, parse_panels
+from shapes_demo import DEFAULT_DIC
+import transport
+
+PANELS = """# a comment
+--subtitle 'Blue pub' --index 3 --publish S --config pub.cfg
+
+--subtitle 'All sub' --subscribe CST
+"""
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for the multi-panel viewer"""
+
+    def setUp(self):
+        use_agg()
+        with tempfile.NamedTemporaryFile('w', suffix='.panels', delete=False) as panel_file:
+            panel_file.write(PANELS)
+        self.path = panel_file.name
+        self.arg_parser = ArgParser(DEFAULT_DIC)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_common_argv_drops_panels(self):
+        self.assertEqual(common_argv(['-d', '27', '--panels', 'x', '--panels=y', '-t', 'T']),
+                         ['-d', '27', '-t', 'T'])
+
+    def test_parse_panels(self):
+        args_list = parse_panels(self.path, ['-d', '27', '--panels', self.path], self.arg_parser)
+        self.assertEqual([args.subtitle for args in args_list], ['Blue pub', 'All sub'])
+        self.assertEqual({args.domain_id for args in args_list}, {27})
+        self.assertEqual(args_list[0].config,
+                         os.path.join(os.path.dirname(self.path), 'pub.cfg'))
+        self.assertEqual(args_list[1].subscribe, 'CST')
+        self.assertEqual(assign_slots(args_list), [3, 1])
+
+    def test_viewer_draws_every_panel(self):
+        args_list = [self.arg_parser.parse_args(['--subtitle', str(slot), '--index', str(slot)])
+                     for slot in (1, 7)]
+        args = self.arg_parser.parse_args([])
+        args.box_title = 'panels'
+        viewer = PanelViewer(args, args_list)
+        self.assertEqual([panel.axes.get_subplotspec().num1
+                          for panel in viewer.matplotlib_list], [0, 6])
+        panels = [MagicMock(), MagicMock()]
+        panels[0].draw.return_value, panels[1].draw.return_value = ['a'], ['b', 'c']
+        viewer.create_panels(lambda _matplotlib, _args: panels.pop(0))
+        self.assertEqual(viewer.draw(0), ['a', 'b', 'c'])
+        viewer.plt.close(viewer.fig)
+
+    def test_event_redraw_wakes_on_any_panel(self):
+        previous = transport.select('loopback')  # no Connext license needed
+        args_list = [self.arg_parser.parse_args(['--event_redraw', '-sub', which])
+                     for which in 'SC']
+        args = self.arg_parser.parse_args([])
+        args.box_title = 'panels'
+        viewer = PanelViewer(args, args_list)
+
+        def create_subscriber(matplotlib_, panel_args):
+            panel_args, _, config = ConfigParser(DEFAULT_DIC).get_config(panel_args)
+            return ConnextSubscriber(matplotlib_, panel_args, config)
+
+        viewer.create_panels(create_subscriber)
+        wake_thread = viewer.wake_thread
+        self.assertEqual(len(wake_thread.reader_dic), 2)
+        self.assertFalse(wake_thread.is_triggered())
+        reader = viewer.connext_list[1].reader_dic['C']
+        reader.listener.on_subscription_matched(reader, None)
+        self.assertTrue(wake_thread.is_triggered())
+        viewer.stop_threads()
+        viewer.plt.close(viewer.fig)
+        if previous:
+            transport.select(previous)
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""Tests for OffscreenRenderer and FrameWriter"""
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+from PIL import Image
+from fixtures import agg_matplotlib
+from offscreen import FrameWriter, OffscreenRenderer
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for OffscreenRenderer and FrameWriter"""
+
+    def setUp(self):
+        self.matplotlib, _, _ = agg_matplotlib(['-sub', 'S'])
+        self.draw = MagicMock()
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.matplotlib.plt.close('all')
+        self.tempdir.cleanup()
+
+    def _renderer(self, writer=None):
+        return OffscreenRenderer(self.matplotlib.fig, self.draw, 20, writer)
+
+    def test_render_frame_returns_a_copy(self):
+        renderer = self._renderer()
+        frame = renderer.render_frame()
+        width, height = self.matplotlib.fig.canvas.get_width_height()
+        self.assertEqual(frame.shape, (height, width, 4))
+        self.matplotlib.axes.add_patch(self.matplotlib.create_circle((120, 135), 30))
+        self.assertFalse((renderer.render_frame() == frame).all())
+        self.draw.assert_called_with(1)
+
+    def test_run_paces_and_times_each_stage(self):
+        renderer = self._renderer()
+        sleep = MagicMock()
+        renderer.run(3, sleep)
+        self.assertEqual(sleep.call_count, 3)
+        self.assertTrue(all(0 <= call[0][0] <= 0.02 for call in sleep.call_args_list))
+        summary = renderer.summary()
+        self.assertIn('offscreen frames: 3', summary)
+        self.assertIn('dds: n:3', summary)
+        self.assertIn('render: n:3', summary)
+
+    def test_png_sequence(self):
+        writer = FrameWriter(os.path.join(self.tempdir.name, 'frames', '%02d.png'), 20)
+        writer.start()
+        self._renderer(writer).run(3, lambda _: None)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.tempdir.name, 'frames'))),
+                         ['00.png', '01.png', '02.png'])
+        self.assertEqual(writer.write_hist.count, 3)
+
+    def test_animated_gif(self):
+        path = os.path.join(self.tempdir.name, 'shapes.gif')
+        writer = FrameWriter(path, 20)
+        writer.start()
+        renderer = self._renderer(writer)
+        circle = self.matplotlib.create_circle((20, 135), 15)
+        self.matplotlib.axes.add_patch(circle)
+        self.draw.side_effect = lambda frame: circle.set(center=(20 + frame * 40, 135))
+        renderer.run(4, lambda _: None)
+        self.assertEqual(writer.written, 4)
+        with Image.open(path) as image:
+            self.assertEqual(image.n_frames, 4)
+
+    def test_gif_frames_are_capped(self):
+        path = os.path.join(self.tempdir.name, 'capped.gif')
+        writer = FrameWriter(path, 20, max_gif_frames=3)
+        writer.start()
+        for ix in range(6):
+            frame = np.zeros((8, 8, 4), np.uint8)
+            frame[..., ix % 3], frame[..., 3] = 255, 255  # no two in a row alike
+            writer.put(frame)
+        writer.close()
+        self.assertEqual((writer.written, writer.dropped), (3, 3))
+        with Image.open(path) as image:
+            self.assertEqual(image.n_frames, 3)
+
+    def test_png_queue_is_bounded(self):
+        writer = FrameWriter(os.path.join(self.tempdir.name, '%02d.png'), 20, max_frames=2)
+        self.assertIsNone(writer.frame_limit)  # a PNG sequence keeps every frame
+        writer.put(np.zeros((8, 8, 4), np.uint8))
+        writer.put(np.zeros((8, 8, 4), np.uint8))
+        self.assertTrue(writer.queue.full())  # not started: a third put would block
+
+    def test_bad_path(self):
+        with self.assertRaises(ValueError):
+            FrameWriter('frames.png', 20)
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
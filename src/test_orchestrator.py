@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Tests for the scenario orchestrator and the metrics it collects"""
+from collections import Counter
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from metrics_reporter import MetricsReporter, parse_metrics_line
+from orchestrator import Orchestrator, Window, parse_cpu_time, window_argv
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for the scenario orchestrator and the metrics it collects"""
+
+    def test_window_argv(self):
+        argv = window_argv({'config': 'pub.cfg', 'index': 3, 'flags': "--subtitle 'A B'"},
+                           '-d 27', 0.5)
+        self.assertEqual(argv[2:], ['-d', '27', '--config', 'pub.cfg', '--index', '3',
+                                    '--subtitle', 'A B', '--metrics_interval', '0.5'])
+
+    def test_parse_cpu_time(self):
+        self.assertEqual(parse_cpu_time('00:01:02'), 62)
+        self.assertEqual(parse_cpu_time('1:02.50'), 62.5)
+        self.assertEqual(parse_cpu_time('1-00:00:01'), 86401)
+
+    def test_metrics_round_trip(self):
+        now, stream = [10.0], io.StringIO()
+        connext_obj = MagicMock(sample_counter=Counter({'S-read': 4}))
+        reporter = MetricsReporter(connext_obj, 1.0, clock=lambda: now[0], stream=stream)
+        reporter.poll()
+        reporter.poll()  # not yet due
+        now[0] = 11.0
+        connext_obj.sample_counter['S-read'] += 6
+        reporter.poll()
+        lines = [parse_metrics_line(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([line['samples'] for line in lines], [4, 10])
+        self.assertEqual(lines[1]['time'], 1.0)
+        self.assertIsNone(parse_metrics_line('INFO something else'))
+
+    def test_metrics_timer_reports_without_frames(self):
+        now, stream, canvas = [10.0], io.StringIO(), MagicMock()
+        connext_obj = MagicMock(sample_counter=Counter())
+        reporter = MetricsReporter(connext_obj, 0.5, clock=lambda: now[0], stream=stream)
+        reporter.start_timer(canvas)  # as for an idle --event_redraw window
+        canvas.new_timer.assert_called_once_with(interval=500)
+        poll = canvas.new_timer.return_value.add_callback.call_args[0][0]
+        for _ in range(3):
+            poll()
+            now[0] += 0.5
+        lines = [parse_metrics_line(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([line['time'] for line in lines], [0.0, 0.5, 1.0])
+
+    def test_window_report_rates_and_usage(self):
+        window = Window({'name': 'sub'}, [], '.')
+        window.metrics = [{'time': 0.0, 'samples': 0, 'counts': {}},
+                          {'time': 1.0, 'samples': 50, 'counts': {}},
+                          {'time': 2.0, 'samples': 150, 'counts': {'S-read': 150}}]
+        window.usage = [(0.0, 1.0, 2048), (1.0, 1.5, 4096)]
+        report = window.report(2.0, 5.0)
+        self.assertEqual(report['state'], 'pending')
+        self.assertEqual((report['mean_rate'], report['last_rate'], report['peak_rate']),
+                         (75.0, 100.0, 100.0))
+        self.assertEqual((report['cpu_percent'], report['peak_rss_mb']), (50.0, 4.0))
+
+    def test_run_headless_windows(self):
+        manifest = {'common': '--transport loopback --log_level 50 --headless --target_rate 100',
+                    'max_starting': 1,
+                    'windows': [{'name': 'square', 'flags': '-pub S --duration 0.6'},
+                                {'name': 'circle', 'flags': '-pub C --duration 0.6'}]}
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as manifest_file:
+            json.dump(manifest, manifest_file)
+        try:
+            orchestrator = Orchestrator(manifest_file.name, interval=0.2)
+            orchestrator.run(duration=30)
+        finally:
+            os.remove(manifest_file.name)
+        report = orchestrator.report()
+        self.assertEqual([window['state'] for window in report['windows']], ['exited', 'exited'])
+        self.assertTrue(all(window['samples'] > 0 for window in report['windows']))
+        self.assertTrue(all(window['startup_sec'] is not None for window in report['windows']))
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Tests for ParticipantFactory and StartupTimer"""
+import unittest
+from participant_factory import ParticipantFactory
+from startup_timer import StartupTimer
+import transport
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for ParticipantFactory and StartupTimer"""
+
+    def setUp(self):
+        self.transport = transport.select('loopback')
+        self.factory = ParticipantFactory()
+
+    def tearDown(self):
+        if self.transport:
+            transport.select(self.transport)
+
+    def test_one_participant_per_domain(self):
+        qos = self.factory.participant_qos()
+        self.assertIs(self.factory.participant_qos(), qos)
+        participant = self.factory.participant(3, qos)
+        self.assertIs(self.factory.participant(3, qos), participant)
+        self.assertIsNot(self.factory.participant(4, qos), participant)
+        self.assertIsNot(self.factory.participant(3, qos, 'ShapeType'), participant)
+
+    def test_provider_and_topic_cached(self):
+        provider = self.factory.qos_provider('./SimpleShape.xml', 'MyQosLibrary::MyProfile')
+        self.assertIs(self.factory.qos_provider('./SimpleShape.xml', 'MyQosLibrary::MyProfile'),
+                      provider)
+        participant = self.factory.participant(0, None)
+        topic = self.factory.topic(participant, 'Square', object)
+        self.assertIs(self.factory.topic(participant, 'Square', object), topic)
+        self.assertEqual(self.factory.timer.count_dic['topics'], 1)
+        self.assertEqual(self.factory.timer.count_dic['qos_provider'], 1)
+
+    def test_timer_summary(self):
+        now = [0.0]
+        timer = StartupTimer(clock=lambda: now[0])
+        with timer.phase('imports'):
+            now[0] += 0.25
+        timer.add('readers', 0.01)
+        timer.add('readers', 0.02)
+        self.assertEqual(list(timer.phase_dic), ['imports', 'readers'])
+        self.assertIn('imports:250.0 readers:30.0x2 total:280.0', timer.summary())
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
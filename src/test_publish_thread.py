@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+"""Tests for PublishThread"""
+import threading
+import unittest
+from publish_thread import PublishThread
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for PublishThread"""
+
+    def test_publishes_until_stopped(self):
+        published = threading.Event()
+        calls = []
+
+        def publish():
+            calls.append(1)
+            if len(calls) >= 5:
+                published.set()
+
+        thread = PublishThread(publish, rate_hz=500)
+        thread.start()
+        self.assertTrue(published.wait(2.0))
+        thread.stop()
+        self.assertFalse(thread.is_alive())
+        count = len(calls)
+        self.assertEqual(thread.scheduler.ticks, count)
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
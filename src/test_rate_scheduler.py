@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Tests for RateScheduler"""
+import unittest
+from rate_scheduler import RateScheduler, MAX_LAG_SEC
+
+# pylint: disable=missing-function-docstring
+class FakeClock:
+    """a clock that only moves when slept or pushed"""
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class Test(unittest.TestCase):
+    """Tests for RateScheduler"""
+
+    def setUp(self):
+        self.fake = FakeClock()
+        self.scheduler = RateScheduler(100, clock=self.fake.clock, sleep=self.fake.sleep)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            RateScheduler(0)
+
+    def test_first_tick_does_not_sleep(self):
+        self.scheduler.wait_next()
+        self.assertEqual(self.fake.slept, [])
+        self.assertEqual(self.scheduler.ticks, 1)
+
+    def test_steady_rate(self):
+        for _ in range(101):
+            self.scheduler.wait_next()
+        self.assertAlmostEqual(self.scheduler.elapsed(), 1.0)
+        self.assertAlmostEqual(self.scheduler.achieved_rate(), 100.0)
+
+    def test_late_tick_is_made_up(self):
+        self.scheduler.wait_next()
+        self.fake.now += 0.015  # work overran one and a half periods
+        self.scheduler.wait_next()  # late, no sleep
+        self.scheduler.wait_next()  # only sleeps the remainder
+        self.assertEqual(len(self.fake.slept), 1)
+        self.assertAlmostEqual(self.fake.slept[0], 0.005)
+
+    def test_resync_when_far_behind(self):
+        self.scheduler.wait_next()
+        self.fake.now += MAX_LAG_SEC * 2
+        self.scheduler.wait_next()
+        self.assertEqual(self.scheduler.resyncs, 1)
+        self.scheduler.wait_next()
+        self.assertAlmostEqual(self.fake.slept[-1], 0.01)
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
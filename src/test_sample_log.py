@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Tests for the sample log capture and replay"""
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+from sample_log import REPLAY_BATCH, SampleLogWriter, SampleReplayer, read_sample_log
+from shape_types import ShapeTypeExtended
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for the sample log capture and replay"""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.shapelog')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _capture(self, count, flush_records=4):
+        writer = SampleLogWriter(self.path, flush_records)
+        for ix in range(count):
+            data = ShapeTypeExtended()
+            data.color, data.x, data.y, data.shapesize, data.angle = 'RED', ix, 2 * ix, 30, 1.5
+            writer.append(100.0 + ix / 10, 'ST'[ix % 2], data, f'pub{ix % 2}')
+        writer.close()
+
+    def _replayer(self, speed, now):
+        topic_dic = {'S': MagicMock(), 'T': MagicMock()}
+        replayer = SampleReplayer(topic_dic, read_sample_log(self.path), speed,
+                                  clock=lambda: now[0])
+        return replayer
+
+    def test_round_trip(self):
+        self._capture(10)
+        records = read_sample_log(self.path)
+        self.assertIsInstance(records, np.memmap)
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records['x'].tolist(), list(range(10)))
+        self.assertEqual(records['topic'][1], b'T')
+        self.assertEqual(records['pub'][1], b'pub1')
+        self.assertAlmostEqual(float(records['angle'][3]), 1.5)
+
+    def test_not_a_sample_log(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'something else entirely')
+        with self.assertRaises(ValueError):
+            read_sample_log(self.path)
+
+    def test_replay_paced_by_speed(self):
+        self._capture(10)
+        now = [0.0]
+        replayer = self._replayer(2.0, now)
+        replayer._writer = MagicMock()  # pylint: disable=protected-access
+        self.assertEqual(replayer.write_due(), 1)  # the first is due at once
+        self.assertAlmostEqual(replayer.next_due_sec(), 0.05)
+        now[0] = 0.2  # 0.4 sec of capture at 2x
+        self.assertEqual(replayer.write_due(), 4)
+        now[0] = 10.0
+        self.assertEqual(replayer.write_due(), 5)
+        self.assertTrue(replayer.done)
+        self.assertEqual(replayer.write_due(), 0)
+
+    def test_replay_as_fast_as_possible(self):
+        self._capture(REPLAY_BATCH + 5, flush_records=64)
+        replayer = self._replayer(0, [0.0])
+        writer = replayer._writer = MagicMock()  # pylint: disable=protected-access
+        self.assertEqual(replayer.write_due(), REPLAY_BATCH)
+        self.assertEqual(replayer.write_due(), 5)
+        sample = writer.return_value.write.call_args[0][0]
+        self.assertEqual((sample.color, sample.shapesize), ('RED', 30))
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
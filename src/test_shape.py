@@ -2,7 +2,7 @@
 """Tests for Shape"""
 import unittest
 from unittest.mock import MagicMock
-from shape import Shape, COLOR_MAP
+from shape import Shape, COLOR_MAP, PALETTE, display_color, instance_color
 
 # pylint: disable=missing-function-docstring, too-many-public-methods
 class Test(unittest.TestCase):
@@ -215,6 +215,22 @@ class Test(unittest.TestCase):
         self.assertEqual(fcolor, COLOR_MAP['GREEN'])
         self.assertEqual(ecolor, COLOR_MAP['BLACK'])
 
+    def test_instance_color_steps_through_palette(self):
+        self.assertEqual(instance_color('BLUE', 0), 'BLUE-000000')
+        colors = [instance_color('BLUE', ix) for ix in range(len(PALETTE) + 1)]
+        self.assertEqual(len({color.split('-')[0] for color in colors}), len(PALETTE))
+        self.assertEqual(colors[-1], f'BLUE-{len(PALETTE):06d}')
+
+    def test_display_color(self):
+        self.assertEqual(display_color('GREEN'), 'GREEN')
+        self.assertEqual(display_color('ORANGE-000123'), 'ORANGE')
+        self.assertIn(display_color('no-such-color'), PALETTE)
+        square = Shape(
+            matplotlib=self.matplotlib, seq=1, which="S",
+            color="RED-000042", size=30, xy=(33, 33), fill=0, pub=True
+        )
+        self.assertEqual(square.face_and_edge_color_code()[0], COLOR_MAP['RED'])
+
 
 if __name__ == '__main__':
     unittest.main()
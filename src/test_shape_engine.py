@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Tests for ShapeEngine"""
+import unittest
+from unittest.mock import MagicMock
+from shape import Shape
+from shape_engine import ShapeEngine
+
+LIMIT_XY = (240, 270)
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for ShapeEngine"""
+
+    @staticmethod
+    def _pub_dic(which, xy, delta_xy, angle=0, size=30):
+        return {
+            'which': which, 'color': 'BLUE', 'xy': xy, 'delta_xy': delta_xy,
+            'shapesize': size, 'fillKind': 0, 'angle': angle, 'delta_angle': 5
+        }
+
+    def setUp(self):
+        self.matplotlib = MagicMock()  # only mock the values that matter
+        self.matplotlib.axes.get_xlim.return_value = (0, LIMIT_XY[0])
+        self.matplotlib.axes.get_ylim.return_value = (0, LIMIT_XY[1])
+        self.config_list = [
+            self._pub_dic('S', [50, 50], [5, 5]),
+            self._pub_dic('T', [200, 40], [7, -4], angle=30),
+            self._pub_dic('C', [20, 250], [-9, 9]),
+        ]
+        self.engine = ShapeEngine(self.config_list, LIMIT_XY)
+
+    def _shape(self, pub_dic):
+        return Shape(matplotlib=self.matplotlib, seq=1, which=pub_dic['which'],
+                     color=pub_dic['color'], xy=pub_dic['xy'], size=pub_dic['shapesize'],
+                     angle=pub_dic['angle'])
+
+    def test_index_dic(self):
+        self.assertEqual(list(self.engine.index_dic['S']), [0])
+        self.assertEqual(list(self.engine.index_dic['T']), [1])
+        self.assertEqual(list(self.engine.index_dic['C']), [2])
+
+    def test_step_matches_reverse_if_wall(self):
+        shapes = [self._shape(pub_dic) for pub_dic in self.config_list]
+        deltas = [list(pub_dic['delta_xy']) for pub_dic in self.config_list]
+        for _ in range(100):
+            self.engine.step()
+            for row, shape in enumerate(shapes):
+                shape.xy, deltas[row] = shape.reverse_if_wall(deltas[row])
+                self.assertEqual(list(self.engine.xy[row]), list(shape.xy))
+                self.assertEqual(list(self.engine.delta_xy[row]), deltas[row])
+
+    def test_vertices_match_get_points(self):
+        for _ in range(10):
+            self.engine.step()
+        for which in 'ST':
+            row = self.engine.index_dic[which][0]
+            shape = self._shape(self.config_list[row])
+            shape.xy = tuple(self.engine.xy[row])
+            shape.angle = self.engine.angle[row]
+            expected = [list(point) for point in shape.get_points()]
+            self.assertEqual(self.engine.vertices(which)[0].tolist(), expected)
+
+    def test_vertices_not_extended(self):
+        points = self.engine.vertices('S', extended=False)[0].tolist()
+        self.assertEqual(points, [[35, 205], [35, 235], [65, 235], [65, 205]])
+
+    def test_fill_samples_flips_y(self):
+        samples = [MagicMock() for _ in self.config_list]
+        self.engine.fill_samples(samples, extended=True)
+        self.assertEqual((samples[0].x, samples[0].y), (50, 50))
+        self.assertEqual((samples[2].x, samples[2].y), (20, 250))
+        self.assertEqual(samples[1].angle, 30)
+
+    def test_snapshot_is_independent(self):
+        snap = self.engine.snapshot()
+        self.engine.step()
+        self.assertEqual(list(snap.xy[0]), [50, 220])
+        self.assertNotEqual(list(self.engine.xy[0]), [50, 220])
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
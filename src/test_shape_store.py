@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Tests for ShapeStore and ShapeView"""
+import unittest
+from unittest.mock import MagicMock
+from shape import Shape
+from shape_store import ShapeStore, ShapeView
+
+LIMIT_XY = (240, 270)
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for ShapeStore and ShapeView"""
+
+    def setUp(self):
+        self.matplotlib = MagicMock()  # only mock the values that matter
+        self.matplotlib.axes.get_xlim.return_value = (0, LIMIT_XY[0])
+        self.matplotlib.axes.get_ylim.return_value = (0, LIMIT_XY[1])
+        self.store = ShapeStore(capacity=2)
+
+    def _pair(self, which, angle=None):
+        kwargs = {'matplotlib': self.matplotlib, 'seq': 1, 'which': which, 'color': 'BLUE',
+                  'xy': (100, 60), 'size': 31, 'angle': angle}
+        return Shape(**kwargs), ShapeView(self.store, **kwargs)
+
+    def test_get_points_match_shape(self):
+        for which in 'CST':
+            for angle in (None, 0, 15, 90, 123.4):
+                shape, view = self._pair(which, angle)
+                points = view.get_points()
+                if which != 'C':
+                    points = [tuple(point) for point in points.tolist()]
+                self.assertEqual(points, shape.get_points(), (which, angle))
+
+    def test_update_matches_shape(self):
+        shape, view = self._pair('T', 30.0)
+        view.gone = shape.gone = True
+        shape.update(33, 44, 45.0)
+        view.update(33, 44, 45.0)
+        self.assertEqual(view.xy, shape.xy)
+        self.assertEqual(view.angle, 45.0)
+        self.assertFalse(view.gone)
+        self.assertGreater(view.zorder, shape.zorder)
+
+    def test_grow_keeps_rows(self):
+        views = [self._pair('S', angle)[1] for angle in range(5)]
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual([view.angle for view in views], [0.0, 1.0, 2.0, 3.0, 4.0])
+        self.assertIsNone(self._pair('S')[1].angle)
+
+    def test_release_reuses_row(self):
+        view = self._pair('S', 10.0)[1]
+        self.store.release(view)
+        self.assertEqual(len(self.store), 0)
+        again = self._pair('S')[1]
+        self.assertEqual(again.row, view.row)
+        self.assertIsNone(again.angle)
+
+    def test_slotted(self):
+        shape, view = self._pair('C')
+        self.assertFalse(hasattr(shape, '__dict__'))
+        self.assertFalse(hasattr(view, '__dict__'))
+        with self.assertRaises(AttributeError):
+            view.not_an_attribute = 1
+
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Tests for the startup of shapes_demo"""
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import MagicMock
+import shapes_demo
+from startup_timer import StartupTimer
+
+HEAVY_MODULES = ('matplotlib', 'numpy', 'PyQt5', 'rti.connextdds', 'ShapeTypeExtended')
+GUI_MODULES = ('matplotlib', 'PyQt5')
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for the startup of shapes_demo"""
+
+    def setUp(self):
+        self.timer = shapes_demo.STARTUP_TIMER
+        shapes_demo.STARTUP_TIMER = StartupTimer()
+
+    def tearDown(self):
+        shapes_demo.STARTUP_TIMER = self.timer
+
+    def test_import_is_light(self):
+        code = ('import sys, shapes_demo\n'
+                f'print([name for name in {HEAVY_MODULES} if name in sys.modules])')
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                check=True)
+        self.assertEqual(result.stdout.strip(), '[]')
+
+    def test_headless_never_imports_gui(self):
+        code = ('import sys, shapes_demo\n'
+                'from arg_parser import ArgParser\n'
+                'args = ArgParser(shapes_demo.DEFAULT_DIC).parse_args(\n'
+                '    ["--headless", "-pub", "S", "--transport", "loopback", "--duration", "0.2"])\n'
+                'try:\n'
+                '    shapes_demo.main(args)\n'
+                'except SystemExit as exc:\n'
+                '    assert not exc.code, exc.code\n'
+                f'print([name for name in {GUI_MODULES} if name in sys.modules])')
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.realpath(__file__)))
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '[]')
+
+    def test_profile_draw_adds_first_frame_then_discovery(self):
+        connext_obj = MagicMock()
+        connext_obj.draw.return_value = ['artist']
+        connext_obj.is_matched.side_effect = [False, True]
+        draw = shapes_demo.profile_draw(connext_obj)
+        self.assertEqual(draw(0), ['artist'])
+        self.assertEqual(list(shapes_demo.STARTUP_TIMER.phase_dic), ['first_frame'])
+        draw(1)
+        draw(2)
+        self.assertEqual(list(shapes_demo.STARTUP_TIMER.phase_dic), ['first_frame', 'discovery'])
+        self.assertEqual(draw.pending, [])
+        self.assertEqual(connext_obj.is_matched.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""Tests for StaticLayer and cached_image"""
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import static_layer
+from fixtures import agg_matplotlib
+from static_layer import cached_image
+
+LOGO = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'RTI_Logo_RGB-Color.png')
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for StaticLayer and cached_image"""
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.cache_dir = patch.object(static_layer, 'CACHE_DIR', self.tempdir.name)
+        self.cache_dir.start()
+        self.matplotlib, _, _ = agg_matplotlib(['-sub', 'S', '--text', '50 70 hello green 12'])
+        matplotlib_ = self.matplotlib
+        matplotlib_.init_show_image(LOGO)
+        rect = matplotlib_.create_rectangle((0, 135), (135, 240), ('black', 'grey'))
+        rect.set(hatch='o')
+        matplotlib_.axes.add_patch(rect)
+        matplotlib_.add_static(rect)
+        circle = matplotlib_.create_circle((120, 100), 40)
+        circle.set(zorder=50)  # above the logo and filter, below the text
+        matplotlib_.axes.add_patch(circle)
+
+    def tearDown(self):
+        self.cache_dir.stop()
+        self.tempdir.cleanup()
+        self.matplotlib.plt.close('all')
+
+    def _draw(self):
+        canvas = self.matplotlib.fig.canvas
+        canvas.draw()
+        return np.asarray(canvas.buffer_rgba()).astype(int)
+
+    def test_cached_image_is_downscaled_and_kept(self):
+        image = cached_image(LOGO, 0.3)
+        self.assertEqual(image.shape, (90, 116, 4))
+        cached = os.listdir(self.tempdir.name)
+        self.assertEqual(len(cached), 1)
+        np.save(os.path.join(self.tempdir.name, cached[0]), np.zeros((2, 2, 4)))
+        self.assertEqual(cached_image(LOGO, 0.3).shape, (2, 2, 4))  # read from the cache
+        self.assertEqual(cached_image(LOGO, 0.5).shape, (150, 194, 4))
+
+    def test_layers_per_zorder(self):
+        self.assertEqual(sorted(self.matplotlib.static_layer_dic), [3, 10, 100])
+
+    def test_layers_draw_as_the_artists_would(self):
+        cached = self._draw()
+        for layer in self.matplotlib.static_layer_dic.values():
+            layer.set_visible(False)
+            for artist in layer.artists:
+                artist.set_animated(False)
+        self.assertLessEqual(np.abs(self._draw() - cached).max(), 1)
+
+    def test_rendered_once_per_size(self):
+        self._draw()
+        self._draw()
+        layers = self.matplotlib.static_layer_dic.values()
+        self.assertEqual([layer.render_count for layer in layers], [1, 1, 1])
+        self.matplotlib.fig.set_size_inches(4, 4)
+        self._draw()
+        self.assertEqual([layer.render_count for layer in layers], [2, 2, 2])
+
+    def test_saving_draws_the_artists(self):
+        fig = self.matplotlib.fig
+        cached = self._draw()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='rgba', dpi=fig.dpi)
+        saved = np.frombuffer(buffer.getvalue(), np.uint8).reshape(cached.shape)
+        self.assertLessEqual(np.abs(saved.astype(int) - cached).max(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""Tests for LatestStateTable and TakeThread"""
+import unittest
+from unittest.mock import MagicMock
+from take_thread import LatestStateTable, TakeThread
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for LatestStateTable and TakeThread"""
+
+    @staticmethod
+    def _sample(color, seq, valid=True):
+        data, info = MagicMock(), MagicMock()
+        data.color = color
+        info.valid = valid
+        info.reception_sequence_number.value = seq
+        info.publication_handle = 'pub1'
+        return data, info
+
+    def setUp(self):
+        self.table = LatestStateTable()
+
+    def test_keeps_last_depth_per_instance(self):
+        samples = [self._sample('RED', seq) for seq in range(5)]
+        samples.append(self._sample('BLUE', 9))
+        self.table.put('S', MagicMock(), 2, samples)
+        instance_dic, state_list, taken = self.table.swap()
+        self.assertEqual([entry[1] for entry in instance_dic[('S', 'RED')]], [3, 4])
+        self.assertEqual(len(instance_dic[('S', 'BLUE')]), 1)
+        self.assertEqual(state_list, [])
+        self.assertEqual(taken['S-read'], 6)
+
+    def test_unlimited_depth_keeps_all(self):
+        self.table.put('T', MagicMock(), -1, [self._sample('RED', seq) for seq in range(9)])
+        instance_dic, _, taken = self.table.swap()
+        self.assertEqual(len(instance_dic[('T', 'RED')]), 9)
+        self.assertEqual(taken['T-read'], 9)
+
+    def test_swap_resets(self):
+        self.table.put('S', MagicMock(), 2, [self._sample('RED', 1)])
+        self.table.swap()
+        instance_dic, state_list, taken = self.table.swap()
+        self.assertFalse(instance_dic or state_list or taken)
+
+    def test_state_changes_keep_arrival_order(self):
+        reader = MagicMock()
+        self.table.put('C', reader, 1, [self._sample('RED', 1), self._sample('RED', 2, False)])
+        instance_dic, state_list, _ = self.table.swap()
+        sample_arrival = instance_dic[('C', 'RED')][0][0]
+        self.assertEqual(len(state_list), 1)
+        self.assertGreater(state_list[0][0], sample_arrival)
+        self.assertIs(state_list[0][2], reader)
+
+    def test_thread_stops(self):
+        thread = TakeThread({}, {}, self.table)
+        thread.start()
+        thread.stop()
+        self.assertFalse(thread.is_alive())
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Tests for ZorderManager"""
+import unittest
+from unittest.mock import MagicMock
+from zorder_manager import ZorderManager
+
+# pylint: disable=missing-function-docstring
+class Test(unittest.TestCase):
+    """Tests for ZorderManager"""
+
+    def setUp(self):
+        self.manager = ZorderManager(base=10, inc=2, limit=30)
+
+    def _touch(self, artist):
+        zorder = self.manager.next()
+        artist.set(zorder=zorder)
+        artist.zorder = zorder
+        self.manager.touch(artist)
+        return zorder
+
+    def test_next_increases(self):
+        self.assertEqual(self.manager.next(), 12)
+        self.assertEqual(self.manager.next(), 14)
+
+    def test_renumber_keeps_recency_order(self):
+        artists = [MagicMock() for _ in range(3)]
+        for _ in range(5):  # enough updates to pass the limit
+            for artist in artists:
+                self._touch(artist)
+        self._touch(artists[0])
+        self.assertGreater(self.manager.renumber_count, 0)
+        zorders = [artist.set.call_args.kwargs['zorder'] for artist in artists]
+        self.assertLess(zorders[1], zorders[2])
+        self.assertLess(zorders[2], zorders[0])
+        self.assertLessEqual(max(zorders), self.manager.limit)
+
+    def test_limit_grows_with_artists(self):
+        artists = [MagicMock() for _ in range(20)]
+        for _ in range(3):
+            for artist in artists:
+                self._touch(artist)
+        self.assertGreaterEqual(self.manager.limit, 10 + 4 * 2 * 20)
+
+    def test_forget(self):
+        artist = MagicMock()
+        self._touch(artist)
+        self.manager.forget(artist)
+        self.manager.forget(artist)  # twice is harmless
+        for _ in range(20):
+            self.manager.next()
+        artist.set.assert_called_once()
+
+    def test_attached_stays_above_owner(self):
+        old, gone, newer = MagicMock(), MagicMock(), MagicMock()
+        self._touch(old)
+        self.manager.attach(gone, old)
+        for _ in range(10):  # enough updates to pass the limit
+            self._touch(newer)
+        self.assertGreater(self.manager.renumber_count, 0)
+        old_zorder = old.set.call_args.kwargs['zorder']
+        gone_zorder = gone.set.call_args.kwargs['zorder']
+        self.assertEqual(gone_zorder, old_zorder + 1)
+        self.assertLess(gone_zorder, newer.set.call_args.kwargs['zorder'])
+        self.manager.forget(gone)
+        gone.reset_mock()
+        for _ in range(20):
+            self._touch(newer)
+        gone.set.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
+    Test()
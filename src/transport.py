@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Selects the DDS implementation: rti.connextdds or the in-process loopback"""
+
+# python imports
+import importlib
+import importlib.util
+import logging
+
+## modules use 'from transport import dds' where they used 'import rti.connextdds as dds'
+#   dds forwards each attribute to the selected implementation, so select() works after import
+#   but names bound at import time, like a base class, keep the implementation of that time
+
+LOG = logging.getLogger(__name__)
+
+TRANSPORT_DIC = {'connext': 'rti.connextdds', 'loopback': 'loopback_dds'}
+
+
+def default_transport():
+    """@return connext if it is installed, else loopback"""
+    try:
+        return 'connext' if importlib.util.find_spec('rti.connextdds') else 'loopback'
+    except ModuleNotFoundError:  # no rti package at all
+        return 'loopback'
+
+
+class DdsProxy:
+    """stands in for the rti.connextdds module"""
+
+    def __init__(self):
+        self._module = None
+        self.name = None
+
+    def select(self, name):
+        """use the named transport from now on; @return the previous name"""
+        previous = self.name
+        self._module = importlib.import_module(TRANSPORT_DIC[name])
+        self.name = name
+        if previous != name:
+            LOG.info('transport: %s', name)
+        return previous
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self.select(default_transport())
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        return f'<DdsProxy: {self.name}> '
+
+
+dds = DdsProxy()
+
+
+def select(name):
+    """use the named transport from now on; @return the previous name"""
+    return dds.select(name)
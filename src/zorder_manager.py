@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+###############################################################################
+# (c) Copyright, Real-Time Innovations, 2021. All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Hands out recency z-orders without scanning the axes"""
+
+# python imports
+from collections import OrderedDict
+import logging
+
+LOG = logging.getLogger(__name__)
+
+ZORDER_BASE = 10
+ZORDER_INC = 2  # allow room for gone line
+ZORDER_LIMIT = 500
+
+
+class ZorderManager:
+    """the most recently updated shape gets the highest zorder
+
+    next() is O(1); the tracked artists are renumbered oldest-first only when the counter
+    would pass the limit, and the limit grows with the artist count, so that is amortized O(1)
+    an attached artist, like a gone X, is kept just above its owner, in the gap inc leaves
+    """
+
+    def __init__(self, base=ZORDER_BASE, inc=ZORDER_INC, limit=ZORDER_LIMIT):
+        self.base, self.inc, self.limit = base, inc, limit
+        self.current = base
+        self._recency = OrderedDict()  # artist: None, least recently touched first
+        self._owner_dic = {}  # attached artist: the artist it is drawn over
+        self.renumber_count = 0
+
+    def next(self):
+        """@return a zorder above every one handed out before"""
+        if self.current + self.inc > self.limit:
+            self._renumber()
+        self.current += self.inc
+        return self.current
+
+    def touch(self, artist):
+        """note the artist was just given a zorder from next()"""
+        self._recency[artist] = None
+        self._recency.move_to_end(artist)
+
+    def attach(self, artist, owner):
+        """keep the artist just above its owner's zorder, through renumbers"""
+        self._owner_dic[artist] = owner
+
+    def forget(self, artist):
+        """stop tracking a removed artist"""
+        self._recency.pop(artist, None)
+        self._owner_dic.pop(artist, None)
+
+    def _renumber(self):
+        """compact the tracked artists' zorders, keeping their order"""
+        self.current = self.base
+        zorder_dic = {}
+        for artist in self._recency:
+            self.current += self.inc
+            artist.set(zorder=self.current)
+            zorder_dic[artist] = self.current
+        for artist, owner in self._owner_dic.items():
+            if owner in zorder_dic:
+                artist.set(zorder=zorder_dic[owner] + 1)
+        # leave at least 3x the artist count of headroom before the next renumber
+        self.limit = max(self.limit, self.base + 4 * self.inc * len(self._recency))
+        self.renumber_count += 1
+        LOG.debug('renumbered %d artists, limit:%d', len(self._recency), self.limit)
+
+    def __repr__(self):
+        return (f'<ZorderManager: current:{self.current} limit:{self.limit} '
+                f'tracked:{len(self._recency)} attached:{len(self._owner_dic)} '
+                f'renumbers:{self.renumber_count}> ')